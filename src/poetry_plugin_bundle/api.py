@@ -0,0 +1,356 @@
+"""
+A Python API to bundle projects without going through the command line.
+
+    from pathlib import Path
+
+    from poetry_plugin_bundle.api import BundleOptions
+    from poetry_plugin_bundle.api import bundle
+
+    result = bundle(Path("project"), Path("dist/venv"), BundleOptions(clear=True))
+    if not result.success:
+        print(result.output)
+
+Many bundles can be built at once with ``bundle_many``, which runs them
+in a pool of processes. Each process loads Poetry once and keeps the projects
+it loaded, so that later bundles of the same project reuse them,
+as well as parsed lock files, by content. All processes share the caches of Poetry.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from poetry_plugin_bundle.utils.lock_cache import LockDataCache
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from cleo.io.io import IO
+    from poetry.poetry import Poetry
+
+    from poetry_plugin_bundle.bundlers.venv_bundler import VenvBundler
+
+
+class BundleOptions(NamedTuple):
+    """
+    The options of a bundle, named after those of the ``bundle venv`` command.
+
+    ``groups`` is the exact set of dependency groups to install,
+    the non-optional groups of the project by default.
+    """
+
+    python: str | None = None
+    target: str | None = None
+    clear: bool = False
+    groups: frozenset[str] | None = None
+    compile: bool = False
+    sourceless: bool = False
+    keep_sources: tuple[str, ...] = ()
+    find_unreachable: bool = False
+    prune_unreachable: bool = False
+    prune_keep: tuple[str, ...] = ()
+    lazy: tuple[str, ...] = ()
+    lazy_wheelhouse: Path | None = None
+    optimize_pth: bool = False
+    module_index: bool = False
+    readahead: bool = False
+    cache_plan: bool = False
+    clone_from: Path | None = None
+    base: Path | None = None
+    atomic: bool = False
+    pipeline: bool = False
+    jobs: str | None = None
+    memory_limit: str | None = None
+    cache_quota: str | None = None
+    reproducible: bool = False
+    verify_reproducible: bool = False
+    install_engine: str = "poetry"
+    metrics_file: Path | None = None
+
+    def configure(self, bundler: VenvBundler) -> VenvBundler:
+        return (
+            bundler.set_executable(self.python)
+            .set_target(self.target)
+            .set_remove(self.clear)
+            .set_compile(self.compile)
+            .set_sourceless(self.sourceless)
+            .set_keep_sources(self.keep_sources)
+            .set_find_unreachable(self.find_unreachable)
+            .set_prune_unreachable(self.prune_unreachable)
+            .set_prune_keep(self.prune_keep)
+            .set_lazy(self.lazy)
+            .set_lazy_wheelhouse(self.lazy_wheelhouse)
+            .set_optimize_pth(self.optimize_pth)
+            .set_module_index(self.module_index)
+            .set_readahead(self.readahead)
+            .set_cache_plan(self.cache_plan)
+            .set_clone_source(self.clone_from)
+            .set_base(self.base)
+            .set_atomic(self.atomic)
+            .set_pipeline(self.pipeline)
+            .set_jobs(self.jobs)
+            .set_memory_limit(self.memory_limit)
+            .set_cache_quota(self.cache_quota)
+            .set_reproducible(self.reproducible)
+            .set_verify_reproducible(self.verify_reproducible)
+            .set_install_engine(self.install_engine)
+            .set_metrics_file(self.metrics_file)
+        )
+
+
+class BundleJob(NamedTuple):
+    project: Path
+    path: Path
+    options: BundleOptions = BundleOptions()
+
+
+class BundleResult(NamedTuple):
+    """
+    The result of a bundle.
+
+    ``operations`` counts the executed operations by type (``install``, ``update``,
+    ``uninstall`` and ``skip``), and ``phases`` times each phase of the bundle,
+    in seconds. ``output`` is what the command would have displayed,
+    and ``error`` describes the exception that aborted the bundle, if any.
+    """
+
+    project: Path
+    path: Path
+    success: bool
+    duration: float
+    phases: dict[str, float]
+    operations: dict[str, int]
+    warnings: list[str]
+    output: str
+    error: str | None = None
+
+    @classmethod
+    def from_error(cls, project: Path, path: Path, error: Exception) -> BundleResult:
+        return cls(
+            project=project,
+            path=path,
+            success=False,
+            duration=0.0,
+            phases={},
+            operations={},
+            warnings=[],
+            output="",
+            error=f"{type(error).__name__}: {error}",
+        )
+
+
+# The projects loaded by the current process, by directory,
+# along with the state of their files and configuration when loaded
+_projects: dict[Path, tuple[tuple[object, ...], Poetry]] = {}
+_projects_lock = threading.Lock()
+
+_lock_cache = LockDataCache()
+
+# Options relying on the state of the whole process: the SOURCE_DATE_EPOCH
+# environment variable, and its resident memory and the peak of it.
+# Bundles using them run alone in the process.
+_EXCLUSIVE_OPTIONS = ("reproducible", "verify_reproducible", "memory_limit")
+
+
+def bundle(
+    project: Path,
+    path: Path,
+    options: BundleOptions | None = None,
+    io: IO | None = None,
+) -> BundleResult:
+    """
+    Bundle the project of the given directory into a virtual environment
+    at the given path.
+
+    The output is written to the given IO if any, and captured in the result
+    otherwise. Exceptions raised while bundling are propagated.
+
+    Bundles of other threads relying on the state of the whole process,
+    e.g. its peak memory with a memory limit, do not run at the same time.
+    """
+    from cleo.io.buffered_io import BufferedIO
+
+    from poetry_plugin_bundle.bundlers.venv_bundler import VenvBundler
+
+    options = options or BundleOptions()
+    poetry = _load_project(project)
+
+    bundler = options.configure(VenvBundler().set_path(path))
+    bundler.set_lock_cache(_lock_cache)
+    # The groups are recorded in the manifest of the bundle, and must be
+    # the same as those of the command to allow cloning bundles it built.
+    bundler.set_activated_groups(
+        set(options.groups)
+        if options.groups is not None
+        else set(poetry.package.dependency_group_names())
+    )
+
+    buffer = None
+    if io is None:
+        buffer = BufferedIO()
+        io = style_io(buffer)
+
+    exclusive = any(getattr(options, name) for name in _EXCLUSIVE_OPTIONS)
+    with _process_lock.hold(exclusive):
+        success = bundler.bundle(poetry, io)
+
+    return BundleResult(
+        project=project,
+        path=path,
+        success=success,
+        duration=bundler.stats.duration,
+        phases=dict(bundler.stats.phases),
+        operations=dict(bundler.stats.operations),
+        warnings=list(bundler.warnings),
+        output=buffer.fetch_output() + buffer.fetch_error() if buffer else "",
+    )
+
+
+def style_io(io: IO) -> IO:
+    """
+    Define the styles of the Poetry console on the given IO,
+    so that they are rendered, or removed from undecorated output.
+    """
+    from cleo.formatters.style import Style
+
+    styles = {
+        "c1": Style("cyan"),
+        "c2": Style("default", options=["bold"]),
+        "info": Style("blue"),
+        "comment": Style("green"),
+        "warning": Style("yellow"),
+        "debug": Style("default", options=["dark"]),
+        "success": Style("green"),
+    }
+    for output in (io.output, io.error_output):
+        for name, style in styles.items():
+            output.formatter.set_style(name, style)
+
+    return io
+
+
+def bundle_many(
+    jobs: Iterable[BundleJob], max_workers: int | None = None
+) -> list[BundleResult]:
+    """
+    Run the given bundles in a pool of processes and return their results,
+    in the order of the jobs.
+
+    A job failing with an exception does not abort the others:
+    its result is unsuccessful and describes the exception.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    # Bundles of the same path must not run concurrently
+    paths = [job.path.absolute() for job in jobs]
+    duplicates = {path for path in paths if paths.count(path) > 1}
+    if duplicates:
+        raise ValueError(
+            "Several jobs bundle into "
+            + ", ".join(str(path) for path in sorted(duplicates))
+        )
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(bundle, job.project, job.path, job.options) for job in jobs
+        ]
+
+    results = []
+    for job, future in zip(jobs, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:  # noqa: BLE001
+            results.append(BundleResult.from_error(job.project, job.path, e))
+
+    return results
+
+
+class SharedLock:
+    """
+    A lock held either by any number of shared holders or by a single
+    exclusive one. Exclusive holders waiting for the lock have priority.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._waiting = 0
+
+    @contextlib.contextmanager
+    def hold(self, exclusive: bool = False) -> Iterator[None]:
+        with self._condition:
+            if exclusive:
+                self._waiting += 1
+                self._condition.wait_for(
+                    lambda: not self._exclusive and not self._shared
+                )
+                self._waiting -= 1
+                self._exclusive = True
+            else:
+                self._condition.wait_for(
+                    lambda: not self._exclusive and not self._waiting
+                )
+                self._shared += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                if exclusive:
+                    self._exclusive = False
+                else:
+                    self._shared -= 1
+                self._condition.notify_all()
+
+
+_process_lock = SharedLock()
+
+
+def _load_project(project: Path) -> Poetry:
+    """
+    Load the project of the given directory, reusing the one loaded
+    by a previous bundle unless its files or the configuration of Poetry
+    changed since.
+    """
+    from poetry.factory import Factory
+    from poetry.locations import CONFIG_DIR
+
+    directory = project.absolute()
+    files = [
+        directory / "pyproject.toml",
+        directory / "poetry.lock",
+        directory / "poetry.toml",
+        CONFIG_DIR / "config.toml",
+        CONFIG_DIR / "auth.toml",
+    ]
+    state = (
+        *(file.stat().st_mtime_ns if file.exists() else 0 for file in files),
+        *sorted(
+            (name, value)
+            for name, value in os.environ.items()
+            if name.startswith("POETRY_")
+        ),
+    )
+
+    with _projects_lock:
+        loaded = _projects.get(directory)
+        if loaded is not None and loaded[0] == state:
+            return loaded[1]
+
+        poetry = Factory().create_poetry(directory)
+        _projects[directory] = (state, poetry)
+
+    return poetry
@@ -1,28 +1,83 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from typing import Any
 
 from poetry_plugin_bundle.bundlers.bundler import Bundler
+from poetry_plugin_bundle.utils.metrics import BundleStats
 
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
     from pathlib import Path
 
     from cleo.io.io import IO
     from cleo.io.outputs.section_output import SectionOutput
+    from poetry.core.packages.package import Package
+    from poetry.installation.operations.operation import Operation
+    from poetry.packages.locker import Locker
     from poetry.poetry import Poetry
+    from poetry.repositories.installed_repository import InstalledRepository
     from poetry.repositories.lockfile_repository import LockfileRepository
+    from poetry.utils.env import Env
+
+    from poetry_plugin_bundle.installation.concurrency import JobControl
+    from poetry_plugin_bundle.installation.concurrency import JobLimits
+    from poetry_plugin_bundle.installation.executor import BundleExecutor
+    from poetry_plugin_bundle.installation.pipeline import Pipeline
+    from poetry_plugin_bundle.installation.target import TargetSpec
+    from poetry_plugin_bundle.utils.caches import CacheQuota
+    from poetry_plugin_bundle.utils.lock_cache import LockDataCache
+    from poetry_plugin_bundle.utils.manifest import BundleManifest
+    from poetry_plugin_bundle.utils.metrics import Snapshot
+    from poetry_plugin_bundle.utils.plan_cache import InstallPlanCache
+    from poetry_plugin_bundle.utils.plan_cache import PlannedPackage
 
 
 class VenvBundler(Bundler):
     name = "venv"
 
+    INSTALL_ENGINES = ("poetry", "direct")
+
     def __init__(self) -> None:
         self._path: Path
         self._executable: str | None = None
         self._remove: bool = False
         self._activated_groups: set[str] | None = None
         self._compile: bool = False
+        self._sourceless: bool = False
+        self._keep_sources: set[str] = set()
+        self._cache_plan: bool = False
+        self._only_root: bool = False
+        self._metrics_file: Path | None = None
+        self._install_engine: str = "poetry"
+        self._clone_source: Path | None = None
+        self._atomic: bool = False
+        self._base: Path | None = None
+        self._module_index: bool = False
+        self._readahead: bool = False
+        self._optimize_pth: bool = False
+        self._pipeline: bool = False
+        self._find_unreachable: bool = False
+        self._prune_unreachable: bool = False
+        self._prune_keep: set[str] = set()
+        self._lazy: set[str] = set()
+        self._lazy_wheelhouse: Path | None = None
+        self._lock_cache: LockDataCache | None = None
+        self._jobs: JobLimits | None = None
+        self._memory_limit: int | None = None
+        self._cache_quota: CacheQuota | None = None
+        self._source_date_epoch: int | None = None
+        self._target: TargetSpec | None = None
+        self._verify_reproducible: bool = False
+        self._build_path: Path
+        self._active_pipeline: Pipeline | None = None
+        self._active_jobs: JobControl | None = None
+        self._executor: BundleExecutor | None = None
+        self._stats = BundleStats()
+        self._warnings: list[str] = []
+        self._executed_operations: list[Operation] = []
+        self._used_archives: list[Path] = []
 
     def set_path(self, path: Path) -> VenvBundler:
         self._path = path
@@ -49,28 +104,263 @@ class VenvBundler(Bundler):
 
         return self
 
+    def set_sourceless(self, sourceless: bool = False) -> VenvBundler:
+        self._sourceless = sourceless
+
+        return self
+
+    def set_keep_sources(self, packages: Collection[str]) -> VenvBundler:
+        self._keep_sources = set(packages)
+
+        return self
+
+    def set_cache_plan(self, cache_plan: bool = False) -> VenvBundler:
+        self._cache_plan = cache_plan
+
+        return self
+
+    def set_only_root(self, only_root: bool = False) -> VenvBundler:
+        self._only_root = only_root
+
+        return self
+
+    def set_metrics_file(self, metrics_file: Path | None) -> VenvBundler:
+        self._metrics_file = metrics_file
+
+        return self
+
+    def set_install_engine(self, install_engine: str) -> VenvBundler:
+        if install_engine not in self.INSTALL_ENGINES:
+            raise ValueError(f'The install engine "{install_engine}" does not exist.')
+
+        self._install_engine = install_engine
+
+        return self
+
+    def set_clone_source(self, clone_source: Path | None) -> VenvBundler:
+        self._clone_source = clone_source
+
+        return self
+
+    def set_atomic(self, atomic: bool = False) -> VenvBundler:
+        self._atomic = atomic
+
+        return self
+
+    def set_base(self, base: Path | None) -> VenvBundler:
+        self._base = base
+
+        return self
+
+    def set_module_index(self, module_index: bool = False) -> VenvBundler:
+        self._module_index = module_index
+
+        return self
+
+    def set_readahead(self, readahead: bool = False) -> VenvBundler:
+        self._readahead = readahead
+
+        return self
+
+    def set_optimize_pth(self, optimize_pth: bool = False) -> VenvBundler:
+        self._optimize_pth = optimize_pth
+
+        return self
+
+    def set_pipeline(self, pipeline: bool = False) -> VenvBundler:
+        self._pipeline = pipeline
+
+        return self
+
+    def set_find_unreachable(self, find_unreachable: bool = False) -> VenvBundler:
+        self._find_unreachable = find_unreachable
+
+        return self
+
+    def set_prune_unreachable(self, prune_unreachable: bool = False) -> VenvBundler:
+        self._prune_unreachable = prune_unreachable
+
+        return self
+
+    def set_prune_keep(self, packages: Collection[str]) -> VenvBundler:
+        self._prune_keep = set(packages)
+
+        return self
+
+    def set_jobs(self, jobs: str | None) -> VenvBundler:
+        from poetry_plugin_bundle.installation.concurrency import JobLimits
+
+        self._jobs = JobLimits.parse(jobs) if jobs else None
+
+        return self
+
+    def set_memory_limit(self, memory_limit: str | None) -> VenvBundler:
+        from poetry_plugin_bundle.utils.memory import parse_size
+
+        self._memory_limit = parse_size(memory_limit) if memory_limit else None
+
+        return self
+
+    def set_cache_quota(self, cache_quota: str | None) -> VenvBundler:
+        from poetry_plugin_bundle.utils.caches import CacheQuota
+
+        self._cache_quota = CacheQuota.parse(cache_quota) if cache_quota else None
+
+        return self
+
+    def set_lazy(self, packages: Collection[str]) -> VenvBundler:
+        self._lazy = set(packages)
+
+        return self
+
+    def set_lazy_wheelhouse(self, wheelhouse: Path | None) -> VenvBundler:
+        self._lazy_wheelhouse = wheelhouse
+
+        return self
+
+    def set_target(self, target: str | None) -> VenvBundler:
+        from poetry_plugin_bundle.installation.target import TargetSpec
+
+        self._target = TargetSpec.parse(target) if target else None
+
+        return self
+
+    def set_reproducible(self, reproducible: bool = False) -> VenvBundler:
+        from poetry_plugin_bundle.utils.reproducible import get_source_date_epoch
+
+        self._source_date_epoch = get_source_date_epoch() if reproducible else None
+
+        return self
+
+    def set_verify_reproducible(self, verify: bool = False) -> VenvBundler:
+        from poetry_plugin_bundle.utils.reproducible import get_source_date_epoch
+
+        # Verifying that a bundle is reproducible implies building it reproducibly
+        self._verify_reproducible = verify
+        if verify and self._source_date_epoch is None:
+            self._source_date_epoch = get_source_date_epoch()
+
+        return self
+
+    def set_lock_cache(self, lock_cache: LockDataCache | None) -> VenvBundler:
+        self._lock_cache = lock_cache
+
+        return self
+
+    @property
+    def stats(self) -> BundleStats:
+        """
+        The statistics of the last bundle.
+        """
+        return self._stats
+
+    @property
+    def warnings(self) -> list[str]:
+        """
+        The warnings of the last bundle.
+        """
+        return self._warnings
+
     def bundle(self, poetry: Poetry, io: IO) -> bool:
+        import contextlib
+
+        from poetry_plugin_bundle.installation.concurrency import JobLimits
+        from poetry_plugin_bundle.utils import memory
+        from poetry_plugin_bundle.utils import metrics
+        from poetry_plugin_bundle.utils.reproducible import source_date_epoch
+
+        memory.reset_peak_rss()
+        self._stats = BundleStats()
+        self._warnings = []
+        self._executed_operations = []
+        self._used_archives = []
+        self._executor = None
+
+        bundle_before: Snapshot = {}
+        if self._metrics_file is not None:
+            bundle_before = metrics.snapshot(self._path)
+
+        jobs = self._jobs
+        if jobs is None and self._memory_limit is not None:
+            # The memory budget holds jobs back in the default pools
+            jobs = JobLimits()
+        if jobs is not None:
+            self._active_jobs = self._get_job_control(poetry, jobs)
+
+        environment = contextlib.ExitStack()
+        if self._source_date_epoch is not None:
+            # Exported before the pipeline starts building the root package
+            environment.enter_context(source_date_epoch(self._source_date_epoch))
+
+        if self._pipeline:
+            self._active_pipeline = self._start_pipeline(poetry)
+
+        success = False
+        try:
+            if self._atomic:
+                success = self._bundle_atomically(poetry, io)
+            else:
+                self._build_path = self._path
+                success = self._bundle(poetry, io)
+
+            if success and self._source_date_epoch is not None:
+                success = self._check_reproducibility(poetry, io)
+
+            self._check_caches(poetry, io)
+        finally:
+            environment.close()
+
+            if self._active_pipeline is not None:
+                self._active_pipeline.close()
+                self._active_pipeline = None
+
+            if self._active_jobs is not None:
+                for limiter in self._active_jobs.limiters():
+                    if limiter.jobs:
+                        self._stats.parallelism[limiter.name] = (
+                            limiter.peak,
+                            limiter.mean,
+                        )
+                self._active_jobs = None
+
+            self._stats.finish()
+            self._stats.peak_rss_bytes = memory.peak_rss()
+            for operation in self._executed_operations:
+                self._stats.operations[
+                    "skip" if operation.skipped else operation.job_type
+                ] += 1
+
+            if self._metrics_file is not None:
+                self._write_metrics(self._metrics_file, poetry, success, bundle_before)
+
+        return success
+
+    def _bundle(self, poetry: Poetry, io: IO) -> bool:
+        import os
+
         from pathlib import Path
         from tempfile import TemporaryDirectory
 
         from cleo.io.null_io import NullIO
+        from poetry.__version__ import __version__ as poetry_version
         from poetry.core.masonry.builders.wheel import WheelBuilder
-
-        try:
-            from poetry.core.masonry.utils.module import ModuleOrPackageNotFoundError
-        except ImportError:
-            # poetry-core < 2.0
-            from poetry.core.masonry.utils.module import (  # type: ignore[attr-defined, no-redef]
-                ModuleOrPackageNotFound as ModuleOrPackageNotFoundError,
-            )
+        from poetry.core.masonry.utils.module import ModuleOrPackageNotFoundError
         from poetry.core.packages.package import Package
         from poetry.installation.installer import Installer
         from poetry.installation.operations.install import Install
         from poetry.packages.locker import Locker
-        from poetry.utils.env import Env
+        from poetry.repositories.installed_repository import InstalledRepository
         from poetry.utils.env import EnvManager
         from poetry.utils.env import InvalidCurrentPythonVersionError
 
+        from poetry_plugin_bundle.installation import overlay
+        from poetry_plugin_bundle.installation.executor import BundleExecutor
+        from poetry_plugin_bundle.installation.target import TargetEnv
+        from poetry_plugin_bundle.installation.target import TargetError
+        from poetry_plugin_bundle.installation.target import uses_full_version
+        from poetry_plugin_bundle.utils.manifest import BundleManifest
+        from poetry_plugin_bundle.utils.plan_cache import PlannedPackage
+
         class CustomEnvManager(EnvManager):
             """
             This class is used as an adapter for allowing us to use
@@ -100,7 +390,7 @@ class VenvBundler(Bundler):
                 self._path = path
                 return self.create_venv(name=None, executable=executable, force=force)
 
-        warnings = []
+        warnings = self._warnings
 
         manager = CustomEnvManager(poetry)
         executable = Path(self._executable) if self._executable else None
@@ -111,7 +401,91 @@ class VenvBundler(Bundler):
 
         io.write_line(message)
 
-        if executable:
+        if self._target is not None:
+            # These options run the interpreter of the bundle
+            incompatible = [
+                option
+                for option, value in [
+                    ("--python", self._executable),
+                    ("--compile", self._compile),
+                    ("--sourceless", self._sourceless),
+                    ("--optimize-pth", self._optimize_pth),
+                    ("--module-index", self._module_index),
+                    ("--readahead", self._readahead),
+                    ("--base", self._base),
+                    ("--from", self._clone_source),
+                ]
+                if value
+            ]
+            if incompatible:
+                self._write(
+                    io,
+                    self._get_message(poetry, self._path, error=True)
+                    + f": <error>The {', '.join(incompatible)} options require"
+                    " running the interpreter of the bundle and cannot be used"
+                    " with a target</error>",
+                )
+                return False
+
+        manifest = self._get_manifest(poetry)
+        cloned = False
+        if self._clone_source is not None:
+            self._stats.start_phase("clone")
+            cloned = self._clone(self._clone_source, manifest, io, message, warnings)
+
+        lock_cache = self._lock_cache
+
+        class CustomLocker(Locker):
+            def _get_lock_data(self) -> dict[str, Any]:
+                if lock_cache is None:
+                    return super()._get_lock_data()
+
+                return lock_cache.get(self.lock, super()._get_lock_data)
+
+            def locked_repository(self) -> LockfileRepository:
+                repo = super().locked_repository()
+                for package in repo.packages:
+                    package.develop = False
+                return repo
+
+        custom_locker = CustomLocker(poetry.locker.lock, poetry.locker._pyproject_data)
+
+        # Markers on the full Python version would be evaluated for a made-up one
+        if (
+            self._target is not None
+            and not self._target.full_version
+            and uses_full_version(
+                [
+                    poetry.locker._pyproject_data,
+                    custom_locker.lock_data if custom_locker.is_locked() else {},
+                ]
+            )
+        ):
+            self._write(
+                io,
+                self._get_message(poetry, self._path, error=True)
+                + ": <error>The dependencies depend on the full Python version"
+                " of the target, whose micro version must be given</error>",
+            )
+            return False
+
+        if self._active_pipeline is not None and not self._only_root:
+            # Artifacts are prefetched while the environment is being created
+            probe_env = self._get_probe_env(poetry, executable)
+            if probe_env is not None:
+                self._active_pipeline.prefetch(
+                    probe_env, poetry, custom_locker, self._activated_groups
+                )
+
+        self._stats.start_phase("environment")
+
+        if self._target is not None:
+            self._write(
+                io,
+                f"{message}: <info>Laying out a virtual environment"
+                f" for <b>{self._target}</b></info>",
+            )
+        elif executable:
             self._write(
                 io,
                 f"{message}: <info>Creating a virtual environment using Python"
@@ -124,10 +498,25 @@ class VenvBundler(Bundler):
                 " using Poetry-determined Python",
             )
 
+        env: Env
         try:
-            env = manager.create_venv_at_path(
-                self._path, executable=executable, force=self._remove
+            if self._target is not None:
+                env = TargetEnv.create(
+                    self._build_path, self._target, clear=self._remove
+                )
+            else:
+                env = manager.create_venv_at_path(
+                    self._build_path,
+                    executable=executable,
+                    force=self._remove and not cloned,
+                )
+        except TargetError as e:
+            self._write(
+                io,
+                self._get_message(poetry, self._path, error=True)
+                + f": <error>{e}</error>",
             )
+            return False
         except InvalidCurrentPythonVersionError:
             self._write(
                 io,
@@ -135,32 +524,82 @@ class VenvBundler(Bundler):
                 " due to incompatible Python version</info>",
             )
             env = manager.create_venv_at_path(
-                self._path, executable=executable, force=True
+                self._build_path, executable=executable, force=True
             )
 
-        self._write(io, f"{message}: <info>Installing dependencies</info>")
+        if self._target is not None and self._target.home is None:
+            warnings.append(
+                "The target has no home: the bundle does not link to an interpreter,"
+                " and its scripts cannot run until one is linked into it."
+            )
 
-        class CustomLocker(Locker):
-            def locked_repository(self) -> LockfileRepository:
-                repo = super().locked_repository()
-                for package in repo.packages:
-                    package.develop = False
-                return repo
+        # The bundle will not match its manifest anymore until it is complete
+        BundleManifest.remove(self._build_path)
 
-        try:
-            locker_data = poetry.locker._pyproject_data
-        except AttributeError:
-            # poetry < 2.0
-            locker_data = poetry.locker._local_config  # type: ignore[attr-defined]
-        custom_locker = CustomLocker(poetry.locker.lock, locker_data)
+        # The base is chained again once the bundle is complete,
+        # so that its packages are not mistaken for those of the bundle.
+        overlay.unchain(env)
+        base_env = None
+        if self._base is not None:
+            base_env = self._get_base_env(self._base, env)
+            if base_env is None:
+                self._write(
+                    io,
+                    self._get_message(poetry, self._path, error=True)
+                    + f": <error>The base bundle <c2>{self._base}</c2> is not"
+                    " a virtual environment of the same Python version</error>",
+                )
+                return False
+
+        self._stats.start_phase("dependencies")
+
+        if not self._only_root:
+            self._write(io, f"{message}: <info>Installing dependencies</info>")
+
+        installer_io = NullIO() if not io.is_debug() else io
+        executor = BundleExecutor(env, poetry.pool, poetry.config, installer_io)
+        executor.enable_direct_installation(self._install_engine == "direct")
+        executor.require_wheels(self._target is not None)
+        executor.set_pipeline(self._active_pipeline)
+        executor.set_jobs(self._active_jobs)
+        self._executor = executor
+        self._executed_operations = executed_operations = executor.executed_operations
+        self._used_archives = executor.used_archives
+        installed = None
+        if base_env is not None:
+            installed = overlay.overlay_repository(
+                env, base_env, custom_locker.locked_repository().packages
+            )
+
+        plan_cache = None
+        plan_inputs = None
+        plan = None
+        # Only a fresh lock file can be trusted to describe the project,
+        # otherwise the installer must run and report the problem.
+        if (
+            self._cache_plan
+            and not self._only_root
+            and custom_locker.is_locked()
+            and custom_locker.is_fresh()
+        ):
+            plan_cache = self._get_plan_cache(poetry)
+            plan_inputs = plan_cache.inputs(
+                poetry.locker.lock.read_bytes(),
+                self._activated_groups,
+                env.marker_env,
+                poetry_version,
+            )
+            plan = plan_cache.load(plan_inputs)
 
         installer = Installer(
-            NullIO() if not io.is_debug() else io,
+            installer_io,
             env,
             poetry.package,
             custom_locker,
             poetry.pool,
             poetry.config,
+            installed=installed,
+            executor=executor,
         )
         if self._activated_groups is not None:
             installer.only_groups(self._activated_groups)
@@ -168,17 +607,59 @@ class VenvBundler(Bundler):
 
         installer.executor.enable_bytecode_compilation(self._compile)
 
-        return_code = installer.run()
+        operations = None
+        if plan is not None:
+            operations = self._get_plan_operations(
+                plan,
+                custom_locker,
+                installed if installed is not None else InstalledRepository.load(env),
+                poetry.package.name,
+            )
+
+        if self._only_root:
+            # The environment is assumed to be in sync with the lock file already
+            return_code = 0
+        elif operations is not None:
+            self._write(
+                io,
+                f"{message}: <info>Installing dependencies"
+                " from cached install plan</info>",
+            )
+            return_code = installer.executor.execute(operations)
+        else:
+            return_code = installer.run()
+            if not return_code and plan_cache is not None:
+                assert plan_inputs is not None
+                plan_cache.save(
+                    plan_inputs,
+                    [
+                        PlannedPackage.from_package(
+                            operation.package,
+                            0 if operation.skipped else int(operation.priority),
+                        )
+                        for operation in executed_operations
+                        if operation.job_type in {"install", "update"}
+                        and (
+                            not operation.skipped
+                            or operation.skip_reason == "Already installed"
+                        )
+                    ],
+                )
+
         if return_code:
             self._write(
                 io,
                 self._get_message(poetry, self._path, error=True)
                 + ": <error>Failed</> at step <b>Installing dependencies</b>",
             )
+            for error in executor.wheel_errors:
+                io.write_error_line(f"  - {error}")
             return False
 
-        # Skip building the wheel if is_package_mode exists and is set to false
-        if hasattr(poetry, "is_package_mode") and not poetry.is_package_mode:
+        self._stats.start_phase("root")
+
+        # Skip building the wheel of non package projects
+        if not poetry.is_package_mode:
             self._write(
                 io,
                 f"{message}: <info>Skipping installation for non package project"
@@ -195,8 +676,13 @@ class VenvBundler(Bundler):
             # and install it in the newly create virtual environment
             with TemporaryDirectory() as directory:
                 try:
-                    wheel_name = WheelBuilder.make_in(poetry, directory=Path(directory))
-                    wheel = Path(directory).joinpath(wheel_name)
+                    if self._active_pipeline is not None:
+                        wheel = self._active_pipeline.wheel()
+                    else:
+                        wheel_name = WheelBuilder.make_in(
+                            poetry, directory=Path(directory)
+                        )
+                        wheel = Path(directory).joinpath(wheel_name)
                     package = Package(
                         poetry.package.name,
                         poetry.package.version,
@@ -210,8 +696,113 @@ class VenvBundler(Bundler):
                         " package was found."
                     )
 
+            if executor.wheel_errors:
+                self._write(
+                    io,
+                    self._get_message(poetry, self._path, error=True)
+                    + ": <error>Failed</> at step <b>Installing"
+                    f" {poetry.package.pretty_name}</b>",
+                )
+                for error in executor.wheel_errors:
+                    io.write_error_line(f"  - {error}")
+                return False
+
+        if base_env is not None:
+            overlay.chain(env, base_env)
+
+        report: list[str] = []
+        if self._find_unreachable or self._prune_unreachable:
+            self._stats.start_phase("imports")
+            self._write(io, f"{message}: <info>Analyzing imports</info>")
+
+            report.extend(
+                self._analyze_imports(
+                    env,
+                    base_env,
+                    poetry,
+                    [
+                        package.name
+                        for package in custom_locker.locked_repository().packages
+                    ],
+                    warnings,
+                )
+            )
+
+        if self._lazy or self._has_lazy_distributions(env):
+            self._stats.start_phase("lazy")
+            self._write(io, f"{message}: <info>Making packages lazy</info>")
+
+            report.extend(
+                self._make_lazy(
+                    env,
+                    executor,
+                    custom_locker.locked_repository().packages,
+                    warnings,
+                )
+            )
+
+        if self._sourceless:
+            self._stats.start_phase("sourceless")
+            self._write(
+                io,
+                f"{message}: <info>Compiling bytecode and removing sources</info>",
+            )
+
+            warnings.extend(self._make_sourceless(env))
+
+        if self._optimize_pth:
+            self._stats.start_phase("pth")
+            self._write(io, f"{message}: <info>Optimizing .pth files</info>")
+
+            report.extend(self._consolidate_pth(env, warnings))
+
+        if self._module_index:
+            self._stats.start_phase("module-index")
+            self._write(io, f"{message}: <info>Indexing modules</info>")
+
+            warnings.extend(self._build_module_index(env))
+
+        # The files of the readahead manifest are recorded with the module index
+        # installed, and are then written to site-packages, which modifies it.
+        site_packages_mtime = os.stat(env.paths["purelib"]).st_mtime_ns
+        if self._readahead:
+            self._stats.start_phase("readahead")
+            self._write(
+                io, f"{message}: <info>Recording the files read at startup</info>"
+            )
+
+            report.extend(self._record_startup(env, poetry, warnings))
+        else:
+            self._remove_readahead(env)
+
+        if (
+            self._module_index
+            and os.stat(env.paths["purelib"]).st_mtime_ns != site_packages_mtime
+        ):
+            warnings.extend(self._rebuild_module_index(env))
+
+        if self._active_jobs is not None:
+            report.extend(self._parallelism_report(self._active_jobs))
+
+        if self._memory_limit is not None:
+            report.extend(self._memory_report(self._memory_limit, warnings))
+
+        self._stats.end_phase()
+
+        manifest.write(self._build_path)
+
+        if self._source_date_epoch is not None:
+            self._stats.start_phase("reproducible")
+            self._write(io, f"{message}: <info>Normalizing the bundle</info>")
+
+            self._normalize(env, poetry, self._source_date_epoch)
+            self._stats.end_phase()
+
         self._write(io, self._get_message(poetry, self._path, done=True))
 
+        for line in report:
+            io.write_line(line)
+
         if warnings:
             for warning in warnings:
                 io.write_line(
@@ -220,6 +811,854 @@ class VenvBundler(Bundler):
 
         return True
 
+    def _bundle_atomically(self, poetry: Poetry, io: IO) -> bool:
+        """
+        Build the bundle in a staging directory next to the bundle path
+        and swap it in once complete, so that the bundle path always holds
+        a complete bundle.
+
+        The staging directory is seeded with a clone of the current bundle,
+        so that only what changed has to be installed. A lock file prevents
+        concurrent bundlers from building the same bundle.
+        """
+        from poetry_plugin_bundle.utils import atomic
+        from poetry_plugin_bundle.utils.clone import clone_tree
+        from poetry_plugin_bundle.utils.clone import rewrite_paths
+        from poetry_plugin_bundle.utils.reproducible import normalize_mtimes
+
+        path = self._path.absolute()
+        message = self._get_message(poetry, self._path)
+
+        def on_wait() -> None:
+            io.write_line(
+                f"{message}: <info>Waiting for another bundler to finish</info>"
+            )
+
+        with atomic.bundle_lock(path, on_wait=on_wait):
+            staging = atomic.staging_path(path)
+            current = atomic.current_bundle(path)
+            if current is not None and not self._remove and self._clone_source is None:
+                self._stats.start_phase("staging")
+                clone_tree(current, staging)
+                rewrite_paths(staging, current, staging)
+
+            self._build_path = staging
+            success = False
+            try:
+                success = self._bundle(poetry, io)
+            finally:
+                if not success:
+                    atomic.remove(staging)
+
+            if not success:
+                return False
+
+            # A symbolic link is flipped to the staging directory, which
+            # is therefore the final location of the bundle, while a directory
+            # is replaced by the staging directory.
+            if not path.is_symlink():
+                rewrite_paths(staging, staging, path)
+
+                if self._source_date_epoch is not None:
+                    normalize_mtimes(staging, self._source_date_epoch)
+
+            for directory in atomic.swap(staging, path):
+                atomic.remove(directory)
+
+        return True
+
+    def _normalize(self, env: Env, poetry: Poetry, timestamp: int) -> None:
+        """
+        Remove what differs from one build of the bundle to the next:
+        the order of the RECORD files, the temporary location of the wheel
+        of the root package, the timestamps of the bytecode written
+        by the interpreter, and the modification times of the files.
+        """
+        import os
+
+        from pathlib import Path
+
+        from packaging.utils import canonicalize_name
+
+        from poetry_plugin_bundle.installation.target import TargetEnv
+        from poetry_plugin_bundle.utils import reproducible
+        from poetry_plugin_bundle.utils.module_index import INDEX_NAME
+        from poetry_plugin_bundle.utils.module_index import rebuild_module_index
+        from poetry_plugin_bundle.utils.reproducible import normalize_mtimes
+        from poetry_plugin_bundle.utils.reproducible import remove_direct_url
+        from poetry_plugin_bundle.utils.reproducible import sort_record
+        from poetry_plugin_bundle.utils.site_packages import iter_distributions
+
+        root_name = canonicalize_name(poetry.package.name)
+        for site_packages in {Path(env.paths["purelib"]), Path(env.paths["platlib"])}:
+            for name, dist_info in iter_distributions(site_packages):
+                if name == root_name:
+                    remove_direct_url(dist_info)
+                sort_record(dist_info)
+
+        # Bytecode is specific to the interpreter version, so it must be
+        # recompiled by the environment's Python and not by the running one.
+        # The interpreter of a target never ran, and never wrote any.
+        if not isinstance(env, TargetEnv):
+            script = Path(reproducible.__file__).read_text(encoding="utf-8")
+            script += f"\nprint(hash_bytecode({str(self._build_path)!r}))\n"
+            env.run_python_script(script)
+
+        normalize_mtimes(self._build_path, timestamp)
+
+        # The index records the modification times of the directories it indexes,
+        # and is rewritten in place, which leaves them untouched
+        if rebuild_module_index(env) is not None:
+            index = Path(env.paths["purelib"], INDEX_NAME)
+            os.utime(index, (timestamp, timestamp))
+
+    def _check_reproducibility(self, poetry: Poetry, io: IO) -> bool:
+        """
+        Report the digest of the bundle and, if requested, rebuild it
+        from scratch at the same path and check that both builds have
+        the same files. The bundle is restored afterwards.
+        """
+        import copy
+        import os
+
+        from cleo.io.null_io import NullIO
+
+        from poetry_plugin_bundle.utils import atomic
+        from poetry_plugin_bundle.utils.delta import file_manifest
+        from poetry_plugin_bundle.utils.delta import manifest_digest
+
+        path = self._path.absolute()
+        expected = file_manifest(path)
+        io.write_line(f"  - Bundle digest: <c1>{manifest_digest(expected)}</c1>")
+
+        if not self._verify_reproducible:
+            return True
+
+        message = self._get_message(poetry, self._path)
+        io.write_line(f"{message}: <info>Rebuilding to verify reproducibility</info>")
+
+        # The rebuild must happen at the same path, since it is written
+        # into the scripts and configuration of the virtual environment
+        rebuilder = copy.copy(self)
+        rebuilder.set_remove(True).set_atomic(False).set_clone_source(None)
+        rebuilder.set_metrics_file(None).set_verify_reproducible(False)
+        rebuilder.set_cache_quota(None)
+
+        self._stats.start_phase("verify")
+        aside = atomic.staging_path(path)
+        os.replace(path, aside)
+        try:
+            rebuilt = rebuilder.bundle(poetry, NullIO())
+            actual = file_manifest(path) if rebuilt else None
+        finally:
+            if path.is_symlink():
+                path.unlink()
+            elif path.exists():
+                atomic.remove(path)
+            os.replace(aside, path)
+            self._stats.end_phase()
+
+        error = self._get_message(poetry, self._path, error=True)
+        if actual is None:
+            io.write_error_line(f"{error}: <error>Failed</> to rebuild the bundle")
+            return False
+
+        differences = sorted(
+            name
+            for name in expected.keys() | actual.keys()
+            if expected.get(name) != actual.get(name)
+        )
+        if differences:
+            io.write_error_line(
+                f"{error}: <error>The bundle is not reproducible</>,"
+                f" files differing between two builds: {len(differences)}"
+            )
+            for name in differences[:10]:
+                io.write_error_line(f"  - <c2>{name}</c2>")
+            if len(differences) > 10:
+                io.write_error_line(f"  - and {len(differences) - 10} more")
+            return False
+
+        io.write_line("  - The bundle is reproducible")
+
+        return True
+
+    def _check_caches(self, poetry: Poetry, io: IO) -> None:
+        """
+        Mark the artifacts used by the bundle as recently used,
+        then evict the cold entries of the caches exceeding their quota, if any.
+        """
+        from pathlib import Path
+
+        from poetry_plugin_bundle.utils import caches
+        from poetry_plugin_bundle.utils.memory import format_size
+
+        caches.mark_used(
+            self._used_archives, Path(poetry.config.artifacts_cache_directory)
+        )
+        caches.register_lazy_bundle(poetry.config, self._path)
+        if self._cache_quota is None:
+            return
+
+        pinned = caches.pinned_wheels(poetry.config)
+        for name, directory in caches.cache_directories(poetry.config).items():
+            entries = caches.select_cold_entries(
+                caches.list_entries(name, directory), self._cache_quota, pinned=pinned
+            )
+            if not entries:
+                continue
+
+            freed = caches.evict(entries, directory)
+            io.write_line(
+                f"  - Cold entries evicted from the <c1>{name}</c1> cache"
+                f" to stay within its quota: {len(entries)} ({format_size(freed)})"
+            )
+
+    def _get_job_control(self, poetry: Poetry, jobs: JobLimits) -> JobControl:
+        from poetry_plugin_bundle.installation.concurrency import JobControl
+        from poetry_plugin_bundle.utils.memory import MemoryBudget
+
+        # Pools without a limit of their own use the number of workers of Poetry
+        default = (
+            poetry.config.installer_max_workers
+            if poetry.config.get("installer.parallel", True)
+            else 1
+        )
+        memory = (
+            MemoryBudget(self._memory_limit) if self._memory_limit is not None else None
+        )
+
+        return JobControl(jobs, default, memory=memory)
+
+    def _parallelism_report(self, jobs: JobControl) -> list[str]:
+        report = []
+        for limiter in jobs.limiters():
+            if not limiter.jobs:
+                continue
+
+            limit = f"limit {limiter.limit}"
+            if jobs.adaptive and limiter.limit != limiter.initial_limit:
+                limit += f", adapted from {limiter.initial_limit}"
+            report.append(
+                f"  - <c1>{limiter.name.capitalize()}s</c1>: {limiter.jobs}"
+                f" ({limiter.mean:.1f} at once on average, {limiter.peak} at peak,"
+                f" {limit})"
+            )
+
+        return report
+
+    def _memory_report(self, limit: int, warnings: list[str]) -> list[str]:
+        from poetry_plugin_bundle.utils.memory import format_size
+        from poetry_plugin_bundle.utils.memory import peak_rss
+
+        peak = peak_rss()
+        if peak is None:
+            warnings.append("The peak memory of the bundle could not be measured.")
+            return []
+
+        details = f"limit {format_size(limit)}"
+        if self._active_jobs is not None:
+            held_back = sum(
+                limiter.held_back for limiter in self._active_jobs.limiters()
+            )
+            if held_back:
+                details += f", {held_back} jobs held back"
+        if peak > limit:
+            warnings.append(
+                f"The peak memory of the bundle ({format_size(peak)})"
+                f" exceeded its limit ({format_size(limit)})."
+            )
+
+        return [f"  - <c1>Peak memory</c1>: {format_size(peak)} ({details})"]
+
+    def _start_pipeline(self, poetry: Poetry) -> Pipeline:
+        """
+        Start building the wheel of the root package in the background,
+        as it does not depend on the environment of the bundle.
+        """
+        from poetry_plugin_bundle.installation.pipeline import Pipeline
+
+        pipeline = Pipeline(self._active_jobs)
+        if poetry.is_package_mode:
+            pipeline.build_wheel(poetry)
+
+        return pipeline
+
+    def _get_probe_env(self, poetry: Poetry, executable: Path | None) -> Env | None:
+        """
+        Return an environment expected to have the markers and tags
+        of the environment of the bundle, before it is created.
+        """
+        from poetry.utils.env import VirtualEnv
+
+        from poetry_plugin_bundle.installation.pipeline import InterpreterEnv
+        from poetry_plugin_bundle.installation.pipeline import find_interpreter
+        from poetry_plugin_bundle.installation.target import TargetEnv
+
+        if self._target is not None:
+            return TargetEnv(self._build_path.absolute(), self._target)
+
+        if not self._remove and (self._build_path / "pyvenv.cfg").is_file():
+            return VirtualEnv(self._build_path.absolute())
+
+        interpreter = find_interpreter(poetry.config, executable)
+        if interpreter is None:
+            return None
+
+        return InterpreterEnv(interpreter)
+
+    def _get_base_env(self, base: Path, env: Env) -> Env | None:
+        """
+        Return the environment of the base bundle,
+        if it can be chained to the given environment.
+        """
+        from poetry.utils.env import VirtualEnv
+
+        if not (base / "pyvenv.cfg").is_file():
+            return None
+
+        base_env = VirtualEnv(base.absolute())
+        if base_env.version_info[:2] != env.version_info[:2]:
+            return None
+
+        return base_env
+
+    def _get_manifest(self, poetry: Poetry) -> BundleManifest:
+        from poetry_plugin_bundle.utils.manifest import BundleManifest
+
+        return BundleManifest(
+            poetry.package.name,
+            poetry.package.version.text,
+            BundleManifest.hash_lock(poetry.locker.lock),
+            self._activated_groups,
+        )
+
+    def _clone(
+        self,
+        source: Path,
+        manifest: BundleManifest,
+        io: IO,
+        message: str,
+        warnings: list[str],
+    ) -> bool:
+        """
+        Clone the given bundle into the bundle path,
+        if it was built from the same lock file and dependency groups.
+        """
+        import shutil
+
+        from poetry_plugin_bundle.utils.clone import clone_tree
+        from poetry_plugin_bundle.utils.clone import rewrite_paths
+        from poetry_plugin_bundle.utils.manifest import BundleManifest
+
+        source_manifest = BundleManifest.read(source)
+        if source_manifest is None or not source_manifest.matches(manifest):
+            warnings.append(
+                f"The bundle {source} was not cloned because it does not match"
+                " the lock file and dependency groups of the project."
+            )
+            return False
+
+        path = self._build_path
+        if path.exists() and any(path.iterdir()):
+            if not self._remove:
+                warnings.append(
+                    f"The bundle {source} was not cloned because {self._path}"
+                    " is not empty. Use the --clear option to replace it."
+                )
+                return False
+
+            shutil.rmtree(path)
+
+        self._write(io, f"{message}: <info>Cloning <c2>{source}</c2></info>")
+
+        clone_tree(source, path)
+        for old in {source.absolute(), source.resolve()}:
+            rewrite_paths(path, old, path.absolute())
+
+        return True
+
+    def _write_metrics(
+        self,
+        metrics_file: Path,
+        poetry: Poetry,
+        success: bool,
+        bundle_before: Snapshot,
+    ) -> None:
+        from poetry_plugin_bundle.utils import metrics
+
+        bundle_after = metrics.snapshot(self._path)
+
+        if self._executor is not None:
+            self._stats.downloaded_bytes = self._executor.downloaded_bytes
+            self._stats.cache_hits = self._executor.cache_hits
+            self._stats.cache_misses = self._executor.cache_misses
+        self._stats.written_bytes = metrics.written_bytes(bundle_before, bundle_after)
+        self._stats.size_bytes = metrics.snapshot_size(bundle_after)
+
+        metrics.write_metrics(metrics_file, self._stats, poetry.package.name, success)
+
+    def _get_plan_cache(self, poetry: Poetry) -> InstallPlanCache:
+        from pathlib import Path
+
+        from poetry_plugin_bundle.utils.plan_cache import InstallPlanCache
+
+        return InstallPlanCache(
+            Path(poetry.config.get("cache-dir")) / "bundle" / "plans"
+        )
+
+    def _get_plan_operations(
+        self,
+        plan: list[PlannedPackage],
+        locker: Locker,
+        installed_repository: InstalledRepository,
+        root_name: str,
+    ) -> list[Operation] | None:
+        """
+        Turn a cached install plan into the operations needed
+        to synchronize the given environment with it.
+
+        Returns None if the plan does not match the locked packages anymore.
+        """
+        from poetry.installation.operations.install import Install
+        from poetry.installation.operations.uninstall import Uninstall
+        from poetry.installation.operations.update import Update
+
+        from poetry_plugin_bundle.utils.plan_cache import PlannedPackage
+
+        locked = {
+            PlannedPackage.from_package(package).identity: package
+            for package in locker.locked_repository().packages
+        }
+        installed = {package.name: package for package in installed_repository.packages}
+
+        operations: list[Operation] = []
+        planned_names = set()
+        for planned in plan:
+            package = locked.get(planned.identity)
+            if package is None:
+                return None
+
+            planned_names.add(package.name)
+            current = installed.get(package.name)
+            if current is None:
+                operations.append(Install(package, priority=planned.priority))
+            elif current.version != package.version or (
+                (current.source_type or package.source_type != "legacy")
+                and not package.is_same_package_as(current)
+            ):
+                operations.append(Update(current, package, priority=planned.priority))
+            else:
+                # Like Poetry, which only prioritizes the operations to execute
+                operations.append(Install(package).skip("Already installed"))
+
+        # Like Poetry, keep pip around when it is not managed by the lock file,
+        # and never uninstall packages of the base bundle.
+        preserved = {
+            root_name,
+            "pip",
+            *(package.name for package in installed_repository.system_site_packages),
+        }
+        for name, current in installed.items():
+            if name not in planned_names and name not in preserved:
+                operations.append(Uninstall(current))
+
+        return sorted(
+            operations,
+            key=lambda o: (-o.priority, o.package.name, o.package.version),
+        )
+
+    def _make_sourceless(self, env: Env) -> list[str]:
+        from pathlib import Path
+        from tempfile import TemporaryDirectory
+
+        from poetry.utils.env import EnvCommandError
+
+        from poetry_plugin_bundle.utils.bytecode import compilable_sources
+        from poetry_plugin_bundle.utils.bytecode import strip_sources
+
+        warnings = []
+
+        # The sources of the kept packages are not compiled: their bytecode
+        # would never be imported, and would go stale once they are edited.
+        site_packages = {Path(env.paths["purelib"]), Path(env.paths["platlib"])}
+        sources = [
+            source
+            for path in sorted(site_packages)
+            for source in compilable_sources(path, keep=self._keep_sources)
+        ]
+        if sources:
+            with TemporaryDirectory() as directory:
+                # Too many sources may be compiled to be listed as arguments
+                listing = Path(directory) / "sources.txt"
+                listing.write_text(
+                    "".join(f"{source}\n" for source in sources), encoding="utf-8"
+                )
+
+                # Bytecode is specific to the interpreter version, so it must be
+                # generated by the environment's Python and not by the running one.
+                try:
+                    env.run(
+                        "python", "-m", "compileall", "-b", "-q", "-i", str(listing)
+                    )
+                except EnvCommandError:
+                    warnings.append(
+                        "Some modules could not be compiled to bytecode"
+                        " and their sources were kept."
+                    )
+
+        for path in site_packages:
+            strip_sources(path, keep=self._keep_sources)
+
+        return warnings
+
+    def _consolidate_pth(self, env: Env, warnings: list[str]) -> list[str]:
+        """
+        Consolidate the .pth files of the environment.
+
+        Returns a report of the startup cost of each file and what was done with it.
+        """
+        import contextlib
+
+        from pathlib import Path
+
+        from poetry.utils.env import EnvCommandError
+
+        from poetry_plugin_bundle.utils import pth
+
+        site_packages = Path(env.paths["purelib"])
+
+        costs_before: dict[str, float] | None = None
+        costs_after: dict[str, float] | None = None
+        with contextlib.suppress(EnvCommandError, ValueError):
+            costs_before = pth.startup_costs(env, site_packages)
+
+        files = pth.audit(site_packages)
+        pth.consolidate(site_packages, files)
+
+        with contextlib.suppress(EnvCommandError, ValueError):
+            costs_after = pth.startup_costs(env, site_packages)
+
+        if costs_before is None or costs_after is None:
+            warnings.append("The startup cost of .pth files could not be measured.")
+
+        report = []
+        for file in files:
+            actions = []
+            if file.paths:
+                actions.append(f"merged {len(file.paths)} path entries")
+            if file.hooks:
+                actions.append(f"deferred {len(file.hooks)} import hooks")
+            if file.namespaces:
+                actions.append(
+                    f"removed {len(file.namespaces)} namespace package lines"
+                )
+            if file.eager:
+                actions.append(f"kept {len(file.eager)} executable lines")
+
+            cost = ""
+            if costs_before is not None and file.name in costs_before:
+                cost = f" (<b>{costs_before[file.name] * 1000:.2f}</b> ms)"
+
+            report.append(
+                f"  - <c1>{file.name}</c1>{cost}: {', '.join(actions) or 'empty'}"
+            )
+
+        if costs_before is not None and costs_after is not None:
+            report.append(
+                "  - Startup cost of .pth files:"
+                f" <b>{sum(costs_before.values()) * 1000:.2f}</b> ms before,"
+                f" <b>{sum(costs_after.values()) * 1000:.2f}</b> ms after"
+            )
+
+        return report
+
+    def _analyze_imports(
+        self,
+        env: Env,
+        base_env: Env | None,
+        poetry: Poetry,
+        locked: list[str],
+        warnings: list[str],
+    ) -> list[str]:
+        """
+        Find the locked distributions the project never imports,
+        and remove them if pruning.
+
+        The packages of the base are followed too, since they may import
+        packages of the environment, but are never removed.
+
+        Returns a report of the unreachable distributions.
+        """
+        from pathlib import Path
+
+        from poetry_plugin_bundle.utils.import_graph import analyze_imports
+        from poetry_plugin_bundle.utils.site_packages import iter_distributions
+        from poetry_plugin_bundle.utils.site_packages import remove_distribution
+
+        site_packages = list(
+            dict.fromkeys([Path(env.paths["purelib"]), Path(env.paths["platlib"])])
+        )
+        base_site_packages = []
+        if base_env is not None:
+            base_site_packages = [
+                Path(base_env.paths["purelib"]),
+                Path(base_env.paths["platlib"]),
+            ]
+
+        # Without the root package, e.g. in non-package mode, nothing is known
+        # to be imported, and every locked package would be removed
+        try:
+            analysis = analyze_imports(
+                list(dict.fromkeys([*site_packages, *base_site_packages])),
+                roots=[poetry.package.name, *self._prune_keep],
+                candidates=locked,
+            )
+        except ValueError:
+            warnings.append(
+                "The root package is not installed and no package to keep was given:"
+                " unreachable packages were not searched for, and none was removed."
+            )
+
+            return []
+
+        if analysis.unparsable:
+            warnings.append(
+                f"{len(analysis.unparsable)} modules could not be parsed"
+                " and their imports were not followed."
+            )
+
+        report = []
+        for directory in site_packages:
+            for name, dist_info in iter_distributions(directory):
+                if name not in analysis.unreachable:
+                    continue
+
+                if self._prune_unreachable:
+                    remove_distribution(dist_info, env.path)
+                    report.append(f"  - <c1>{name}</c1> is never imported: removed")
+                else:
+                    report.append(f"  - <c1>{name}</c1> is never imported")
+
+        return report
+
+    def _has_lazy_distributions(self, env: Env) -> bool:
+        from pathlib import Path
+
+        from poetry_plugin_bundle.utils.lazy_loader import MANIFEST_NAME
+
+        return any(
+            (Path(env.paths[scheme]) / MANIFEST_NAME).exists()
+            for scheme in ("purelib", "platlib")
+        )
+
+    def _make_lazy(
+        self,
+        env: Env,
+        executor: BundleExecutor,
+        locked: list[Package],
+        warnings: list[str],
+    ) -> list[str]:
+        """
+        Make the distributions to load lazily lazy, and materialize the lazy
+        distributions that are no longer to be loaded lazily.
+
+        Returns a report of the distributions made lazy or materialized.
+        """
+        import shutil
+
+        from pathlib import Path
+
+        from packaging.utils import InvalidWheelFilename
+        from packaging.utils import canonicalize_name
+        from packaging.utils import parse_wheel_filename
+
+        from poetry_plugin_bundle.utils.lazy import install_lazy_loader
+        from poetry_plugin_bundle.utils.lazy import lazy_entry
+        from poetry_plugin_bundle.utils.lazy import make_lazy
+        from poetry_plugin_bundle.utils.lazy_loader import materialize
+        from poetry_plugin_bundle.utils.site_packages import iter_distributions
+
+        lazy = {canonicalize_name(name) for name in self._lazy}
+        packages = {package.name: package for package in locked}
+
+        wheels: dict[str, Path] = {}
+        for installed in executor._wheel_installer.installed_wheels:
+            try:
+                wheels[parse_wheel_filename(installed.name)[0]] = installed
+            except InvalidWheelFilename:
+                continue
+
+        site_packages = list(
+            dict.fromkeys([Path(env.paths["purelib"]), Path(env.paths["platlib"])])
+        )
+        report = []
+        found = set()
+        for directory in site_packages:
+            for name, dist_info in iter_distributions(directory):
+                entry = lazy_entry(dist_info)
+                if name not in lazy:
+                    if entry is not None:
+                        try:
+                            materialize(str(directory), entry)
+                        except ImportError as e:
+                            warnings.append(f"{name} could not be materialized: {e}")
+                        else:
+                            report.append(f"  - <c1>{name}</c1> is no longer lazy")
+                    continue
+
+                found.add(name)
+                if entry is not None:
+                    continue
+
+                wheel: Path | None = wheels.get(name)
+                if wheel is None and name in packages:
+                    wheel = self._get_cached_wheel(executor, env, packages[name])
+                if wheel is None or not wheel.is_file() or wheel.suffix != ".whl":
+                    warnings.append(
+                        f"{name} was not made lazy because its wheel is not available."
+                    )
+                    continue
+
+                if self._lazy_wheelhouse is not None:
+                    self._lazy_wheelhouse.mkdir(parents=True, exist_ok=True)
+                    target = self._lazy_wheelhouse / wheel.name
+                    if not target.exists():
+                        shutil.copyfile(wheel, target)
+                    wheel = target
+
+                modules = make_lazy(dist_info, wheel)[3]
+                report.append(
+                    f"  - <c1>{name}</c1> is lazy: loaded on first import"
+                    f" of {', '.join(modules) or 'any module'}"
+                )
+
+            install_lazy_loader(directory)
+
+        for name in sorted(lazy - found):
+            warnings.append(f"The lazy package {name} is not installed in the bundle.")
+
+        return report
+
+    def _get_cached_wheel(
+        self, executor: BundleExecutor, env: Env, package: Package
+    ) -> Path | None:
+        """
+        Return the wheel of the given package from the artifact cache, if any.
+        """
+        try:
+            link = executor._chooser.choose_for(package)
+        except RuntimeError:
+            return None
+
+        return executor._artifact_cache.get_cached_archive_for_link(
+            link, strict=False, env=env
+        )
+
+    def _build_module_index(self, env: Env) -> list[str]:
+        from poetry.utils.env import EnvCommandError
+
+        from poetry_plugin_bundle.utils.module_index import install_module_index
+        from poetry_plugin_bundle.utils.module_index import remove_module_index
+
+        try:
+            install_module_index(env)
+        except (EnvCommandError, ValueError):
+            remove_module_index(env)
+
+            return ["The module index could not be built and was not installed."]
+
+        return []
+
+    def _rebuild_module_index(self, env: Env) -> list[str]:
+        from poetry.utils.env import EnvCommandError
+
+        from poetry_plugin_bundle.utils.module_index import rebuild_module_index
+        from poetry_plugin_bundle.utils.module_index import remove_module_index
+
+        try:
+            rebuild_module_index(env)
+        except (EnvCommandError, ValueError):
+            remove_module_index(env)
+
+            return ["The module index could not be rebuilt and was removed."]
+
+        return []
+
+    def _record_startup(
+        self, env: Env, poetry: Poetry, warnings: list[str]
+    ) -> list[str]:
+        """
+        Run the console scripts of the project once in the environment,
+        and write the files they read at startup to a readahead manifest.
+
+        Returns a report of the files recorded.
+        """
+        import contextlib
+        import subprocess
+
+        from pathlib import Path
+
+        from packaging.utils import canonicalize_name
+        from poetry.utils.env import EnvCommandError
+
+        from poetry_plugin_bundle.utils.memory import format_size
+        from poetry_plugin_bundle.utils.readahead import console_scripts
+        from poetry_plugin_bundle.utils.readahead import startup_files
+        from poetry_plugin_bundle.utils.readahead import trace_startup
+        from poetry_plugin_bundle.utils.readahead import write_readahead
+        from poetry_plugin_bundle.utils.site_packages import iter_distributions
+
+        root_name = canonicalize_name(poetry.package.name)
+        scripts = [
+            script
+            for site_packages in dict.fromkeys(
+                [Path(env.paths["purelib"]), Path(env.paths["platlib"])]
+            )
+            for name, dist_info in iter_distributions(site_packages)
+            if name == root_name
+            for script in console_scripts(dist_info)
+        ]
+        if not scripts:
+            self._remove_readahead(env)
+            warnings.append(
+                "The project has no console scripts to run,"
+                " no readahead manifest was written."
+            )
+
+            return []
+
+        paths: list[str] = []
+        for name, value in scripts:
+            try:
+                paths.extend(trace_startup(env, name, value))
+            except (EnvCommandError, subprocess.TimeoutExpired, OSError, ValueError):
+                warnings.append(
+                    f"The files read at startup by {name} could not be recorded."
+                )
+
+        files = startup_files(env.path, paths)
+        write_readahead(env.path, Path(env.paths["purelib"]), files)
+
+        size = 0
+        for file in files:
+            with contextlib.suppress(OSError):
+                size += env.path.joinpath(file).stat().st_size
+
+        line = (
+            f"  - <c1>Readahead</c1>: files read at startup: <b>{len(files)}</b>"
+            f" (<b>{format_size(size)}</b>), by console scripts: <b>{len(scripts)}</b>"
+        )
+
+        return [line]
+
+    def _remove_readahead(self, env: Env) -> None:
+        from pathlib import Path
+
+        from poetry_plugin_bundle.utils.readahead import remove_readahead
+
+        remove_readahead(env.path, Path(env.paths["purelib"]))
+
     def _get_message(
         self, poetry: Poetry, path: Path, done: bool = False, error: bool = False
     ) -> str:
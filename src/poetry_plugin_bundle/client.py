@@ -0,0 +1,151 @@
+"""
+A thin client submitting bundles to the bundle daemon (``poetry bundle daemon``).
+
+It only uses the standard library, so that submitting a bundle does not pay
+for loading Poetry:
+
+    python -m poetry_plugin_bundle.client /path/to/project /path/to/environment
+
+The client and the daemon exchange JSON messages over a Unix socket,
+one per line. The client sends a single request:
+
+    {"project": "...", "path": "...", "options": {"clear": true, ...}}
+
+whose options are named after the fields of ``poetry_plugin_bundle.api.BundleOptions``.
+The daemon answers with an ``{"output": "..."}`` message for each line of output,
+then a final ``{"result": {...}}`` message, holding the fields
+of ``poetry_plugin_bundle.api.BundleResult``, or ``{"error": "..."}``
+if the request could not be processed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+
+
+class DaemonError(Exception):
+    pass
+
+
+def default_socket_path() -> str:
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+
+    return os.path.join(directory, f"poetry-bundle-{uid}.sock")
+
+
+def submit(
+    socket_path: str,
+    project: str,
+    path: str,
+    options: dict[str, Any] | None = None,
+    on_output: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Submit a bundle to the daemon listening on the given socket,
+    and return its result once complete.
+
+    The output of the bundle is passed to the given callback, line by line.
+    """
+    request = {"project": project, "path": path, "options": options or {}}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError as e:
+            raise DaemonError(
+                f"No bundle daemon is listening on {socket_path} ({e.strerror})"
+            ) from e
+
+        client.sendall(json.dumps(request).encode() + b"\n")
+
+        with client.makefile("r", encoding="utf-8") as messages:
+            for line in messages:
+                message = json.loads(line)
+                if "output" in message:
+                    if on_output is not None:
+                        on_output(message["output"])
+                elif "result" in message:
+                    result: dict[str, Any] = message["result"]
+                    return result
+                elif "error" in message:
+                    raise DaemonError(message["error"])
+
+    raise DaemonError("The bundle daemon closed the connection")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m poetry_plugin_bundle.client",
+        description="Bundle a project through the bundle daemon.",
+    )
+    parser.add_argument("project", help="The directory of the project to bundle.")
+    parser.add_argument("path", help="The path of the virtual environment.")
+    parser.add_argument("--socket", default=default_socket_path())
+    parser.add_argument("--python")
+    parser.add_argument("--target")
+    parser.add_argument("--only", action="append", dest="groups", metavar="GROUP")
+    parser.add_argument("--keep-sources", action="append", default=[])
+    parser.add_argument("--prune-keep", action="append", default=[])
+    parser.add_argument("--lazy", action="append", default=[])
+    parser.add_argument("--lazy-wheelhouse")
+    parser.add_argument("--from", dest="clone_from")
+    parser.add_argument("--base")
+    parser.add_argument("--jobs")
+    parser.add_argument("--memory-limit")
+    parser.add_argument("--cache-quota")
+    parser.add_argument("--install-engine", default="poetry")
+    parser.add_argument("--metrics-file")
+    for flag in (
+        "clear",
+        "compile",
+        "sourceless",
+        "find-unreachable",
+        "prune-unreachable",
+        "optimize-pth",
+        "module-index",
+        "readahead",
+        "cache-plan",
+        "atomic",
+        "pipeline",
+        "reproducible",
+        "verify-reproducible",
+    ):
+        parser.add_argument(f"--{flag}", action="store_true")
+
+    args = vars(parser.parse_args(argv))
+    socket_path = args.pop("socket")
+    project = os.path.abspath(args.pop("project"))
+    path = os.path.abspath(args.pop("path"))
+    options = {name: value for name, value in args.items() if value is not None}
+    for name in ("clone_from", "base", "lazy_wheelhouse", "metrics_file"):
+        if name in options:
+            options[name] = os.path.abspath(options[name])
+
+    try:
+        result = submit(socket_path, project, path, options, on_output=print)
+    except DaemonError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+
+    if result["error"]:
+        sys.stderr.write(f"{result['error']}\n")
+
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
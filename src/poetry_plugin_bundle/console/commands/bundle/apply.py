@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from cleo.helpers import argument
+from poetry.console.commands.command import Command
+
+
+class BundleApplyCommand(Command):
+    name = "bundle apply"
+    description = "Apply a delta archive to a bundle"
+
+    arguments = [  # noqa: RUF012
+        argument("delta", "The delta archive to apply."),
+        argument("path", "The bundle to patch in place."),
+    ]
+
+    def handle(self) -> int:
+        from poetry_plugin_bundle.utils.delta import DeltaError
+        from poetry_plugin_bundle.utils.delta import apply_delta
+
+        delta = Path(self.argument("delta"))
+        path = Path(self.argument("path"))
+
+        if not path.is_dir():
+            self.line_error(f"<error>The bundle {path} does not exist.</error>")
+            return 1
+
+        try:
+            stats = apply_delta(delta, path)
+        except (DeltaError, OSError) as e:
+            self.line_error(f"<error>{e}</error>")
+            return 1
+
+        self.line(
+            f"  <fg=green;options=bold>•</> <success>Applied</success> delta"
+            f" <c2>{delta}</c2> to <c2>{path}</c2>:"
+            f" <b>{stats.added}</b> added, <b>{stats.changed}</b> changed"
+            f" and <b>{stats.removed}</b> removed files"
+        )
+
+        return 0
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+from cleo.helpers import option
 from poetry.console.commands.group_command import GroupCommand
 
 
 if TYPE_CHECKING:
+    from cleo.io.inputs.option import Option
+    from cleo.io.io import IO
+
     from poetry_plugin_bundle.bundlers.bundler import Bundler
     from poetry_plugin_bundle.bundlers.bundler_manager import BundlerManager
 
@@ -29,9 +34,69 @@ class BundleCommand(GroupCommand):
     def set_bundler_manager(self, bundler_manager: BundlerManager) -> None:
         self._bundler_manager = bundler_manager
 
+    @staticmethod
+    def _profile_options() -> list[Option]:
+        return [
+            option(
+                "profile",
+                None,
+                "Profile the command and write its profile to the given pstats file,"
+                " and its collapsed stacks next to it, with a"
+                " <comment>.collapsed</comment> suffix.",
+                flag=False,
+                value_required=True,
+            ),
+            option(
+                "profiler",
+                None,
+                "The profiler used by <comment>--profile</comment>:"
+                " <comment>deterministic</comment>, measuring every call,"
+                " or <comment>sampling</comment>, sampling the stacks of every thread"
+                " with a low overhead.",
+                flag=False,
+                default="deterministic",
+            ),
+        ]
+
+    def execute(self, io: IO) -> int:
+        # Only the commands defining the profile options can be profiled
+        output = io.input.option("profile") if io.input.has_option("profile") else None
+        if not output:
+            return super().execute(io)
+
+        from poetry_plugin_bundle.utils.profiling import PROFILERS
+        from poetry_plugin_bundle.utils.profiling import DeterministicProfiler
+        from poetry_plugin_bundle.utils.profiling import SamplingProfiler
+        from poetry_plugin_bundle.utils.profiling import write_profile
+
+        name = io.input.option("profiler")
+        if name not in PROFILERS:
+            io.write_error_line(
+                f'<error>The profiler "{name}" does not exist,'
+                f" expected one of {', '.join(PROFILERS)}.</error>"
+            )
+            return 1
+
+        profiler = (
+            DeterministicProfiler() if name == "deterministic" else SamplingProfiler()
+        )
+        profiler.start()
+        try:
+            return super().execute(io)
+        finally:
+            profiler.stop()
+
+            collapsed = write_profile(profiler, Path(output))
+            io.write_line(
+                f"  - Profile written to <c2>{output}</c2>,"
+                f" with collapsed stacks in <c2>{collapsed}</c2>"
+            )
+
     def configure_bundler(self, bundler: Bundler) -> None:
         """
         Configure the given bundler based on command specific options and arguments.
+
+        Invalid option values raise a ValueError, reported as an error.
         """
 
     def handle(self) -> int:
@@ -40,6 +105,11 @@ class BundleCommand(GroupCommand):
         assert self._bundler_manager is not None
         bundler = self._bundler_manager.bundler(self.bundler_name)
 
-        self.configure_bundler(bundler)
+        try:
+            self.configure_bundler(bundler)
+        except ValueError as e:
+            self.line_error(f"<error>{e}</error>")
+
+            return 1
 
         return int(not bundler.bundle(self.poetry, self._io))
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+
+from collections import defaultdict
+
+from cleo.helpers import argument
+from cleo.helpers import option
+from poetry.console.commands.command import Command
+
+
+class BundleCacheUsageCommand(Command):
+    name = "bundle cache usage"
+    description = "Report the disk usage of the caches filled by bundles"
+
+    options = [  # noqa: RUF012
+        option(
+            "packages",
+            None,
+            "Also report the disk usage of each package in the artifact cache.",
+            flag=True,
+        ),
+    ]
+
+    def handle(self) -> int:
+        from poetry.config.config import Config
+
+        from poetry_plugin_bundle.utils.caches import cache_directories
+        from poetry_plugin_bundle.utils.caches import format_age
+        from poetry_plugin_bundle.utils.caches import list_entries
+        from poetry_plugin_bundle.utils.memory import format_size
+
+        now = time.time()
+        for name, directory in cache_directories(Config.create()).items():
+            entries = list_entries(name, directory)
+            line = (
+                f"<c1>{name}</c1> (<c2>{directory}</c2>):"
+                f" <b>{format_size(sum(entry.size for entry in entries))}</b>"
+                f" in entries: <b>{len(entries)}</b>"
+            )
+            if entries:
+                line += (
+                    f", least recently used {format_age(now - entries[0].last_used)}"
+                )
+            self.line(line)
+
+            if not self.option("packages") or name != "artifacts":
+                continue
+
+            packages = defaultdict(list)
+            for entry in entries:
+                packages[entry.package or "unknown"].append(entry)
+
+            for package, package_entries in sorted(
+                packages.items(),
+                key=lambda item: (-sum(entry.size for entry in item[1]), item[0]),
+            ):
+                self.line(
+                    f"  - <c1>{package}</c1>:"
+                    f" {format_size(sum(entry.size for entry in package_entries))}"
+                    f" in entries: {len(package_entries)},"
+                    f" last used {format_age(now - package_entries[-1].last_used)}"
+                )
+
+        return 0
+
+
+class BundleCacheEvictCommand(Command):
+    name = "bundle cache evict"
+    description = (
+        "Evict the least recently used entries of the caches filled by bundles"
+    )
+
+    arguments = [  # noqa: RUF012
+        argument(
+            "quota",
+            "The quota of each cache: <comment>size=<size></comment>"
+            " and/or <comment>age=<duration></comment>,"
+            " e.g. <comment>size=10G,age=30d</comment>.",
+        ),
+    ]
+    options = [  # noqa: RUF012
+        option(
+            "cache",
+            None,
+            "The cache to evict entries from, all of them by default.",
+            flag=False,
+            multiple=True,
+        ),
+        option(
+            "dry-run",
+            None,
+            "Only report the entries that would be evicted.",
+            flag=True,
+        ),
+    ]
+
+    def handle(self) -> int:
+        from poetry.config.config import Config
+
+        from poetry_plugin_bundle.utils.caches import CACHES
+        from poetry_plugin_bundle.utils.caches import CacheQuota
+        from poetry_plugin_bundle.utils.caches import cache_directories
+        from poetry_plugin_bundle.utils.caches import evict
+        from poetry_plugin_bundle.utils.caches import list_entries
+        from poetry_plugin_bundle.utils.caches import pinned_wheels
+        from poetry_plugin_bundle.utils.caches import select_cold_entries
+        from poetry_plugin_bundle.utils.memory import format_size
+
+        try:
+            quota = CacheQuota.parse(self.argument("quota"))
+        except ValueError as e:
+            self.line_error(f"<error>{e}</error>")
+            return 1
+
+        names = self.option("cache") or CACHES
+        for name in names:
+            if name not in CACHES:
+                self.line_error(
+                    f'<error>The cache "{name}" does not exist,'
+                    f" expected one of {', '.join(CACHES)}.</error>"
+                )
+                return 1
+
+        config = Config.create()
+        pinned = pinned_wheels(config)
+        for name, directory in cache_directories(config).items():
+            if name not in names:
+                continue
+
+            entries = select_cold_entries(
+                list_entries(name, directory), quota, pinned=pinned
+            )
+            if self.option("dry-run"):
+                if self.io.is_verbose():
+                    for entry in entries:
+                        self.line(f"  - Would evict <c2>{entry.path}</c2>")
+                self.line(
+                    f"Entries to evict from the <c1>{name}</c1> cache:"
+                    f" <b>{len(entries)}</b>"
+                    f" (<b>{format_size(sum(e.size for e in entries))}</b>)"
+                )
+                continue
+
+            freed = evict(entries, directory)
+            self.line(
+                f"Entries evicted from the <c1>{name}</c1> cache: <b>{len(entries)}</b>"
+                f" (<b>{format_size(freed)}</b>)"
+            )
+
+        return 0
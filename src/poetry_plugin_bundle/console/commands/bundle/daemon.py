@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from cleo.helpers import option
+from poetry.console.commands.command import Command
+
+
+class BundleDaemonCommand(Command):
+    name = "bundle daemon"
+    description = "Build the bundles submitted over a Unix socket"
+
+    options = [  # noqa: RUF012
+        option(
+            "socket",
+            None,
+            "The path of the Unix socket to listen on.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "max-jobs",
+            None,
+            "The maximum number of bundles to build at once.",
+            flag=False,
+            default="4",
+        ),
+    ]
+
+    def handle(self) -> int:
+        import socketserver
+
+        from poetry_plugin_bundle.client import DaemonError
+        from poetry_plugin_bundle.client import default_socket_path
+        from poetry_plugin_bundle.daemon import BundleDaemon
+
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            self.line_error(
+                "<error>Unix sockets are not supported on this platform.</error>"
+            )
+            return 1
+
+        socket_path = self.option("socket") or default_socket_path()
+        try:
+            max_jobs = int(self.option("max-jobs"))
+        except ValueError:
+            max_jobs = 0
+        if max_jobs < 1:
+            self.line_error(
+                "<error>The maximum number of jobs must be positive.</error>"
+            )
+            return 1
+
+        def on_ready() -> None:
+            self.line(
+                f"  <fg=blue;options=bold>•</> Listening on <c2>{socket_path}</c2>"
+                f" (<b>{max_jobs}</b> concurrent bundles)"
+            )
+
+        daemon = BundleDaemon(socket_path, max_jobs)
+        try:
+            daemon.serve_forever(on_ready=on_ready)
+        except DaemonError as e:
+            self.line_error(f"<error>{e}</error>")
+            return 1
+        except KeyboardInterrupt:
+            pass
+
+        return 0
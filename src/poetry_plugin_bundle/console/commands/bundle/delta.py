@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from cleo.helpers import argument
+from poetry.console.commands.command import Command
+
+
+class BundleDeltaCommand(Command):
+    name = "bundle delta"
+    description = "Create a delta archive between two bundles"
+
+    arguments = [  # noqa: RUF012
+        argument("old", "The old bundle, or its file manifest."),
+        argument("new", "The new bundle."),
+        argument("output", "The path of the delta archive to create."),
+    ]
+
+    def handle(self) -> int:
+        from poetry_plugin_bundle.utils.delta import DeltaError
+        from poetry_plugin_bundle.utils.delta import create_delta
+        from poetry_plugin_bundle.utils.delta import read_manifest
+
+        old = Path(self.argument("old"))
+        new = Path(self.argument("new"))
+        output = Path(self.argument("output"))
+
+        if not new.is_dir():
+            self.line_error(f"<error>The bundle {new} does not exist.</error>")
+            return 1
+
+        try:
+            stats = create_delta(read_manifest(old), new, output)
+        except DeltaError as e:
+            self.line_error(f"<error>{e}</error>")
+            return 1
+
+        self.line(
+            f"  <fg=green;options=bold>•</> <success>Created</success> delta"
+            f" <c2>{output}</c2> from <c2>{old}</c2> to <c2>{new}</c2>:"
+            f" <b>{stats.added}</b> added, <b>{stats.changed}</b> changed"
+            f" and <b>{stats.removed}</b> removed files"
+            f" (<b>{output.stat().st_size}</b> bytes)"
+        )
+
+        return 0
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from cleo.helpers import argument
+from poetry.console.commands.command import Command
+
+
+class BundleManifestCommand(Command):
+    name = "bundle manifest"
+    description = "Write the file manifest of a bundle"
+
+    arguments = [  # noqa: RUF012
+        argument("path", "The bundle to describe."),
+        argument("output", "The path of the file manifest to write."),
+    ]
+
+    def handle(self) -> int:
+        from poetry_plugin_bundle.utils.delta import file_manifest
+        from poetry_plugin_bundle.utils.delta import write_manifest
+
+        path = Path(self.argument("path"))
+        output = Path(self.argument("output"))
+
+        if not path.is_dir():
+            self.line_error(f"<error>The bundle {path} does not exist.</error>")
+            return 1
+
+        files = file_manifest(path)
+        write_manifest(files, output)
+
+        self.line(
+            f"  <fg=green;options=bold>•</> <success>Described</success>"
+            f" <b>{len(files)}</b> files of <c2>{path}</c2> in <c2>{output}</c2>"
+        )
+
+        return 0
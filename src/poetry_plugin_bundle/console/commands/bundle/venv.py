@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import cast
 
 from cleo.helpers import argument
 from cleo.helpers import option
@@ -31,6 +32,16 @@ class BundleVenvCommand(BundleCommand):
             flag=False,
             value_required=True,
         ),
+        option(
+            "target",
+            None,
+            "Bundle for another platform without running its interpreter, from"
+            " comma-separated platform, python, abi, implementation and home items,"
+            " e.g. <comment>platform=manylinux_2_28_aarch64,python=3.11.9</comment>."
+            " Only wheels are installed.",
+            flag=False,
+            value_required=True,
+        ),
         option(
             "clear",
             None,
@@ -45,6 +56,184 @@ class BundleVenvCommand(BundleCommand):
             " because the old installer always compiles.)",
             flag=True,
         ),
+        option(
+            "sourceless",
+            None,
+            "Compile every module to bytecode and remove the Python sources.",
+            flag=True,
+        ),
+        option(
+            "keep-sources",
+            None,
+            "A package whose sources must be kept in sourceless mode."
+            " Can be used multiple times.",
+            flag=False,
+            multiple=True,
+        ),
+        option(
+            "find-unreachable",
+            None,
+            "Report the locked packages that the project never imports,"
+            " following its import graph statically.",
+            flag=True,
+        ),
+        option(
+            "prune-unreachable",
+            None,
+            "Remove the locked packages that the project never imports"
+            " from the bundle.",
+            flag=True,
+        ),
+        option(
+            "prune-keep",
+            None,
+            "A package to keep when pruning, e.g. because it is imported dynamically."
+            " Can be used multiple times.",
+            flag=False,
+            multiple=True,
+        ),
+        option(
+            "lazy",
+            None,
+            "A package to unpack from its wheel the first time it is imported,"
+            " rather than when bundling. Can be used multiple times.",
+            flag=False,
+            multiple=True,
+        ),
+        option(
+            "lazy-wheelhouse",
+            None,
+            "A directory to copy the wheels of lazy packages to,"
+            " instead of loading them from Poetry's artifact cache.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "optimize-pth",
+            None,
+            "Merge the path entries of .pth files into a single file and defer"
+            " the import hooks known to be safe to defer, to speed up startup.",
+            flag=True,
+        ),
+        option(
+            "module-index",
+            None,
+            "Index the modules of the bundle and install a finder using the index,"
+            " to speed up imports.",
+            flag=True,
+        ),
+        option(
+            "readahead",
+            None,
+            "Run the console scripts of the project once in the bundle, list the files"
+            " they read at startup in a readahead manifest, and ship a module"
+            " prefetching them.",
+            flag=True,
+        ),
+        option(
+            "cache-plan",
+            None,
+            "Cache the resolved install plan and reuse it"
+            " as long as the lock file, groups and target environment are unchanged.",
+            flag=True,
+        ),
+        option(
+            "from",
+            None,
+            "Clone an existing bundle of the project, built from the same lock file"
+            " and dependency groups, instead of creating the virtual environment"
+            " from scratch.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "base",
+            None,
+            "Chain the bundle to a base bundle, installing only the packages"
+            " the base lacks.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "atomic",
+            None,
+            "Build the bundle in a staging directory and swap it in once complete,"
+            " so that the bundle path never holds a partial bundle.",
+            flag=True,
+        ),
+        option(
+            "pipeline",
+            None,
+            "Download the locked artifacts and build the root package"
+            " while the virtual environment is being created.",
+            flag=True,
+        ),
+        option(
+            "jobs",
+            None,
+            "The number of downloads, builds and installs to run at once:"
+            " a number for all of them, <comment>auto</comment> to adapt them"
+            " to the observed throughput, or limits per pool,"
+            " e.g. <comment>download=16,build=2,install=4</comment>.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "memory-limit",
+            None,
+            "The memory the bundling process should stay within,"
+            " e.g. <comment>512M</comment>: downloads, builds and installs"
+            " are held back while it uses too much, and its peak is reported.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "cache-quota",
+            None,
+            "Evict the least recently used entries of the caches filled by bundles"
+            " beyond the given quota once bundled,"
+            " e.g. <comment>size=10G,age=30d</comment>.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "reproducible",
+            None,
+            "Build a byte-reproducible bundle, using <comment>SOURCE_DATE_EPOCH</comment>"
+            " as the time of its files and hash-based bytecode invalidation.",
+            flag=True,
+        ),
+        option(
+            "verify-reproducible",
+            None,
+            "Build a reproducible bundle, then rebuild it from scratch"
+            " and check that both builds are identical.",
+            flag=True,
+        ),
+        option(
+            "install-engine",
+            None,
+            "The engine used to install packages: <comment>poetry</comment>"
+            " or <comment>direct</comment>, which unpacks wheels straight"
+            " into the virtual environment.",
+            flag=False,
+            default="poetry",
+        ),
+        option(
+            "metrics-file",
+            None,
+            "Write statistics about the bundle to the given file,"
+            " in the Prometheus text format.",
+            flag=False,
+            value_required=True,
+        ),
+        option(
+            "watch",
+            None,
+            "Keep the bundle up to date by watching the project for changes.",
+            flag=True,
+        ),
+        *BundleCommand._profile_options(),
     ]
 
     bundler_name = "venv"
@@ -52,6 +241,138 @@ class BundleVenvCommand(BundleCommand):
     def configure_bundler(self, bundler: VenvBundler) -> None:  # type: ignore[override]
         bundler.set_path(Path(self.argument("path")))
         bundler.set_executable(self.option("python"))
+        bundler.set_target(self.option("target"))
         bundler.set_remove(self.option("clear"))
         bundler.set_compile(self.option("compile"))
+        bundler.set_sourceless(self.option("sourceless"))
+        bundler.set_keep_sources(self.option("keep-sources"))
+        bundler.set_find_unreachable(self.option("find-unreachable"))
+        bundler.set_prune_unreachable(self.option("prune-unreachable"))
+        bundler.set_prune_keep(self.option("prune-keep"))
+        bundler.set_lazy(self.option("lazy"))
+        lazy_wheelhouse = self.option("lazy-wheelhouse")
+        bundler.set_lazy_wheelhouse(Path(lazy_wheelhouse) if lazy_wheelhouse else None)
+        bundler.set_optimize_pth(self.option("optimize-pth"))
+        bundler.set_module_index(self.option("module-index"))
+        bundler.set_readahead(self.option("readahead"))
+        bundler.set_cache_plan(self.option("cache-plan"))
+        bundler.set_atomic(self.option("atomic"))
+        bundler.set_pipeline(self.option("pipeline"))
+        bundler.set_jobs(self.option("jobs"))
+        bundler.set_memory_limit(self.option("memory-limit"))
+        bundler.set_cache_quota(self.option("cache-quota"))
+        bundler.set_reproducible(self.option("reproducible"))
+        bundler.set_verify_reproducible(self.option("verify-reproducible"))
+        base = self.option("base")
+        bundler.set_base(Path(base) if base else None)
+        bundler.set_install_engine(self.option("install-engine"))
+        clone_source = self.option("from")
+        bundler.set_clone_source(Path(clone_source) if clone_source else None)
+        metrics_file = self.option("metrics-file")
+        bundler.set_metrics_file(Path(metrics_file) if metrics_file else None)
         bundler.set_activated_groups(self.activated_groups)
+
+    def handle(self) -> int:
+        if not self.option("watch"):
+            return super().handle()
+
+        return self._watch()
+
+    def _watch(self) -> int:
+        from poetry_plugin_bundle.utils.watcher import ProjectWatcher
+
+        assert self._bundler_manager is not None
+
+        project_directory = self.poetry.file.path.parent
+        # Changes to these files require the dependencies to be synchronized,
+        # changes to the sources of the root package require it to be reinstalled,
+        # and any other change is ignored.
+        dependency_files = {
+            project_directory / "pyproject.toml",
+            project_directory / "poetry.lock",
+        }
+        # Changes made while the first bundle is built must not be missed
+        watcher = ProjectWatcher(
+            project_directory, exclude=[Path(self.argument("path"))]
+        )
+
+        return_code = super().handle()
+        if return_code:
+            return return_code
+
+        self.line("")
+        self.line("<info>Watching for changes. Press Ctrl+C to stop.</info>")
+
+        # Dependencies that could not be synchronized are synchronized
+        # by the next bundle, even if only sources changed in between.
+        dependencies_pending = False
+        try:
+            while True:
+                changes = watcher.wait()
+                dependencies_changed = dependencies_pending or bool(
+                    changes & dependency_files
+                )
+
+                # A broken project or a failed bundle must not end the session,
+                # the next change may well fix it.
+                try:
+                    if not dependencies_changed and not self._source_changes(changes):
+                        continue
+
+                    self.get_application().reset_poetry()
+                    bundler = cast(
+                        "VenvBundler", self._bundler_manager.bundler(self.bundler_name)
+                    )
+                    self.configure_bundler(bundler)
+                    # The bundle already exists, it is only kept up to date
+                    bundler.set_remove(False)
+                    bundler.set_clone_source(None)
+                    bundler.set_only_root(not dependencies_changed)
+
+                    self.line("")
+                    success = bundler.bundle(self.poetry, self._io)
+                except Exception as e:  # noqa: BLE001
+                    self.line_error(f"<error>{e}</error>")
+                    success = False
+
+                dependencies_pending = not success and dependencies_changed
+                if not success:
+                    self.line_error(
+                        "<warning>The bundle could not be updated,"
+                        " waiting for further changes.</warning>"
+                    )
+        except KeyboardInterrupt:
+            return 0
+
+    def _source_changes(self, changes: set[Path]) -> set[Path]:
+        """
+        Return the given changed files that belong to the root package.
+        """
+        from poetry.core.masonry.utils.module import Module
+
+        if not self.poetry.is_package_mode:
+            return set()
+
+        package = self.poetry.package
+        try:
+            module = Module(
+                package.name,
+                self.poetry.file.path.parent.as_posix(),
+                packages=package.packages,
+                includes=package.include,
+            )
+        except ValueError:
+            # The sources of the root package cannot be found
+            return set()
+
+        sources = {
+            element.absolute()
+            for include in module.includes
+            for element in include.elements
+        }
+
+        return {
+            path
+            for path in changes
+            if path in sources or any(source in path.parents for source in sources)
+        }
@@ -0,0 +1,199 @@
+"""
+A long-running daemon building bundles submitted over a Unix socket,
+so that Poetry, the projects it loaded and their parsed lock files stay in memory
+from one bundle to the next.
+
+The protocol is described in ``poetry_plugin_bundle.client``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from cleo.io.inputs.string_input import StringInput
+from cleo.io.io import IO
+from cleo.io.outputs.output import Output
+
+from poetry_plugin_bundle import api
+from poetry_plugin_bundle.api import BundleOptions
+from poetry_plugin_bundle.api import BundleResult
+from poetry_plugin_bundle.client import DaemonError
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+
+_PATH_OPTIONS = {"clone_from", "base", "lazy_wheelhouse", "metrics_file"}
+_TUPLE_OPTIONS = {"keep_sources", "prune_keep", "lazy"}
+
+
+class BundleDaemon:
+    """
+    Build the bundles submitted to the given socket, at most ``max_jobs`` at once.
+
+    Bundles run as threads of the daemon. Bundles of the same path,
+    or of the same project, whose loaded instance they share, are built
+    one after the other, and bundles relying on the state of the whole process,
+    e.g. its environment variables, are built alone.
+    """
+
+    def __init__(self, socket_path: str, max_jobs: int = 4) -> None:
+        self._socket_path = socket_path
+        self._slots = threading.BoundedSemaphore(max_jobs)
+        self._locks: dict[tuple[str, Path], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+
+    def serve_forever(self, on_ready: Callable[[], None] | None = None) -> None:
+        self._remove_stale_socket()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                lock = threading.Lock()
+
+                def send(message: dict[str, Any]) -> None:
+                    with lock, contextlib.suppress(OSError):
+                        self.wfile.write(json.dumps(message).encode() + b"\n")
+                        self.wfile.flush()
+
+                daemon.handle(self.rfile.readline(), send)
+
+        # Only the user running the daemon may submit bundles: the socket
+        # is created with restricted permissions, rather than restricted once bound
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self._socket_path, Handler)
+        finally:
+            os.umask(umask)
+
+        server.daemon_threads = True
+        self._server = server
+        try:
+            if on_ready is not None:
+                on_ready()
+
+            server.serve_forever()
+        finally:
+            server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._socket_path)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def handle(self, request: bytes, send: Callable[[dict[str, Any]], None]) -> None:
+        try:
+            project, path, options = parse_request(json.loads(request))
+        except (ValueError, TypeError, KeyError) as e:
+            send({"error": f"Invalid request: {e}"})
+            return
+
+        output = MessageOutput(send)
+        io = api.style_io(IO(StringInput(""), output, output))
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(self._slot(output))
+            stack.enter_context(self._lock("path", path))
+            stack.enter_context(self._lock("project", project))
+            try:
+                result = api.bundle(project, path, options, io=io)
+            except Exception as e:  # noqa: BLE001
+                result = BundleResult.from_error(project, path, e)
+
+        output.flush()
+        send({"result": serialize_result(result)})
+
+    @contextlib.contextmanager
+    def _slot(self, output: Output) -> Iterator[None]:
+        if not self._slots.acquire(blocking=False):
+            output.write_line("Waiting for a free job slot")
+            self._slots.acquire()
+
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _lock(self, kind: str, path: Path) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault((kind, path.absolute()), threading.Lock())
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self._socket_path):
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(self._socket_path)
+            except OSError:
+                os.unlink(self._socket_path)
+                return
+
+        raise DaemonError(
+            f"A bundle daemon is already listening on {self._socket_path}"
+        )
+
+
+class MessageOutput(Output):
+    """
+    An output sending each line written to it as a message.
+    """
+
+    def __init__(self, send: Callable[[dict[str, Any]], None]) -> None:
+        super().__init__(decorated=False)
+
+        self._send = send
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._send({"output": self._buffer})
+                self._buffer = ""
+
+    def _write(self, message: str, new_line: bool = False) -> None:
+        with self._lock:
+            self._buffer += message + ("\n" if new_line else "")
+            *lines, self._buffer = self._buffer.split("\n")
+            for line in lines:
+                self._send({"output": line})
+
+
+def parse_request(request: dict[str, Any]) -> tuple[Path, Path, BundleOptions]:
+    options: dict[str, Any] = dict(request.get("options") or {})
+
+    unknown = set(options) - set(BundleOptions._fields)
+    if unknown:
+        raise ValueError(f"unknown options {', '.join(sorted(unknown))}")
+
+    for name in _PATH_OPTIONS & set(options):
+        options[name] = Path(options[name]) if options[name] else None
+    if options.get("groups") is not None:
+        options["groups"] = frozenset(options["groups"])
+    for name in _TUPLE_OPTIONS & set(options):
+        options[name] = tuple(options[name])
+
+    return Path(request["project"]), Path(request["path"]), BundleOptions(**options)
+
+
+def serialize_result(result: BundleResult) -> dict[str, Any]:
+    return {
+        **result._asdict(),
+        "project": str(result.project),
+        "path": str(result.path),
+    }
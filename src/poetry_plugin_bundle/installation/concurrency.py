@@ -0,0 +1,305 @@
+"""
+Limits on the number of downloads, builds and installs running at once in a bundle.
+
+Poetry runs each operation in a single pool of threads, downloading, building
+and installing its package in turn. Here the pool is sized for the largest limit,
+and each stage waits for a slot of its own pool, so that e.g. many downloads
+can run while only a few wheels are unpacked to disk.
+
+Given a memory budget, a pool also holds new jobs back while the process
+uses too much memory, as long as one of its jobs is running.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+    from poetry_plugin_bundle.utils.memory import MemoryBudget
+
+
+POOLS = ("download", "build", "install")
+
+# The maximum number of jobs of each pool in adaptive mode, per CPU:
+# downloads mostly wait for the network, builds are bound by the CPU
+# and installs by the disk.
+_ADAPTIVE_MAXIMUM_PER_CPU = {"download": 4, "build": 1, "install": 2}
+
+
+class JobLimits(NamedTuple):
+    """
+    The number of jobs of each pool, Poetry's ``installer.max-workers`` if unset.
+
+    In adaptive mode, the numbers of jobs are only the initial limits.
+    """
+
+    download: int | None = None
+    build: int | None = None
+    install: int | None = None
+    adaptive: bool = False
+
+    @classmethod
+    def parse(cls, value: str) -> JobLimits:
+        """
+        Parse the value of the ``--jobs`` option: a number of jobs for every pool,
+        ``auto``, or comma-separated ``<pool>=<jobs>`` items,
+        e.g. ``download=16,install=4``, which may be combined with ``auto``.
+        """
+        limits: dict[str, int] = {}
+        adaptive = False
+        for item in value.split(","):
+            item = item.strip()
+            if item == "auto":
+                adaptive = True
+                continue
+
+            pool, _, jobs = item.rpartition("=")
+            pools = POOLS if not pool else (pool.strip(),)
+            if not set(pools) <= set(POOLS):
+                raise ValueError(
+                    f'The pool "{pool.strip()}" does not exist,'
+                    f" expected one of {', '.join(POOLS)}."
+                )
+
+            try:
+                number = int(jobs)
+            except ValueError:
+                number = 0
+            if number < 1:
+                raise ValueError(
+                    f'Invalid number of jobs "{jobs.strip()}": a positive integer'
+                    " is expected."
+                )
+
+            for name in pools:
+                limits[name] = number
+
+        return cls(**limits, adaptive=adaptive)
+
+
+class Job:
+    """
+    A job running in a slot of a pool.
+
+    ``units`` measures the work done by the job, e.g. the number of bytes
+    it downloaded, to compute the throughput of the pool.
+    """
+
+    def __init__(self) -> None:
+        self.units = 1.0
+
+
+class AdaptiveLimit:
+    """
+    Adjust the limit of a pool from the throughput of its jobs, by hill climbing.
+
+    Once as many jobs as the limit completed, the limit is raised
+    if the throughput improved, and lowered if the throughput dropped
+    or the latency of the jobs, per unit of work, rose well above the best
+    seen so far, as happens when the disk or the network is saturated.
+    """
+
+    def __init__(self, limit: int, maximum: int) -> None:
+        self.limit = limit
+        self._maximum = maximum
+        self._best_throughput = 0.0
+        self._best_latency: float | None = None
+        self._window_start: float | None = None
+        self._units = 0.0
+        self._latency = 0.0
+        self._completed = 0
+
+    def start(self, now: float) -> None:
+        if self._window_start is None:
+            self._window_start = now
+
+    def record(self, units: float, latency: float, now: float) -> int:
+        """
+        Record a completed job and return the new limit.
+        """
+        assert self._window_start is not None
+
+        self._units += units
+        self._latency += latency / max(units, 1.0)
+        self._completed += 1
+        if self._completed < self.limit:
+            return self.limit
+
+        throughput = self._units / max(now - self._window_start, 1e-9)
+        latency = self._latency / self._completed
+        if throughput > self._best_throughput * 1.1:
+            self.limit = min(self.limit + 1, self._maximum)
+        elif throughput < self._best_throughput * 0.8 or (
+            self._best_latency is not None and latency > self._best_latency * 2
+        ):
+            self.limit = max(self.limit - 1, 1)
+
+        self._best_throughput = max(self._best_throughput, throughput)
+        if self._best_latency is None or latency < self._best_latency:
+            self._best_latency = latency
+        self._window_start = now
+        self._units = self._latency = 0.0
+        self._completed = 0
+
+        return self.limit
+
+
+class ConcurrencyLimiter:
+    """
+    A pool of slots, recording how many jobs ran at once
+    and how many were held back by the memory budget.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        adaptive: AdaptiveLimit | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        memory: MemoryBudget | None = None,
+    ) -> None:
+        self.name = name
+        self.initial_limit = limit
+        self.peak = 0
+        self.jobs = 0
+        self.held_back = 0
+        self._limit = limit
+        self._adaptive = adaptive
+        self._memory = memory
+        self._clock = clock
+        self._active = 0
+        self._condition = threading.Condition()
+        self._last_change = 0.0
+        self._busy_time = 0.0
+        self._job_time = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean number of jobs running at once, while any was running.
+        """
+        with self._condition:
+            self._update(self._clock())
+            return self._job_time / self._busy_time if self._busy_time else 0.0
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[Job]:
+        held_back = False
+
+        def can_start() -> bool:
+            nonlocal held_back
+
+            if self._active >= self._limit:
+                return False
+
+            # A job always starts when the pool is idle, so that the bundle
+            # progresses, and otherwise waits for a running job to complete
+            # and release its memory.
+            if (
+                self._active
+                and self._memory is not None
+                and not self._memory.available()
+            ):
+                held_back = True
+                return False
+
+            return True
+
+        with self._condition:
+            self._condition.wait_for(can_start)
+            if held_back:
+                self.held_back += 1
+            start = self._clock()
+            self._update(start)
+            self._active += 1
+            self.jobs += 1
+            self.peak = max(self.peak, self._active)
+            if self._adaptive is not None:
+                self._adaptive.start(start)
+
+        job = Job()
+        try:
+            yield job
+        finally:
+            with self._condition:
+                now = self._clock()
+                self._update(now)
+                self._active -= 1
+                if self._adaptive is not None:
+                    self._limit = self._adaptive.record(job.units, now - start, now)
+                self._condition.notify_all()
+
+    def _update(self, now: float) -> None:
+        if self._active:
+            self._busy_time += now - self._last_change
+            self._job_time += (now - self._last_change) * self._active
+        self._last_change = now
+
+
+class JobControl:
+    """
+    The download, build and install pools of a bundle.
+    """
+
+    def __init__(
+        self,
+        limits: JobLimits,
+        default: int,
+        cpu_count: int | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        memory: MemoryBudget | None = None,
+    ) -> None:
+        cpu_count = cpu_count or os.cpu_count() or 1
+
+        self.adaptive = limits.adaptive
+        self.memory = memory
+        self._limiters: dict[str, ConcurrencyLimiter] = {}
+        self._maximum = 1
+        for pool in POOLS:
+            limit: int = getattr(limits, pool) or default
+            adaptive = None
+            maximum = limit
+            if limits.adaptive:
+                maximum = max(limit, _ADAPTIVE_MAXIMUM_PER_CPU[pool] * cpu_count)
+                adaptive = AdaptiveLimit(limit, maximum)
+
+            self._limiters[pool] = ConcurrencyLimiter(
+                pool, limit, adaptive, clock, memory
+            )
+            self._maximum = max(self._maximum, maximum)
+
+    @property
+    def max_jobs(self) -> int:
+        """
+        The number of jobs that can run at once across all pools.
+        """
+        return self._maximum
+
+    @property
+    def download(self) -> ConcurrencyLimiter:
+        return self._limiters["download"]
+
+    @property
+    def build(self) -> ConcurrencyLimiter:
+        return self._limiters["build"]
+
+    @property
+    def install(self) -> ConcurrencyLimiter:
+        return self._limiters["install"]
+
+    def limiters(self) -> list[ConcurrencyLimiter]:
+        return list(self._limiters.values())
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from packaging.utils import canonicalize_name
+from poetry.installation.chef import Chef
+from poetry.installation.executor import Executor
+from poetry.installation.operations.install import Install
+from poetry.installation.wheel_installer import WheelInstaller
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Future
+
+    from cleo.io.io import IO
+    from poetry.config.config import Config
+    from poetry.core.packages.package import Package
+    from poetry.core.packages.utils.link import Link
+    from poetry.installation.operations.operation import Operation
+    from poetry.installation.operations.update import Update
+    from poetry.repositories import RepositoryPool
+    from poetry.utils.env import Env
+
+    from poetry_plugin_bundle.installation.concurrency import ConcurrencyLimiter
+    from poetry_plugin_bundle.installation.concurrency import JobControl
+    from poetry_plugin_bundle.installation.pipeline import Pipeline
+
+
+class BundleExecutor(Executor):
+    """
+    The executor used to install packages into bundles.
+
+    It records every executed operation and every archive it used,
+    and can optionally install packages directly: wheels from package
+    repositories are downloaded and unpacked into the environment in a single
+    pool of threads, regardless of the priority of their operation, without
+    going through the regular per-operation machinery of Poetry. This is safe because
+    installing a wheel never requires its dependencies to be installed.
+    Every other operation is delegated to Poetry.
+
+    When given a pipeline, downloading an artifact waits for the pipeline
+    to have prefetched it, so that each package is installed as soon as
+    its artifact is ready.
+
+    When given job limits, downloads, builds and installs each wait
+    for a slot of their own pool.
+
+    When wheels are required, e.g. for an environment whose interpreter
+    cannot be run, packages are only installed by unpacking wheels
+    and uninstalled by removing their files, and operations needing
+    to build a package fail before anything is installed.
+    """
+
+    def __init__(
+        self,
+        env: Env,
+        pool: RepositoryPool,
+        config: Config,
+        io: IO,
+        parallel: bool | None = None,
+        disable_cache: bool = False,
+    ) -> None:
+        super().__init__(env, pool, config, io, parallel, disable_cache)
+
+        self._config = config
+        self._disable_cache = disable_cache
+        self._chef: LimitedChef = LimitedChef(self._artifact_cache, env, pool)
+        self._wheel_installer: LimitedWheelInstaller = LimitedWheelInstaller(env)
+        self._direct_installation = False
+        self._require_wheels = False
+        self._pipeline: Pipeline | None = None
+        self._jobs: JobControl | None = None
+        self.executed_operations: list[Operation] = []
+        self.used_archives: list[Path] = []
+        self.wheel_errors: list[str] = []
+        # The operations whose artifact was fetched from the artifact cache,
+        # and the size of the artifacts that had to be downloaded into it,
+        # by operation ID
+        self._fetched: set[int] = set()
+        self._downloaded: dict[int, int] = {}
+
+    def enable_direct_installation(self, enable: bool = True) -> BundleExecutor:
+        self._direct_installation = enable
+
+        return self
+
+    def require_wheels(self, require: bool = True) -> BundleExecutor:
+        self._require_wheels = require
+
+        return self
+
+    def set_pipeline(self, pipeline: Pipeline | None) -> BundleExecutor:
+        self._pipeline = pipeline
+
+        return self
+
+    def set_jobs(self, jobs: JobControl | None) -> BundleExecutor:
+        from poetry.utils.authenticator import Authenticator
+
+        self._jobs = jobs
+        self._chef.limiter = jobs.build if jobs is not None else None
+        self._wheel_installer.limiter = jobs.install if jobs is not None else None
+
+        # Operations run in a single pool of threads,
+        # which must be large enough for the largest limit.
+        if jobs is not None and jobs.max_jobs != self._max_workers:
+            self._executor.shutdown(wait=False)
+            self._max_workers = jobs.max_jobs
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+            self._authenticator = Authenticator(
+                self._config,
+                self._io,
+                disable_cache=self._disable_cache,
+                pool_size=self._max_workers,
+            )
+
+        return self
+
+    @property
+    def cache_hits(self) -> int:
+        """
+        The number of artifacts found in the artifact cache.
+        """
+        return len(self._fetched - self._downloaded.keys())
+
+    @property
+    def cache_misses(self) -> int:
+        """
+        The number of artifacts downloaded into the artifact cache,
+        including those prefetched by the pipeline but not used.
+        """
+        return len(self._downloaded) + len(self._prefetched())
+
+    @property
+    def downloaded_bytes(self) -> int:
+        """
+        The number of bytes downloaded into the artifact cache,
+        including those prefetched by the pipeline but not used.
+        """
+        return sum(self._downloaded.values()) + sum(self._prefetched().values())
+
+    def _prefetched(self) -> dict[str, int]:
+        return self._pipeline.downloaded if self._pipeline is not None else {}
+
+    def execute(self, operations: list[Operation]) -> int:
+        self.executed_operations.extend(operations)
+
+        if self._require_wheels and not self._dry_run:
+            return self._execute_wheels(operations)
+
+        if not self._direct_installation or self._dry_run:
+            return super().execute(operations)
+
+        direct = [
+            operation
+            for operation in operations
+            if isinstance(operation, Install) and self._is_direct(operation)
+        ]
+        if not direct:
+            return super().execute(operations)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [
+                (operation, pool.submit(self._install_directly, operation))
+                for operation in direct
+            ]
+
+        installed = self._wait_for_installs(futures)
+        if installed is None:
+            return 1
+
+        # Operations whose artifact turned out not to be a wheel
+        # are executed by Poetry along with all the other ones.
+        remaining = [
+            operation for operation in operations if id(operation) not in installed
+        ]
+        if not remaining:
+            return 0
+
+        return super().execute(remaining)
+
+    def _execute_wheels(self, operations: list[Operation]) -> int:
+        from poetry.installation.operations.uninstall import Uninstall
+        from poetry.installation.operations.update import Update
+
+        from poetry_plugin_bundle.utils.site_packages import iter_distributions
+        from poetry_plugin_bundle.utils.site_packages import remove_distribution
+
+        operations = [operation for operation in operations if not operation.skipped]
+
+        # Every wheel is found before anything is installed
+        links: list[tuple[Install | Update, Link]] = []
+        errors = []
+        for operation in operations:
+            if isinstance(operation, (Install, Update)):
+                try:
+                    links.append((operation, self._find_wheel(operation.package)))
+                except WheelNotFoundError as e:
+                    errors.append(str(e))
+
+        if errors:
+            self.wheel_errors.extend(errors)
+            for error in errors:
+                self._io.write_error_line(f"  <error>-</error> {error}")
+            return 1
+
+        removed = {
+            canonicalize_name(operation.initial_package.name)
+            if isinstance(operation, Update)
+            else canonicalize_name(operation.package.name)
+            for operation in operations
+            if isinstance(operation, (Update, Uninstall))
+        }
+        site_packages = Path(self._env.paths["purelib"])
+        for name, dist_info in iter_distributions(site_packages):
+            if name in removed:
+                remove_distribution(dist_info, self._env.path)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [
+                (operation, pool.submit(self._install_wheel, operation, link))
+                for operation, link in links
+            ]
+
+        return 0 if self._wait_for_installs(futures) is not None else 1
+
+    def _wait_for_installs(
+        self, futures: Sequence[tuple[Install | Update, Future[bool]]]
+    ) -> set[int] | None:
+        """
+        Wait for the given installations and return the IDs of the operations
+        whose package was installed, or None if any failed.
+        """
+        installed = set()
+        failed = False
+        for operation, future in futures:
+            try:
+                if future.result():
+                    installed.add(id(operation))
+            except Exception as e:  # noqa: BLE001
+                package = operation.package
+                self._io.write_error_line(
+                    f"  <error>-</error> Installing <c1>{package.pretty_name}</c1>"
+                    f" (<c2>{package.full_pretty_version}</c2>):"
+                    f" <error>Failed</error> ({e})"
+                )
+                failed = True
+
+        return installed if not failed else None
+
+    def _find_wheel(self, package: Package) -> Link:
+        """
+        Return the link of the wheel of the given package matching the environment.
+        """
+        from poetry.core.packages.utils.link import Link
+        from poetry.core.packages.utils.utils import path_to_url
+        from poetry.utils.wheel import Wheel
+
+        description = (
+            f"<c1>{package.pretty_name}</c1> (<c2>{package.full_pretty_version}</c2>)"
+        )
+        if package.source_type in {None, "legacy"}:
+            try:
+                link = self._chooser.choose_for(package)
+            except RuntimeError:
+                raise WheelNotFoundError(
+                    f"No wheel of {description} matches the environment"
+                ) from None
+
+            if not link.is_wheel:
+                raise WheelNotFoundError(
+                    f"No wheel of {description} matches the environment,"
+                    " only a source distribution is available"
+                )
+
+            return link
+
+        if package.source_type in {"file", "url"} and package.source_url:
+            link = Link(
+                path_to_url(package.source_url)
+                if package.source_type == "file"
+                else package.source_url
+            )
+            if not link.is_wheel:
+                raise WheelNotFoundError(
+                    f"{description} is a source distribution,"
+                    " which cannot be built for the environment"
+                )
+
+            if not Wheel(link.filename).is_supported_by_environment(self._env):
+                raise WheelNotFoundError(
+                    f"The wheel of {description} does not match the environment"
+                )
+
+            return link
+
+        raise WheelNotFoundError(
+            f"{description} is a {package.source_type} dependency,"
+            " which cannot be built for the environment"
+        )
+
+    def _install_wheel(self, operation: Install | Update, link: Link) -> bool:
+        from poetry.core.packages.utils.utils import url_to_path
+
+        if link.scheme == "file":
+            archive = url_to_path(link.url)
+        else:
+            archive = self._download_link(operation, link)
+
+        return self._install_archive(operation, archive)
+
+    def _download_link(self, operation: Install | Update, link: Link) -> Path:
+        if self._pipeline is not None:
+            self._pipeline.wait_for(operation.package)
+
+        archive = super()._download_link(operation, link)
+        self.used_archives.append(archive)
+        self._fetched.add(id(operation))
+
+        # An artifact prefetched by the pipeline is found in the artifact cache,
+        # but was downloaded by the bundle all the same
+        if self._pipeline is not None:
+            size = self._pipeline.pop_download(operation.package)
+            if size is not None:
+                self._downloaded[id(operation)] = size
+
+        return archive
+
+    def _download_archive(
+        self, operation: Install | Update, url: str, dest: Path
+    ) -> None:
+        if self._jobs is None:
+            super()._download_archive(operation, url, dest)
+        else:
+            with self._jobs.download.slot() as job:
+                super()._download_archive(operation, url, dest)
+                job.units = dest.stat().st_size
+
+        self._downloaded[id(operation)] = dest.stat().st_size
+
+    def _is_direct(self, operation: Install) -> bool:
+        return not operation.skipped and operation.package.source_type in {
+            None,
+            "legacy",
+        }
+
+    def _install_directly(self, operation: Install) -> bool:
+        """
+        Install the package of the given operation if a wheel is available for it.
+
+        Returns False if the operation must be executed by Poetry instead.
+        """
+        link = self._chooser.choose_for(operation.package)
+        if not link.is_wheel:
+            return False
+
+        archive = self._download_link(operation, link)
+        if archive.suffix != ".whl":
+            return False
+
+        return self._install_archive(operation, archive)
+
+    def _install_archive(self, operation: Install | Update, archive: Path) -> bool:
+        """
+        Install the given wheel of the package of an operation.
+        """
+        self._wheel_installer.install(archive)
+
+        if self._io.is_verbose():
+            package = operation.package
+            self._io.write_line(
+                f"  <fg=blue;options=bold>-</> Installed <c1>{package.pretty_name}</c1>"
+                f" (<c2>{package.full_pretty_version}</c2>)"
+            )
+
+        return True
+
+
+class WheelNotFoundError(Exception):
+    pass
+
+
+class LimitedChef(Chef):
+    """
+    A chef building packages in the slots of a pool, if any.
+    """
+
+    limiter: ConcurrencyLimiter | None = None
+
+    def _prepare(
+        self, directory: Path, destination: Path, *, editable: bool = False
+    ) -> Path:
+        if self.limiter is None:
+            return super()._prepare(directory, destination, editable=editable)
+
+        with self.limiter.slot():
+            return super()._prepare(directory, destination, editable=editable)
+
+
+class LimitedWheelInstaller(WheelInstaller):
+    """
+    A wheel installer installing wheels in the slots of a pool, if any.
+
+    It records the wheels it installed.
+    """
+
+    limiter: ConcurrencyLimiter | None = None
+
+    def __init__(self, env: Env) -> None:
+        from poetry_plugin_bundle.installation.target import TargetEnv
+
+        super().__init__(env)
+
+        # Scripts are made for the platform of the target, not the running one
+        if isinstance(env, TargetEnv):
+            self._script_kind = env.target.script_kind  # type: ignore[assignment]
+
+        self.installed_wheels: list[Path] = []
+
+    def install(self, wheel: Path) -> None:
+        if self.limiter is None:
+            super().install(wheel)
+        else:
+            with self.limiter.slot() as job:
+                super().install(wheel)
+                job.units = wheel.stat().st_size
+
+        self.installed_wheels.append(wheel)
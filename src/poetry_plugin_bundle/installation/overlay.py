@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import contextlib
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from poetry.repositories.installed_repository import InstalledRepository
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from poetry.core.packages.package import Package
+    from poetry.utils.env import Env
+
+
+# Executable .pth files are processed by the site module at startup,
+# so the base is chained through site.addsitedir() rather than a plain path entry:
+# the .pth files of the base (including its own base, if any) are processed too.
+BASE_PTH = "_poetry_bundle_base.pth"
+
+
+def chain(env: Env, base: Env) -> None:
+    """
+    Make the packages of the base environment importable from the given one,
+    after its own packages.
+    """
+    directories = dict.fromkeys([base.paths["purelib"], base.paths["platlib"]])
+    lines = [
+        f"import site; site.addsitedir({directory!r})\n" for directory in directories
+    ]
+
+    _pth(env).write_text("".join(lines), encoding="utf-8")
+
+
+def unchain(env: Env) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        _pth(env).unlink()
+
+
+def overlay_repository(
+    env: Env, base: Env, locked: Iterable[Package]
+) -> InstalledRepository:
+    """
+    Return the packages installed in the given environment
+    along with the packages of the base that can be used as they are.
+
+    The packages of the base are marked as system site packages,
+    so that they are never uninstalled. Packages of the base whose version
+    does not match the lock file are left out, so that the locked version
+    is installed in the overlay, shadowing the one of the base.
+    """
+    repository = InstalledRepository.load(env)
+    installed = {package.name for package in repository.packages}
+
+    locked_packages: dict[str, list[Package]] = {}
+    for package in locked:
+        locked_packages.setdefault(package.name, []).append(package)
+
+    for package in InstalledRepository.load(base).packages:
+        if package.name in installed:
+            continue
+
+        candidates = locked_packages.get(package.name)
+        if candidates is None or any(
+            candidate.version == package.version for candidate in candidates
+        ):
+            repository.add_package(package, is_system_site=True)
+
+    return repository
+
+
+def _pth(env: Env) -> Path:
+    return Path(env.paths["purelib"]) / BASE_PTH
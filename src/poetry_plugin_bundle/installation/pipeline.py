@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import shutil
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from poetry.utils.env import GenericEnv
+
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from poetry.config.config import Config
+    from poetry.core.packages.package import Package
+    from poetry.installation.operations.install import Install
+    from poetry.packages.locker import Locker
+    from poetry.poetry import Poetry
+    from poetry.utils.env import Env
+
+    from poetry_plugin_bundle.installation.concurrency import JobControl
+    from poetry_plugin_bundle.installation.executor import BundleExecutor
+
+
+class InterpreterEnv(GenericEnv):
+    """
+    The environment of a Python interpreter, only used to know
+    the markers and tags of the environments created from it.
+    """
+
+    def __init__(self, executable: Path) -> None:
+        self._interpreter = executable
+
+        super().__init__(executable.parent)
+
+    def find_executables(self) -> None:
+        self._executable = str(self._interpreter)
+
+
+def find_interpreter(config: Config, executable: Path | None) -> Path | None:
+    """
+    Return the interpreter a new environment would most likely be created from.
+    """
+    if executable is not None:
+        found = shutil.which(str(executable))
+
+        return Path(found) if found else None
+
+    from poetry.utils.env.python_manager import Python
+
+    return Python.get_preferred_python(config).executable
+
+
+class Pipeline:
+    """
+    Runs the stages of a bundle that do not depend on its environment
+    in the background, while the environment is being created:
+    building the wheel of the root package and downloading the artifacts
+    of the locked packages into the artifact cache.
+
+    The artifacts are chosen for an environment expected to match the one
+    of the bundle. Artifacts that turn out not to match it are simply not used,
+    and the installation downloads the right ones itself.
+
+    Downloads share the job limits of the bundle, if any, and their sizes
+    are recorded, by package, to be accounted for by the bundle.
+    """
+
+    def __init__(self, jobs: JobControl | None = None) -> None:
+        self._jobs = jobs
+        self._directory = TemporaryDirectory()
+        self._background = ThreadPoolExecutor(max_workers=2)
+        self._downloads: ThreadPoolExecutor | None = None
+        self._wheel: Future[Path] | None = None
+        self._plan: Future[None] | None = None
+        self._fetched: dict[str, Future[Path]] = {}
+        self._downloaded: dict[str, int] = {}
+
+    def build_wheel(self, poetry: Poetry) -> None:
+        self._wheel = self._background.submit(
+            self._build_wheel, poetry, Path(self._directory.name)
+        )
+
+    def wheel(self) -> Path:
+        """
+        Wait for the wheel of the root package to be built and return it.
+        """
+        assert self._wheel is not None
+
+        return self._wheel.result()
+
+    def prefetch(
+        self,
+        env: Env,
+        poetry: Poetry,
+        locker: Locker,
+        activated_groups: set[str] | None,
+    ) -> None:
+        self._plan = self._background.submit(
+            self._prefetch, env, poetry, locker, activated_groups
+        )
+
+    def wait_for(self, package: Package) -> None:
+        """
+        Wait for the artifact of the given package to be downloaded,
+        if it is being prefetched.
+
+        Failures are ignored: the artifact is then downloaded again when installed.
+        """
+        if self._plan is not None:
+            wait([self._plan])
+
+        future = self._fetched.get(package.name)
+        if future is not None:
+            wait([future])
+
+    @property
+    def downloaded(self) -> dict[str, int]:
+        """
+        The size of the artifacts downloaded into the artifact cache,
+        by package name, that were not popped yet.
+        """
+        return dict(self._downloaded)
+
+    def pop_download(self, package: Package) -> int | None:
+        """
+        Return the size of the artifact of the given package if it was downloaded
+        into the artifact cache, and forget it.
+        """
+        return self._downloaded.pop(package.name, None)
+
+    def close(self) -> None:
+        self._background.shutdown(wait=True)
+        if self._downloads is not None:
+            self._downloads.shutdown(wait=True, cancel_futures=True)
+
+        with contextlib.suppress(OSError):
+            self._directory.cleanup()
+
+    def _build_wheel(self, poetry: Poetry, directory: Path) -> Path:
+        from poetry.core.masonry.builders.wheel import WheelBuilder
+
+        return directory / WheelBuilder.make_in(poetry, directory=directory)
+
+    def _prefetch(
+        self,
+        env: Env,
+        poetry: Poetry,
+        locker: Locker,
+        activated_groups: set[str] | None,
+    ) -> None:
+        from cleo.io.null_io import NullIO
+        from poetry.installation.installer import Installer
+        from poetry.installation.operations.install import Install
+        from poetry.repositories.installed_repository import InstalledRepository
+
+        from poetry_plugin_bundle.installation.executor import BundleExecutor
+
+        # Every locked package needed by the environment is planned for installation,
+        # so that the artifacts are ready whatever is already installed in the bundle.
+        executor = BundleExecutor(env, poetry.pool, poetry.config, NullIO())
+        executor.set_jobs(self._jobs)
+        installer = Installer(
+            NullIO(),
+            env,
+            poetry.package,
+            locker,
+            poetry.pool,
+            poetry.config,
+            installed=InstalledRepository(),
+            executor=executor,
+        )
+        if activated_groups is not None:
+            installer.only_groups(activated_groups)
+        installer.dry_run(True)
+
+        if installer.run():
+            return
+
+        self._downloads = ThreadPoolExecutor(max_workers=executor._max_workers)
+        for operation in executor.executed_operations:
+            if (
+                isinstance(operation, Install)
+                and not operation.skipped
+                and operation.package.source_type in {None, "legacy"}
+            ):
+                self._fetched[operation.package.name] = self._downloads.submit(
+                    self._download, executor, operation
+                )
+
+    def _download(self, executor: BundleExecutor, operation: Install) -> Path:
+        link = executor._chooser.choose_for(operation.package)
+
+        return executor._artifact_cache.get_cached_archive_for_link(
+            link,
+            strict=True,
+            download_func=functools.partial(
+                self._download_archive, executor, operation
+            ),
+        )
+
+    def _download_archive(
+        self, executor: BundleExecutor, operation: Install, url: str, dest: Path
+    ) -> None:
+        executor._download_archive(operation, url, dest)
+        self._downloaded[operation.package.name] = dest.stat().st_size
@@ -0,0 +1,437 @@
+"""
+Bundle for another platform without running the interpreter of the bundle.
+
+The target is described by data: its platform tags, Python version and ABI.
+The markers and the supported tags of the target environment are derived from them,
+and packages are installed by unpacking wheels matching the target only,
+since building a package or compiling bytecode requires the target interpreter.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from poetry.utils.env import Env
+
+
+if TYPE_CHECKING:
+    from packaging.tags import Tag
+
+
+TARGET_KEY = "poetry-bundle-target"
+
+_KEYS = ("platform", "python", "abi", "implementation", "home")
+
+_IMPLEMENTATIONS = {"cp": ("cpython", "CPython"), "pp": ("pypy", "PyPy")}
+
+# The manylinux tags predating PEP 600, by version of glibc
+_LEGACY_MANYLINUX = {
+    "manylinux2014": (2, 17),
+    "manylinux2010": (2, 12),
+    "manylinux1": (2, 5),
+}
+
+# The markers whose value depends on the micro version of Python
+_FULL_VERSION_MARKERS = ("python_full_version", "implementation_version")
+
+_WINDOWS_MACHINES = {"win32": "x86", "win_amd64": "AMD64", "win_arm64": "ARM64"}
+
+_WINDOWS_SCRIPT_KINDS = {
+    "win32": "win-ia32",
+    "win_amd64": "win-amd64",
+    "win_arm64": "win-arm64",
+}
+
+
+class TargetError(Exception):
+    pass
+
+
+class TargetSpec(NamedTuple):
+    """
+    The platform and Python interpreter a bundle is built for.
+
+    ``platforms`` are the platform tags of the target, the most specific first,
+    e.g. ``manylinux_2_28_aarch64`` which also accepts older manylinux wheels.
+    ``home`` is the directory of the target interpreter, written into the
+    ``pyvenv.cfg`` file of the bundle. ``full_version`` is whether the micro
+    version of Python is known, taken as 0 otherwise.
+    """
+
+    platforms: tuple[str, ...]
+    python_version: tuple[int, int, int]
+    abi: str
+    implementation: str = "cp"
+    home: str | None = None
+    full_version: bool = True
+
+    @classmethod
+    def parse(cls, value: str) -> TargetSpec:
+        """
+        Parse the value of the ``--target`` option: comma-separated
+        ``<key>=<value>`` items, e.g.
+        ``platform=manylinux_2_28_aarch64,python=3.11.9,abi=cp311``.
+
+        The platform may be given multiple times. The ABI defaults to the one
+        of CPython for the Python version, and the implementation to CPython.
+        """
+        items: dict[str, list[str]] = {}
+        for item in value.split(","):
+            key, separator, item_value = item.partition("=")
+            key = key.strip()
+            item_value = item_value.strip()
+            if not separator or not item_value:
+                raise ValueError(
+                    f'Invalid target item "{item.strip()}": <key>=<value> is expected.'
+                )
+
+            if key not in _KEYS:
+                raise ValueError(
+                    f'The target key "{key}" does not exist,'
+                    f" expected one of {', '.join(_KEYS)}."
+                )
+
+            if key != "platform" and key in items:
+                raise ValueError(f'The target key "{key}" is given multiple times.')
+
+            items.setdefault(key, []).append(item_value)
+
+        if "platform" not in items or "python" not in items:
+            raise ValueError("The target must have a platform and a Python version.")
+
+        match = re.fullmatch(r"(\d+)\.(\d+)(?:\.(\d+))?", items["python"][0])
+        if match is None:
+            raise ValueError(
+                f'Invalid Python version "{items["python"][0]}":'
+                " <major>.<minor>[.<micro>] is expected."
+            )
+        major, minor, micro = (int(part or 0) for part in match.groups())
+
+        implementation = items.get("implementation", ["cp"])[0]
+        if implementation not in _IMPLEMENTATIONS:
+            raise ValueError(
+                f'The implementation "{implementation}" is not supported,'
+                f" expected one of {', '.join(_IMPLEMENTATIONS)}."
+            )
+
+        if "abi" in items:
+            abi = items["abi"][0]
+        elif implementation == "cp":
+            abi = f"cp{major}{minor}"
+        else:
+            raise ValueError("The target must have an ABI for this implementation.")
+
+        platforms = tuple(items["platform"])
+        for platform in platforms:
+            _parse_platform(platform)
+
+        return cls(
+            platforms,
+            (major, minor, micro),
+            abi,
+            implementation,
+            items.get("home", [None])[0],
+            match.group(3) is not None,
+        )
+
+    def __str__(self) -> str:
+        items = [f"platform={platform}" for platform in self.platforms]
+        items.append(f"python={self.version}")
+        items.append(f"abi={self.abi}")
+        items.append(f"implementation={self.implementation}")
+        if self.home is not None:
+            items.append(f"home={self.home}")
+
+        return ",".join(items)
+
+    @property
+    def version(self) -> str:
+        """
+        The Python version of the target, as given.
+        """
+        version = self.python_version if self.full_version else self.python_version[:2]
+
+        return ".".join(map(str, version))
+
+    @property
+    def is_windows(self) -> bool:
+        return _parse_platform(self.platforms[0])[0] == "win32"
+
+    @property
+    def script_kind(self) -> str:
+        """
+        The kind of the scripts of entry points, as understood by ``installer``.
+        """
+        return _WINDOWS_SCRIPT_KINDS.get(self.platforms[0], "posix")
+
+    def marker_env(self) -> dict[str, Any]:
+        sys_platform, platform_system, platform_machine = _parse_platform(
+            self.platforms[0]
+        )
+        implementation_name, python_implementation = _IMPLEMENTATIONS[
+            self.implementation
+        ]
+        python_version = ".".join(map(str, self.python_version[:2]))
+        python_full_version = ".".join(map(str, self.python_version))
+
+        return {
+            "implementation_name": implementation_name,
+            "implementation_version": python_full_version,
+            "os_name": "nt" if sys_platform == "win32" else "posix",
+            "platform_machine": platform_machine,
+            # Unknown without the target, and hardly ever used by markers
+            "platform_release": "",
+            "platform_system": platform_system,
+            "platform_version": "",
+            "python_full_version": python_full_version,
+            "platform_python_implementation": python_implementation,
+            "python_version": python_version,
+            "sys_platform": sys_platform,
+            "version_info": (*self.python_version, "final", 0),
+            "interpreter_name": self.implementation,
+            "interpreter_version": "".join(map(str, self.python_version[:2])),
+        }
+
+    def supported_tags(self) -> list[Tag]:
+        """
+        Return the tags of the wheels the target can install, the most specific first.
+        """
+        from packaging import tags
+
+        platforms: list[str] = []
+        for platform in self.platforms:
+            for tag in _compatible_platforms(platform):
+                if tag not in platforms:
+                    platforms.append(tag)
+
+        python_version = self.python_version[:2]
+        interpreter = f"{self.implementation}{python_version[0]}{python_version[1]}"
+        if self.implementation == "cp":
+            supported = list(tags.cpython_tags(python_version, [self.abi], platforms))
+        else:
+            supported = list(tags.generic_tags(interpreter, [self.abi], platforms))
+
+        supported.extend(tags.compatible_tags(python_version, interpreter, platforms))
+
+        return supported
+
+
+class TargetEnv(Env):
+    """
+    The environment of a bundle built for a target, which can be laid out
+    and inspected, but not run.
+    """
+
+    def __init__(self, path: Path, target: TargetSpec) -> None:
+        self.target = target
+
+        super().__init__(path)
+
+        self._bin_dir = path / ("Scripts" if target.is_windows else "bin")
+
+    @classmethod
+    def create(cls, path: Path, target: TargetSpec, clear: bool = False) -> TargetEnv:
+        """
+        Lay out a virtual environment for the given target at the given path,
+        or reuse the existing one if it was laid out for the same target.
+        """
+        pyvenv_cfg = path / "pyvenv.cfg"
+        if path.exists() and (clear or not pyvenv_cfg.exists()):
+            if any(path.iterdir()) and not clear:
+                raise TargetError(
+                    f"{path} is not empty and is not a virtual environment."
+                )
+
+            shutil.rmtree(path)
+        elif pyvenv_cfg.exists():
+            existing = read_target(path)
+            if existing != str(target):
+                raise TargetError(
+                    f"{path} is not a virtual environment for the same target."
+                )
+
+            return cls(path, target)
+
+        env = cls(path, target)
+        Path(env.paths["purelib"]).mkdir(parents=True)
+        env.bin_dir.mkdir(parents=True, exist_ok=True)
+
+        major, minor, _ = target.python_version
+        lines = []
+        if target.home is not None:
+            lines.append(f"home = {target.home}")
+        lines += [
+            "include-system-site-packages = false",
+            f"version = {target.version}",
+            f"{TARGET_KEY} = {target}",
+        ]
+        pyvenv_cfg.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        if target.home is not None and not target.is_windows:
+            # The interpreter of the target, once the bundle is deployed
+            (env.bin_dir / f"python{major}.{minor}").symlink_to(
+                Path(target.home, f"python{major}.{minor}")
+            )
+            for name in (f"python{major}", "python"):
+                (env.bin_dir / name).symlink_to(f"python{major}.{minor}")
+
+        return env
+
+    @property
+    def python(self) -> Path:
+        return self._bin_dir / ("python.exe" if self.target.is_windows else "python")
+
+    @property
+    def sys_path(self) -> list[str]:
+        return [self.paths["purelib"]]
+
+    def find_executables(self) -> None:
+        pass
+
+    def get_marker_env(self) -> dict[str, Any]:
+        return self.target.marker_env()
+
+    def get_supported_tags(self) -> list[Tag]:
+        return self.target.supported_tags()
+
+    def get_paths(self) -> dict[str, str]:
+        major, minor, _ = self.target.python_version
+        if self.target.is_windows:
+            site_packages = self._path / "Lib" / "site-packages"
+            scripts = self._path / "Scripts"
+        else:
+            site_packages = (
+                self._path / "lib" / f"python{major}.{minor}" / "site-packages"
+            )
+            scripts = self._path / "bin"
+
+        return {
+            "purelib": str(site_packages),
+            "platlib": str(site_packages),
+            "scripts": str(scripts),
+            "data": str(self._path),
+        }
+
+    def is_venv(self) -> bool:
+        return True
+
+    def _run(self, cmd: list[str], **kwargs: Any) -> str:
+        raise TargetError(
+            f"The interpreter of the target {self.target} cannot be run"
+            f" to execute {' '.join(cmd)}."
+        )
+
+    def execute(self, bin: str, *args: str, **kwargs: Any) -> int:
+        raise TargetError(
+            f"The interpreter of the target {self.target} cannot be run"
+            f" to execute {bin}."
+        )
+
+
+def uses_full_version(data: object) -> bool:
+    """
+    Return whether the markers of the given lock file or project data
+    depend on the micro version of Python.
+    """
+    if isinstance(data, str):
+        return any(name in data for name in _FULL_VERSION_MARKERS)
+
+    if isinstance(data, dict):
+        return any(map(uses_full_version, data.values()))
+
+    if isinstance(data, list):
+        return any(map(uses_full_version, data))
+
+    return False
+
+
+def read_target(path: Path) -> str | None:
+    """
+    Return the target the virtual environment at the given path was laid out for.
+    """
+    try:
+        content = (path / "pyvenv.cfg").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    for line in content.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip() == TARGET_KEY:
+            return value.strip()
+
+    return None
+
+
+def _parse_platform(platform: str) -> tuple[str, str, str]:
+    """
+    Return the sys.platform, platform.system() and platform.machine()
+    of the given platform tag.
+    """
+    if platform in _WINDOWS_MACHINES:
+        return "win32", "Windows", _WINDOWS_MACHINES[platform]
+
+    match = re.fullmatch(
+        r"(?:manylinux_\d+_\d+|musllinux_\d+_\d+|manylinux\d+|linux)_(?P<machine>\w+)",
+        platform,
+    )
+    if match is not None:
+        return "linux", "Linux", match.group("machine")
+
+    match = re.fullmatch(r"macosx_\d+_\d+_(?P<machine>\w+)", platform)
+    if match is not None:
+        return "darwin", "Darwin", match.group("machine")
+
+    raise ValueError(
+        f'The platform "{platform}" is not supported: a manylinux, musllinux,'
+        " linux, macosx or win platform tag is expected."
+    )
+
+
+def _compatible_platforms(platform: str) -> list[str]:
+    """
+    Return the platform tags of the wheels installable on the given platform,
+    the most specific first.
+    """
+    from packaging import tags
+
+    for legacy, (major, minor) in _LEGACY_MANYLINUX.items():
+        if platform.startswith(f"{legacy}_"):
+            platform = f"manylinux_{major}_{minor}_{platform[len(legacy) + 1 :]}"
+
+    match = re.fullmatch(r"manylinux_(\d+)_(\d+)_(\w+)", platform)
+    if match is not None:
+        major, minor, arch = int(match.group(1)), int(match.group(2)), match.group(3)
+        aliases = {version: legacy for legacy, version in _LEGACY_MANYLINUX.items()}
+        platforms = []
+        for glibc_minor in range(minor, -1, -1):
+            platforms.append(f"manylinux_{major}_{glibc_minor}_{arch}")
+            if (major, glibc_minor) in aliases:
+                platforms.append(f"{aliases[major, glibc_minor]}_{arch}")
+
+        return [*platforms, f"linux_{arch}"]
+
+    match = re.fullmatch(r"musllinux_(\d+)_(\d+)_(\w+)", platform)
+    if match is not None:
+        major, minor, arch = int(match.group(1)), int(match.group(2)), match.group(3)
+
+        return [
+            *(
+                f"musllinux_{major}_{musl_minor}_{arch}"
+                for musl_minor in range(minor, -1, -1)
+            ),
+            f"linux_{arch}",
+        ]
+
+    match = re.fullmatch(r"macosx_(\d+)_(\d+)_(\w+)", platform)
+    if match is not None:
+        version = (int(match.group(1)), int(match.group(2)))
+
+        return list(tags.mac_platforms(version, match.group(3)))
+
+    return [platform]
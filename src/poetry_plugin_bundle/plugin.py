@@ -7,6 +7,12 @@ from typing import cast
 from cleo.events.console_events import COMMAND
 from poetry.plugins.application_plugin import ApplicationPlugin
 
+from poetry_plugin_bundle.console.commands.bundle.apply import BundleApplyCommand
+from poetry_plugin_bundle.console.commands.bundle.cache import BundleCacheEvictCommand
+from poetry_plugin_bundle.console.commands.bundle.cache import BundleCacheUsageCommand
+from poetry_plugin_bundle.console.commands.bundle.daemon import BundleDaemonCommand
+from poetry_plugin_bundle.console.commands.bundle.delta import BundleDeltaCommand
+from poetry_plugin_bundle.console.commands.bundle.manifest import BundleManifestCommand
 from poetry_plugin_bundle.console.commands.bundle.venv import BundleVenvCommand
 
 
@@ -19,7 +25,15 @@ if TYPE_CHECKING:
 class BundleApplicationPlugin(ApplicationPlugin):
     @property
     def commands(self) -> list[type[Command]]:
-        return [BundleVenvCommand]
+        return [
+            BundleVenvCommand,
+            BundleDeltaCommand,
+            BundleApplyCommand,
+            BundleManifestCommand,
+            BundleDaemonCommand,
+            BundleCacheUsageCommand,
+            BundleCacheEvictCommand,
+        ]
 
     def activate(self, application: Application) -> None:
         assert application.event_dispatcher
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import sys
+import time
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@contextlib.contextmanager
+def bundle_lock(
+    path: Path, on_wait: Callable[[], None] | None = None
+) -> Iterator[None]:
+    """
+    Hold an exclusive lock on the given bundle path, waiting for it if necessary.
+
+    The lock is held on a file next to the bundle, so that it does not need
+    the bundle to exist, and is released by the operating system
+    if the process dies.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = path.with_name(f".{path.name}.lock")
+
+    with lock_path.open("a+b") as f:
+        if not _try_lock(f.fileno()):
+            if on_wait is not None:
+                on_wait()
+
+            while not _try_lock(f.fileno()):
+                time.sleep(0.1)
+
+        try:
+            yield
+        finally:
+            _unlock(f.fileno())
+
+
+def staging_path(path: Path) -> Path:
+    """
+    Return a new staging directory for the given bundle path.
+
+    It lives next to the bundle, on the same file system,
+    so that it can be renamed into place.
+    """
+    token = f"{time.time_ns()}-{os.getpid()}"
+
+    return path.with_name(f".{path.name}.bundle-{token}")
+
+
+def current_bundle(path: Path) -> Path | None:
+    """
+    Return the directory that currently holds the bundle, if any.
+    """
+    if path.is_symlink():
+        target = path.resolve()
+        return target if target.is_dir() else None
+
+    return path if path.is_dir() else None
+
+
+def swap(staging: Path, path: Path) -> list[Path]:
+    """
+    Atomically replace the bundle at the given path by the staging directory.
+
+    If the bundle path is a symbolic link, the link is flipped to point
+    to the staging directory. Otherwise the staging directory is renamed
+    into place, exchanging both directories atomically when the operating
+    system supports it.
+
+    Returns the directories of older bundles that are no longer needed.
+    """
+    if path.is_symlink():
+        previous = path.resolve()
+
+        link = path.with_name(f".{path.name}.link-{os.getpid()}")
+        os.symlink(staging.name, link, target_is_directory=True)
+        os.replace(link, path)
+
+        # The previous bundle is kept, since running processes may still import
+        # from it, but any older one can be removed. Both sides are resolved,
+        # since the parent directory may be reached through a symbolic link.
+        kept = {staging.resolve(), previous}
+        return [
+            directory
+            for directory in path.parent.glob(f".{path.name}.bundle-*")
+            if directory.is_dir() and directory.resolve() not in kept
+        ]
+
+    if not path.exists():
+        os.rename(staging, path)
+
+        return []
+
+    if _exchange(staging, path):
+        # The staging path now holds the previous bundle
+        return [staging]
+
+    backup = path.with_name(f".{path.name}.previous-{os.getpid()}")
+    os.rename(path, backup)
+    os.rename(staging, path)
+
+    return [backup]
+
+
+def remove(directory: Path) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _exchange(source: Path, destination: Path) -> bool:
+    if sys.platform != "linux":
+        return False
+
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    renameat2 = getattr(libc, "renameat2", None)
+    if renameat2 is None:
+        # glibc < 2.28
+        return False
+
+    at_fdcwd = -100
+    rename_exchange = 2
+    result = renameat2(
+        at_fdcwd,
+        os.fsencode(source),
+        at_fdcwd,
+        os.fsencode(destination),
+        rename_exchange,
+    )
+
+    return bool(result == 0)
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+
+        return True
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        return True
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import base64
+import csv
+import hashlib
+import io
+import os
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.site_packages import distribution_files
+from poetry_plugin_bundle.utils.site_packages import iter_distributions
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+
+def compilable_sources(site_packages: Path, keep: Collection[str] = ()) -> list[Path]:
+    """
+    Return the Python sources of the given site-packages directory to compile
+    to legacy-location bytecode, leaving out those of the distributions listed in keep.
+    """
+    kept = distribution_files(site_packages, keep)
+
+    return [
+        source
+        for source in sorted(site_packages.rglob("*.py"))
+        if source not in kept and source.is_file()
+    ]
+
+
+def strip_sources(site_packages: Path, keep: Collection[str] = ()) -> int:
+    """
+    Remove the Python sources of the given site-packages directory
+    for which a legacy-location bytecode file (module.pyc next to module.py) exists.
+
+    Sources belonging to the distributions listed in keep are left untouched.
+    Cached bytecode in __pycache__ directories is removed along with the sources
+    since it would never be used by the interpreter again. The RECORD files
+    of the distributions list the bytecode instead.
+
+    Returns the number of removed source files.
+    """
+    kept = distribution_files(site_packages, keep)
+
+    removed = 0
+    stripped: set[Path] = set()
+    uncached: set[Path] = set()
+    for source in sorted(site_packages.rglob("*.py")):
+        if source in kept or not source.is_file():
+            continue
+
+        if not source.with_suffix(".pyc").is_file():
+            # The module could not be compiled (e.g. it targets another Python
+            # version), so its source is the only thing that can be imported.
+            continue
+
+        source.unlink()
+        removed += 1
+        stripped.add(source)
+
+        pycache = source.parent / "__pycache__"
+        for cached in pycache.glob(f"{source.stem}.*.pyc"):
+            cached.unlink()
+            uncached.add(cached)
+
+    for pycache in sorted(site_packages.rglob("__pycache__"), reverse=True):
+        if pycache.is_dir() and not any(pycache.iterdir()):
+            pycache.rmdir()
+
+    if stripped:
+        for _, dist_info in iter_distributions(site_packages):
+            _update_record(dist_info, stripped, uncached)
+
+    return removed
+
+
+def _update_record(dist_info: Path, stripped: set[Path], uncached: set[Path]) -> None:
+    """
+    Replace the stripped sources of a distribution by their bytecode in its RECORD,
+    and remove the cached bytecode removed along with them.
+    """
+    record = dist_info / "RECORD"
+    if not record.is_file():
+        return
+
+    site_packages = dist_info.parent
+    with record.open(encoding="utf-8", newline="") as f:
+        rows = [
+            (Path(os.path.normpath(site_packages / row[0])), row)
+            for row in csv.reader(f)
+            if row
+        ]
+
+    # Bytecode listed already, e.g. shipped by the wheel, is listed again
+    # along with its source, since it was compiled again.
+    bytecode = {path.with_suffix(".pyc") for path, _ in rows if path in stripped}
+    if not bytecode:
+        return
+
+    updated = []
+    for path, row in rows:
+        if path in stripped:
+            compiled = path.with_suffix(".pyc")
+            updated.append(
+                [f"{row[0]}c", _hash(compiled), str(compiled.stat().st_size)]
+            )
+        elif path not in bytecode and path not in uncached:
+            updated.append(row)
+
+    content = io.StringIO()
+    csv.writer(content, lineterminator="\n").writerows(updated)
+    record.write_text(content.getvalue(), encoding="utf-8", newline="")
+
+
+def _hash(path: Path) -> str:
+    digest = hashlib.sha256(path.read_bytes()).digest()
+
+    return "sha256=" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
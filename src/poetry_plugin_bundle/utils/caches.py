@@ -0,0 +1,311 @@
+"""
+Report and evict the entries of the caches filled by bundles: Poetry's artifact
+cache, holding downloaded and built archives, and the cache of install plans.
+
+Entries are evicted least recently used first. Bundles mark the artifacts
+they use as recently used by updating the modification time of their directory,
+as the install plan cache does for the plans it loads.
+
+Lazy distributions of a bundle may be unpacked from a wheel of the artifact
+cache at any time, so bundles having any are registered, and the entries
+holding their wheels are never evicted while they exist.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Iterable
+
+    from poetry.config.config import Config
+
+
+CACHES = ("artifacts", "plans")
+
+# Entries used more recently are never evicted, since a concurrent bundle
+# may be using them, and evicting them would only cause cache misses.
+COLD_AFTER = 3600.0
+
+_DURATION = re.compile(
+    r"^(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[smhdw]?)$", re.IGNORECASE
+)
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+class CacheEntry(NamedTuple):
+    """
+    An entry of a cache: a directory of archives of a package,
+    or an install plan.
+    """
+
+    cache: str
+    path: Path
+    package: str | None
+    size: int
+    last_used: float
+
+
+class CacheQuota(NamedTuple):
+    """
+    The maximum size of each cache, and the maximum time since an entry was used.
+    """
+
+    max_size: int | None = None
+    max_age: float | None = None
+
+    @classmethod
+    def parse(cls, value: str) -> CacheQuota:
+        """
+        Parse a quota: comma-separated ``size=<size>`` and ``age=<duration>``
+        items, e.g. ``size=10G,age=30d``.
+        """
+        from poetry_plugin_bundle.utils.memory import parse_size
+
+        max_size = None
+        max_age = None
+        for item in value.split(","):
+            key, _, limit = item.partition("=")
+            key = key.strip()
+            if key == "size":
+                max_size = parse_size(limit)
+            elif key == "age":
+                max_age = parse_duration(limit)
+            else:
+                raise ValueError(
+                    f'Invalid quota item "{item.strip()}":'
+                    " size=<size> or age=<duration> is expected."
+                )
+
+        return cls(max_size, max_age)
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a number of seconds, optionally followed by a unit:
+    s, m, h, d or w, e.g. ``30d``.
+    """
+    match = _DURATION.match(value.strip())
+    if match is None:
+        raise ValueError(
+            f'Invalid duration "{value}": a number optionally followed by'
+            " s, m, h, d or w is expected."
+        )
+
+    return float(match.group("number")) * _DURATION_UNITS[match.group("unit").lower()]
+
+
+def format_age(seconds: float) -> str:
+    for unit, length in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= length:
+            count = int(seconds // length)
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+
+    return "just now"
+
+
+def cache_directories(config: Config) -> dict[str, Path]:
+    return {
+        "artifacts": Path(config.artifacts_cache_directory),
+        "plans": Path(config.get("cache-dir")) / "bundle" / "plans",
+    }
+
+
+def list_entries(cache: str, directory: Path) -> list[CacheEntry]:
+    """
+    Return the entries of the given cache, least recently used first.
+    """
+    if cache == "artifacts":
+        # Artifacts are stored in directories named after the hash of their link,
+        # split in 4 levels
+        paths = [path for path in directory.glob("*/*/*/*") if path.is_dir()]
+    else:
+        paths = list(directory.glob("*.json"))
+
+    entries = []
+    for path in paths:
+        with contextlib.suppress(OSError):
+            entries.append(
+                CacheEntry(
+                    cache,
+                    path,
+                    _package_name(path) if path.is_dir() else None,
+                    _size(path),
+                    path.stat().st_mtime,
+                )
+            )
+
+    return sorted(entries, key=lambda entry: entry.last_used)
+
+
+def select_cold_entries(
+    entries: Iterable[CacheEntry],
+    quota: CacheQuota,
+    now: float | None = None,
+    pinned: Collection[Path] = (),
+) -> list[CacheEntry]:
+    """
+    Return the entries to evict for a cache to stay within the given quota,
+    least recently used first, among the entries not used recently
+    and not holding any of the given pinned files.
+    """
+    now = time.time() if now is None else now
+    entries = sorted(entries, key=lambda entry: entry.last_used)
+    size = sum(entry.size for entry in entries)
+    pinned_directories = {file.parent for file in pinned}
+
+    evicted = []
+    for entry in entries:
+        age = now - entry.last_used
+        if age < COLD_AFTER:
+            break
+
+        if entry.path in pinned_directories:
+            continue
+
+        too_old = quota.max_age is not None and age > quota.max_age
+        too_large = quota.max_size is not None and size > quota.max_size
+        if not too_old and not too_large:
+            break
+
+        evicted.append(entry)
+        size -= entry.size
+
+    return evicted
+
+
+def evict(entries: Iterable[CacheEntry], root: Path) -> int:
+    """
+    Remove the given entries of the cache at the given root,
+    along with the directories they leave empty.
+
+    Returns the number of bytes freed.
+    """
+    freed = 0
+    for entry in entries:
+        if entry.path.is_dir():
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            with contextlib.suppress(OSError):
+                entry.path.unlink()
+        if entry.path.exists():
+            continue
+
+        freed += entry.size
+        parent = entry.path.parent
+        while parent != root and root in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    return freed
+
+
+def mark_used(archives: Iterable[Path], root: Path) -> None:
+    """
+    Mark the entries of the artifact cache at the given root holding
+    the given archives as recently used, ignoring archives outside of it.
+    """
+    for directory in {archive.parent for archive in archives}:
+        if root not in directory.parents:
+            continue
+
+        with contextlib.suppress(OSError):
+            os.utime(directory)
+
+
+def register_lazy_bundle(config: Config, bundle: Path) -> None:
+    """
+    Register the given bundle if it has lazy distributions,
+    so that the wheels they are unpacked from are never evicted,
+    or unregister it otherwise.
+    """
+    bundle = bundle.absolute()
+    name = hashlib.sha256(str(bundle).encode()).hexdigest()[:32]
+    registration = _lazy_bundles_directory(config) / f"{name}.txt"
+    if not _lazy_wheels(bundle):
+        registration.unlink(missing_ok=True)
+        return
+
+    registration.parent.mkdir(parents=True, exist_ok=True)
+    registration.write_text(f"{bundle}\n", encoding="utf-8")
+
+
+def pinned_wheels(config: Config) -> set[Path]:
+    """
+    Return the wheels the lazy distributions of the registered bundles
+    are unpacked from, forgetting the bundles that no longer have any.
+    """
+    wheels: set[Path] = set()
+    for registration in _lazy_bundles_directory(config).glob("*.txt"):
+        with contextlib.suppress(OSError):
+            bundle = Path(registration.read_text(encoding="utf-8").strip())
+            bundle_wheels = _lazy_wheels(bundle)
+            if not bundle_wheels:
+                registration.unlink()
+            wheels |= bundle_wheels
+
+    return wheels
+
+
+def _lazy_bundles_directory(config: Config) -> Path:
+    return Path(config.get("cache-dir")) / "bundle" / "lazy-bundles"
+
+
+def _lazy_wheels(bundle: Path) -> set[Path]:
+    from poetry_plugin_bundle.utils.lazy_loader import MARKER_NAME
+    from poetry_plugin_bundle.utils.lazy_loader import parse_entry
+
+    wheels = set()
+    for pattern in ("lib*/*/site-packages", "Lib/site-packages"):
+        for marker in bundle.glob(f"{pattern}/*.dist-info/{MARKER_NAME}"):
+            with contextlib.suppress(OSError):
+                entry = parse_entry(marker.read_text(encoding="utf-8"))
+                if entry is not None:
+                    wheels.add(Path(entry[1]))
+
+    return wheels
+
+
+def _package_name(directory: Path) -> str | None:
+    from packaging.utils import InvalidSdistFilename
+    from packaging.utils import InvalidWheelFilename
+    from packaging.utils import parse_sdist_filename
+    from packaging.utils import parse_wheel_filename
+
+    for archive in sorted(directory.iterdir()):
+        try:
+            if archive.suffix == ".whl":
+                return parse_wheel_filename(archive.name)[0]
+
+            return parse_sdist_filename(archive.name)[0]
+        except (InvalidWheelFilename, InvalidSdistFilename):
+            continue
+
+    return None
+
+
+def _size(path: Path) -> int:
+    if not path.is_dir():
+        return path.stat().st_size
+
+    size = 0
+    for directory, _, filenames in os.walk(path):
+        for filename in filenames:
+            with contextlib.suppress(OSError):
+                size += os.lstat(os.path.join(directory, filename)).st_size
+
+    return size
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+
+from collections import Counter
+from pathlib import Path
+
+
+# From linux/fs.h
+FICLONE = 0x40049409
+
+# Files that may contain the absolute path of the bundle
+# are small text files, larger files are never rewritten.
+MAX_REWRITTEN_FILE_SIZE = 1024 * 1024
+
+
+def clone_tree(source: Path, destination: Path) -> Counter[str]:
+    """
+    Clone a directory tree as cheaply as possible.
+
+    Every file is cloned with a copy-on-write reflink if the file system
+    supports it, otherwise it is copied. Files are never hard linked since
+    Poetry overwrites some files in place when installing packages,
+    which would also modify the source tree.
+    Symbolic links are recreated as is.
+
+    Returns how many files were cloned with each method.
+    """
+    methods: Counter[str] = Counter()
+    reflink = sys.platform == "linux"
+
+    destination.mkdir(parents=True, exist_ok=True)
+    for directory, dirnames, filenames in os.walk(source):
+        relative = Path(directory).relative_to(source)
+        target_directory = destination / relative
+
+        for name in dirnames:
+            path = Path(directory, name)
+            if path.is_symlink():
+                os.symlink(os.readlink(path), target_directory / name)
+            else:
+                (target_directory / name).mkdir(exist_ok=True)
+                shutil.copystat(path, target_directory / name)
+
+        for name in filenames:
+            path = Path(directory, name)
+            target = target_directory / name
+            if path.is_symlink():
+                os.symlink(os.readlink(path), target)
+                methods["symlink"] += 1
+                continue
+
+            if reflink:
+                try:
+                    _reflink(path, target)
+                    methods["reflink"] += 1
+                    continue
+                except OSError:
+                    # Reflinks are supported by the file system or not at all,
+                    # there is no need to try again for other files.
+                    reflink = False
+                    target.unlink(missing_ok=True)
+
+            shutil.copy2(path, target)
+            methods["copy"] += 1
+
+    return methods
+
+
+def rewrite_paths(root: Path, old: Path, new: Path) -> list[Path]:
+    """
+    Replace the old absolute path of a virtual environment with the new one
+    in the files that reference it: the configuration of the environment,
+    the activation scripts and the shebangs of scripts, and .pth files.
+
+    Rewritten files are replaced atomically and keep their permissions.
+
+    Returns the rewritten files.
+    """
+    old_path = str(old).encode()
+    new_path = str(new).encode()
+
+    candidates = [
+        *root.glob("*.cfg"),
+        *(root / "bin").glob("*"),
+        *(root / "Scripts").glob("*"),
+        *root.glob("lib/python*/site-packages/*.pth"),
+        *root.glob("Lib/site-packages/*.pth"),
+    ]
+
+    rewritten = []
+    for path in candidates:
+        if path.is_symlink():
+            target = os.readlink(path)
+            if target.startswith(str(old)):
+                path.unlink()
+                os.symlink(str(new) + target[len(str(old)) :], path)
+                rewritten.append(path)
+            continue
+
+        if not path.is_file() or path.stat().st_size > MAX_REWRITTEN_FILE_SIZE:
+            continue
+
+        content = path.read_bytes()
+        if old_path not in content:
+            continue
+
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(content.replace(old_path, new_path))
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+        rewritten.append(path)
+
+    return rewritten
+
+
+def _reflink(source: Path, destination: Path) -> None:
+    import fcntl
+
+    with source.open("rb") as src, destination.open("xb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+    shutil.copystat(source, destination)
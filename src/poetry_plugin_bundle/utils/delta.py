@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import lzma
+import os
+import shutil
+import tarfile
+
+from pathlib import Path
+from pathlib import PurePosixPath
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from poetry_plugin_bundle.utils.readahead import read_readahead
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+# A bundle is described by the signature of each of its files, by relative path:
+# "<mode> <sha256>" for regular files and "link <target>" for symbolic links.
+Files = dict[str, str]
+
+MANIFEST_VERSION = 1
+DELTA_VERSION = 2
+DELTA_METADATA = "delta.json"
+DELTA_FILES = "files"
+
+
+class DeltaError(Exception):
+    pass
+
+
+class DeltaStats(NamedTuple):
+    added: int
+    changed: int
+    removed: int
+
+
+def file_manifest(bundle: Path) -> Files:
+    """
+    Describe every file and symbolic link of the given bundle.
+    """
+    files: Files = {}
+    for directory, dirnames, filenames in os.walk(bundle):
+        for name in [*dirnames, *filenames]:
+            path = Path(directory, name)
+            relative = path.relative_to(bundle).as_posix()
+            if path.is_symlink():
+                files[relative] = f"link {os.readlink(path)}"
+            elif path.is_file():
+                files[relative] = _file_signature(path)
+
+    return dict(sorted(files.items()))
+
+
+def read_manifest(path: Path) -> Files:
+    """
+    Return the files of the given bundle or file manifest.
+    """
+    if path.is_dir():
+        return file_manifest(path)
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data["version"] != MANIFEST_VERSION:
+            raise DeltaError(f"The manifest {path} has an unsupported version.")
+
+        return dict(data["files"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise DeltaError(f"The manifest {path} could not be read: {e}") from e
+
+
+def write_manifest(files: Mapping[str, str], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"version": MANIFEST_VERSION, "files": dict(files)}, indent=2),
+        encoding="utf-8",
+    )
+
+
+def manifest_digest(files: Mapping[str, str]) -> str:
+    content = json.dumps(sorted(files.items()), separators=(",", ":"))
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def create_delta(old: Mapping[str, str], new: Path, output: Path) -> DeltaStats:
+    """
+    Write an archive turning a bundle described by the old files into the new bundle.
+
+    It contains the added and changed files of the new bundle,
+    the files to remove, a digest of the old files and the list of the new ones,
+    so that applying it can be verified. The files listed by the readahead
+    manifest of the new bundle are stored first.
+    """
+    files = file_manifest(new)
+
+    added = [path for path in files if path not in old]
+    changed = [path for path in files if path in old and old[path] != files[path]]
+    removed = [path for path in old if path not in files]
+
+    # The files opened at startup are stored contiguously, in the order
+    # they are opened, so that they are the first to be extracted
+    startup = {path: i for i, path in enumerate(read_readahead(new))}
+    stored = sorted(
+        [*added, *changed], key=lambda path: startup.get(path, len(startup))
+    )
+
+    metadata = {
+        "version": DELTA_VERSION,
+        "base": base_digest(old),
+        "files": files,
+        "removed": removed,
+    }
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(output, "w:xz") as archive:
+        content = json.dumps(metadata, indent=2).encode()
+        info = tarfile.TarInfo(DELTA_METADATA)
+        info.size = len(content)
+        archive.addfile(info, io.BytesIO(content))
+
+        for path in stored:
+            if files[path].startswith("link "):
+                # Symbolic links are fully described by the metadata
+                continue
+
+            archive.add(
+                new / path, f"{DELTA_FILES}/{path}", recursive=False, filter=_reset
+            )
+
+    return DeltaStats(len(added), len(changed), len(removed))
+
+
+def apply_delta(archive: Path, bundle: Path) -> DeltaStats:
+    """
+    Patch the given bundle in place with a delta archive.
+
+    The bundle must be the one the delta was created from, apart from
+    its bytecode caches, which its interpreter may have written since.
+    The files of the delta are extracted and verified next to the bundle
+    before any of them is moved into it, and the bundle is verified
+    against the files of the new bundle once patched.
+    """
+    staging = bundle.parent / f".{bundle.name}.delta-{os.getpid()}"
+    try:
+        old, files, removed_files, staged = _stage_delta(archive, bundle, staging)
+
+        added = 0
+        changed = 0
+        for relative in staged:
+            target = bundle.joinpath(relative)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _replace(staging.joinpath(relative), target)
+
+            if relative in old:
+                changed += 1
+            else:
+                added += 1
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    for relative, signature in files.items():
+        if not signature.startswith("link ") or old.get(relative) == signature:
+            continue
+
+        target = bundle.joinpath(_relative_path(relative))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        os.symlink(signature[len("link ") :], tmp)
+        _replace(tmp, target)
+
+        if relative in old:
+            changed += 1
+        else:
+            added += 1
+
+    removed = 0
+    for relative in removed_files:
+        target = bundle.joinpath(_relative_path(relative))
+        with contextlib.suppress(FileNotFoundError):
+            target.unlink()
+            removed += 1
+
+        _remove_empty_parents(target, bundle)
+
+    patched = file_manifest(bundle)
+    if any(patched.get(path) != signature for path, signature in files.items()) or any(
+        path not in files and not _is_bytecode_cache(path) for path in patched
+    ):
+        raise DeltaError(
+            f"The bundle {bundle} does not match the new bundle"
+            f" once the delta {archive} is applied."
+        )
+
+    return DeltaStats(added, changed, removed)
+
+
+def base_digest(files: Mapping[str, str]) -> str:
+    """
+    Return the digest of the files of the bundle a delta applies to,
+    apart from its bytecode caches.
+    """
+    return manifest_digest(
+        {
+            path: signature
+            for path, signature in files.items()
+            if not _is_bytecode_cache(path)
+        }
+    )
+
+
+def _stage_delta(
+    archive: Path, bundle: Path, staging: Path
+) -> tuple[Files, Files, list[str], list[str]]:
+    """
+    Extract the files of a delta archive to the given staging directory,
+    and verify them.
+
+    Returns the files of the bundle, those of the new bundle, the files
+    to remove and the files extracted.
+    """
+    try:
+        with tarfile.open(archive, "r|xz") as tar:
+            members = iter(tar)
+            member = next(members, None)
+            if member is None or member.name != DELTA_METADATA:
+                raise DeltaError(f"{archive} is not a bundle delta.")
+
+            metadata = json.load(_extract(tar, member))
+            if metadata.get("version") != DELTA_VERSION:
+                raise DeltaError(f"The delta {archive} has an unsupported version.")
+
+            files: Files = {
+                str(path): str(signature)
+                for path, signature in metadata["files"].items()
+            }
+            removed = [str(path) for path in metadata["removed"]]
+
+            old = file_manifest(bundle)
+            if base_digest(old) != metadata["base"]:
+                raise DeltaError(
+                    f"The bundle {bundle} is not the one the delta {archive}"
+                    " was created from."
+                )
+
+            staged = []
+            for member in members:
+                relative = _relative_path(member.name, DELTA_FILES)
+                if relative not in files or not member.isfile():
+                    raise DeltaError(f"Unexpected file {member.name} in {archive}.")
+
+                target = staging.joinpath(relative)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with target.open("wb") as f:
+                    shutil.copyfileobj(_extract(tar, member), f)
+                target.chmod(int(files[relative].split()[0], 8))
+                if _file_signature(target) != files[relative]:
+                    raise DeltaError(f"The file {member.name} of {archive} is corrupt.")
+
+                staged.append(relative)
+    except (tarfile.TarError, lzma.LZMAError, EOFError) as e:
+        raise DeltaError(f"The delta {archive} could not be read: {e}") from e
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise DeltaError(f"The delta {archive} has invalid metadata: {e}") from e
+
+    return old, files, removed, staged
+
+
+def _file_signature(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return f"{path.stat().st_mode & 0o777:o} {digest.hexdigest()}"
+
+
+def _reset(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+
+    return info
+
+
+def _extract(tar: tarfile.TarFile, member: tarfile.TarInfo) -> IO[bytes]:
+    f = tar.extractfile(member)
+    if f is None:
+        raise DeltaError(f"Unexpected entry {member.name} in the delta.")
+
+    return f
+
+
+def _relative_path(name: str, prefix: str | None = None) -> str:
+    """
+    Validate a path of the delta, which must stay inside the bundle.
+    """
+    path = PurePosixPath(name)
+    if prefix is not None:
+        if not path.parts or path.parts[0] != prefix:
+            raise DeltaError(f"Unexpected entry {name} in the delta.")
+        path = PurePosixPath(*path.parts[1:])
+
+    if path.is_absolute() or not path.parts or ".." in path.parts:
+        raise DeltaError(f"Unexpected entry {name} in the delta.")
+
+    return path.as_posix()
+
+
+def _replace(source: Path, target: Path) -> None:
+    if target.is_dir() and not target.is_symlink():
+        raise DeltaError(f"{target} is a directory.")
+
+    os.replace(source, target)
+
+
+def _is_bytecode_cache(path: str) -> bool:
+    return "__pycache__" in PurePosixPath(path).parts
+
+
+def _remove_empty_parents(path: Path, root: Path) -> None:
+    """
+    Remove the directories left empty by the removal of the given path.
+    """
+    for parent in path.parents:
+        if parent == root or any(parent.iterdir()):
+            return
+
+        parent.rmdir()
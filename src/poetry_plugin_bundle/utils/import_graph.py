@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import ast
+import configparser
+import re
+import warnings
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from packaging.utils import canonicalize_name
+
+from poetry_plugin_bundle.utils.site_packages import distribution_record
+from poetry_plugin_bundle.utils.site_packages import iter_distributions
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    from packaging.utils import NormalizedName
+
+
+# Functions importing the module named by their first argument
+_DYNAMIC_IMPORTS = {"import_module", "__import__"}
+
+_PTH_IMPORT = re.compile(r"^import[ \t]+(?P<names>[\w., \t]+)")
+
+
+class ImportAnalysis(NamedTuple):
+    """
+    The distributions whose modules can be imported, directly or not,
+    by the modules of the root distributions.
+    """
+
+    reachable: set[NormalizedName]
+    unreachable: set[NormalizedName]
+    unparsable: list[Path]
+
+
+def analyze_imports(
+    site_packages: Sequence[Path],
+    roots: Collection[str],
+    candidates: Collection[str],
+) -> ImportAnalysis:
+    """
+    Walk the import graph of the given site-packages directories statically,
+    from the modules and entry points of the root distributions and the modules
+    imported by .pth files, and find which of the candidate distributions
+    are never imported.
+
+    Only literal imports are followed: ``import`` statements, including those
+    inside functions, and calls to ``importlib.import_module()``
+    or ``__import__()`` with a literal module name.
+
+    Raises a ValueError if none of the root distributions is installed,
+    since every candidate would then be unreachable.
+    """
+    graph = _ImportGraph(site_packages)
+
+    root_names = {canonicalize_name(name) for name in roots}
+    if not root_names & {name for name, _ in graph.distributions()}:
+        raise ValueError("None of the root distributions is installed.")
+
+    for name, dist_info in graph.distributions():
+        if name not in root_names:
+            continue
+
+        for file in distribution_record(dist_info):
+            if file.suffix == ".py" and graph.module_name(file) is not None:
+                graph.visit_file(file)
+
+        for module in _entry_point_modules(dist_info):
+            graph.visit(module)
+
+    for directory in site_packages:
+        for pth in sorted(directory.glob("*.pth")):
+            for module in _pth_imports(pth):
+                graph.visit(module)
+
+    graph.walk()
+
+    reachable = graph.reachable_distributions()
+    unreachable = {canonicalize_name(name) for name in candidates} - reachable
+    unreachable -= root_names
+    unreachable &= {name for name, _ in graph.distributions()}
+
+    return ImportAnalysis(reachable, unreachable, graph.unparsable)
+
+
+class _ImportGraph:
+    def __init__(self, site_packages: Sequence[Path]) -> None:
+        self._site_packages = [path for path in site_packages if path.is_dir()]
+        self._owners: dict[Path, NormalizedName] = {}
+        self._distributions: list[tuple[NormalizedName, Path]] = []
+        for directory in self._site_packages:
+            for name, dist_info in iter_distributions(directory):
+                self._distributions.append((name, dist_info))
+                for file in distribution_record(dist_info):
+                    self._owners[file] = name
+
+        self._visited: set[Path] = set()
+        self._pending: list[Path] = []
+        self._modules: dict[str, list[Path]] = {}
+        self.unparsable: list[Path] = []
+
+    def distributions(self) -> list[tuple[NormalizedName, Path]]:
+        return self._distributions
+
+    def reachable_distributions(self) -> set[NormalizedName]:
+        return {self._owners[file] for file in self._visited if file in self._owners}
+
+    def visit(self, module: str) -> None:
+        """
+        Visit the files of the given module and of its parent packages.
+        """
+        parts = module.split(".")
+        for i in range(1, len(parts) + 1):
+            for file in self._resolve(".".join(parts[:i])):
+                self.visit_file(file)
+
+    def visit_file(self, file: Path) -> None:
+        if file not in self._visited:
+            self._visited.add(file)
+            self._pending.append(file)
+
+    def walk(self) -> None:
+        while self._pending:
+            file = self._pending.pop()
+            if file.suffix != ".py":
+                # Extension modules cannot be analyzed
+                continue
+
+            module = self.module_name(file)
+            if module is None:
+                continue
+
+            for imported in self._imports(file, module):
+                self.visit(imported)
+
+    def module_name(self, file: Path) -> str | None:
+        for directory in self._site_packages:
+            try:
+                parts = list(file.relative_to(directory).with_suffix("").parts)
+            except ValueError:
+                continue
+
+            if parts and parts[-1] == "__init__":
+                parts.pop()
+
+            if parts and all(part.isidentifier() for part in parts):
+                return ".".join(parts)
+
+        return None
+
+    def _resolve(self, module: str) -> list[Path]:
+        files = self._modules.get(module)
+        if files is not None:
+            return files
+
+        files = []
+        relative = Path(*module.split("."))
+        for directory in self._site_packages:
+            base = directory / relative
+            init = base / "__init__.py"
+            if init.is_file():
+                files.append(init)
+            elif base.with_suffix(".py").is_file():
+                files.append(base.with_suffix(".py"))
+            elif base.parent.is_dir():
+                # Extension modules, whatever their ABI tag
+                files.extend(
+                    path
+                    for path in sorted(base.parent.glob(f"{base.name}.*"))
+                    if path.suffix in {".so", ".pyd"}
+                )
+
+        self._modules[module] = files
+
+        return files
+
+    def _imports(self, file: Path, module: str) -> Iterator[str]:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                tree = ast.parse(file.read_bytes(), str(file))
+        except (SyntaxError, ValueError):
+            self.unparsable.append(file)
+            return
+
+        package = module if file.name == "__init__.py" else module.rpartition(".")[0]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield alias.name
+            elif isinstance(node, ast.ImportFrom):
+                base = _absolute(node.module, node.level, package)
+                if base is None:
+                    continue
+
+                if base:
+                    yield base
+                for alias in node.names:
+                    if alias.name != "*":
+                        # The name may be a submodule rather than an attribute
+                        yield f"{base}.{alias.name}" if base else alias.name
+            elif (
+                isinstance(node, ast.Call)
+                and node.args
+                and isinstance(node.args[0], ast.Constant)
+                and isinstance(node.args[0].value, str)
+                and _called_name(node.func) in _DYNAMIC_IMPORTS
+                and not node.args[0].value.startswith(".")
+            ):
+                yield node.args[0].value
+
+
+def _absolute(module: str | None, level: int, package: str) -> str | None:
+    if not level:
+        return module
+
+    parts = package.split(".") if package else []
+    if level - 1 > len(parts):
+        return None
+
+    base = parts[: len(parts) - (level - 1)]
+    if module:
+        base.append(module)
+
+    return ".".join(base)
+
+
+def _called_name(func: ast.expr) -> str | None:
+    if isinstance(func, ast.Name):
+        return func.id
+
+    if isinstance(func, ast.Attribute):
+        return func.attr
+
+    return None
+
+
+def _entry_point_modules(dist_info: Path) -> list[str]:
+    entry_points = dist_info / "entry_points.txt"
+    if not entry_points.is_file():
+        return []
+
+    parser = configparser.ConfigParser(delimiters=("=",), interpolation=None)
+    parser.optionxform = str  # type: ignore[assignment, method-assign]
+    try:
+        parser.read(entry_points, encoding="utf-8")
+    except configparser.Error:
+        return []
+
+    return [
+        value.partition(":")[0].strip()
+        for section in parser.sections()
+        for value in parser[section].values()
+    ]
+
+
+def _pth_imports(pth: Path) -> list[str]:
+    modules: list[str] = []
+    for line in pth.read_text(encoding="utf-8", errors="replace").splitlines():
+        match = _PTH_IMPORT.match(line)
+        if match is not None:
+            modules.extend(
+                name.strip() for name in match.group("names").split(",") if name.strip()
+            )
+
+    return modules
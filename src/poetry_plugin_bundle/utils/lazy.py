@@ -0,0 +1,129 @@
+"""
+Make distributions of a bundle lazy: their modules are removed from site-packages,
+and unpacked from their wheel the first time they are imported by the finder
+of lazy_loader.
+"""
+
+from __future__ import annotations
+
+import shutil
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.lazy_loader import LOCK_NAME
+from poetry_plugin_bundle.utils.lazy_loader import MANIFEST_NAME
+from poetry_plugin_bundle.utils.lazy_loader import MARKER_NAME
+from poetry_plugin_bundle.utils.lazy_loader import file_sha256
+from poetry_plugin_bundle.utils.lazy_loader import format_entry
+from poetry_plugin_bundle.utils.lazy_loader import parse_entry
+from poetry_plugin_bundle.utils.site_packages import distribution_record
+from poetry_plugin_bundle.utils.site_packages import iter_distributions
+from poetry_plugin_bundle.utils.site_packages import remove_distribution
+
+
+if TYPE_CHECKING:
+    from poetry_plugin_bundle.utils.lazy_loader import Entry
+
+
+LOADER_MODULE = "_poetry_bundle_lazy"
+LOADER_PTH = "_poetry_bundle_lazy.pth"
+
+
+def make_lazy(dist_info: Path, wheel: Path) -> Entry:
+    """
+    Remove the modules of the given distribution from site-packages,
+    keeping its metadata and a marker pinning the wheel to unpack them from.
+    """
+    site_packages = dist_info.parent
+    entry: Entry = (
+        dist_info.name,
+        str(wheel.absolute()),
+        # Wheels may be large, so they are hashed in chunks
+        file_sha256(str(wheel)),
+        top_level_modules(dist_info),
+    )
+
+    remove_distribution(dist_info, site_packages, keep_metadata=True)
+
+    (dist_info / MARKER_NAME).write_text(format_entry(entry) + "\n", encoding="utf-8")
+    # Uninstalling the distribution removes the marker too
+    record = dist_info / "RECORD"
+    content = record.read_text(encoding="utf-8")
+    if content and not content.endswith("\n"):
+        content += "\n"
+    record.write_text(content + f"{dist_info.name}/{MARKER_NAME},,\n", encoding="utf-8")
+
+    return entry
+
+
+def lazy_entry(dist_info: Path) -> Entry | None:
+    """
+    Return the entry of the given distribution if it is lazy.
+    """
+    try:
+        content = (dist_info / MARKER_NAME).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    return parse_entry(content)
+
+
+def top_level_modules(dist_info: Path) -> tuple[str, ...]:
+    """
+    Return the top-level modules and packages a distribution installs
+    into site-packages.
+    """
+    site_packages = dist_info.parent
+    modules = set()
+    for file in distribution_record(dist_info):
+        try:
+            parts = file.relative_to(site_packages).parts
+        except ValueError:
+            continue
+
+        top = parts[0]
+        if top.endswith((".dist-info", ".data")) or top == "__pycache__":
+            continue
+
+        name = top if len(parts) > 1 else top.split(".", 1)[0]
+        if len(parts) == 1 and not top.endswith((".py", ".so", ".pyd")):
+            continue
+
+        if name.isidentifier():
+            modules.add(name)
+
+    return tuple(sorted(modules))
+
+
+def install_lazy_loader(site_packages: Path) -> int:
+    """
+    Install the finder of lazy distributions in the given site-packages directory,
+    or remove it if no distribution is lazy.
+
+    Returns the number of lazy distributions.
+    """
+    entries = []
+    for _, dist_info in iter_distributions(site_packages):
+        entry = lazy_entry(dist_info)
+        if entry is not None:
+            entries.append(entry)
+
+    if not entries:
+        for name in (LOADER_PTH, f"{LOADER_MODULE}.py", MANIFEST_NAME, LOCK_NAME):
+            (site_packages / name).unlink(missing_ok=True)
+
+        return 0
+
+    shutil.copyfile(
+        Path(__file__).with_name("lazy_loader.py"),
+        site_packages / f"{LOADER_MODULE}.py",
+    )
+    (site_packages / MANIFEST_NAME).write_text(
+        "".join(format_entry(entry) + "\n" for entry in entries), encoding="utf-8"
+    )
+    (site_packages / LOADER_PTH).write_text(
+        f"import {LOADER_MODULE}; {LOADER_MODULE}.install()\n", encoding="utf-8"
+    )
+
+    return len(entries)
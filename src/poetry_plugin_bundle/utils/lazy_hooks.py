@@ -0,0 +1,67 @@
+"""
+A meta path finder deferring executable lines of .pth files
+until one of the modules they hook into is first imported.
+
+This module is copied into bundles as _poetry_bundle_hooks and installed
+at startup by a .pth file. It only uses modules already imported at startup,
+and must support every Python version a bundle can target.
+"""
+
+from __future__ import annotations
+
+import sys
+
+
+# Importing typing would slow the startup down
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+
+class LazyHooks:
+    def __init__(self, hooks: list[tuple[tuple[str, ...], str]]) -> None:
+        self._hooks = hooks
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        if path is not None:
+            return None
+
+        pending = [line for triggers, line in self._hooks if fullname in triggers]
+        if not pending:
+            return None
+
+        self._hooks = [hook for hook in self._hooks if fullname not in hook[0]]
+        if not self._hooks:
+            sys.meta_path.remove(self)
+
+        for line in pending:
+            try:
+                exec(line, {"__name__": "site"})  # noqa: S102
+            except Exception:  # noqa: BLE001
+                import traceback
+
+                # Like the site module, report the error and carry on
+                sys.stderr.write(f"Error processing deferred .pth line: {line}\n")
+                traceback.print_exc()
+
+        # The hooks may have installed finders for the module being imported
+        for finder in list(sys.meta_path):
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                return spec
+
+        return None
+
+
+def install(hooks: list[tuple[tuple[str, ...], str]]) -> None:
+    sys.meta_path.insert(0, LazyHooks(hooks))
@@ -0,0 +1,290 @@
+"""
+A meta path finder materializing the lazy distributions of a bundle
+the first time one of their top-level modules is imported.
+
+This module is copied into bundles as _poetry_bundle_lazy and installed
+at startup by a .pth file. Until a distribution is materialized, it only uses
+modules already imported at startup. It must support every Python version
+a bundle can target.
+
+A lazy distribution keeps its .dist-info directory in site-packages,
+with a marker file pinning the wheel it was installed from. The wheel is looked up
+in the directories listed by the POETRY_BUNDLE_WHEELHOUSE environment variable,
+then at the path it had when the bundle was built. Its hash is checked
+before it is unpacked. A lock file ensures that concurrent processes
+materialize a distribution only once.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+
+# Importing typing would slow the startup down
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+    from typing import IO
+
+    # The entry of a lazy distribution: the name of its .dist-info directory,
+    # the path and SHA-256 hash of its wheel, and its top-level modules
+    Entry = tuple[str, str, str, tuple[str, ...]]
+
+
+MANIFEST_NAME = "_poetry_bundle_lazy.txt"
+LOCK_NAME = "_poetry_bundle_lazy.lock"
+MARKER_NAME = "POETRY_BUNDLE_LAZY"
+WHEELHOUSE_ENV = "POETRY_BUNDLE_WHEELHOUSE"
+
+
+def format_entry(entry: Entry) -> str:
+    dist_info, wheel, sha256, modules = entry
+
+    return "\t".join([dist_info, wheel, sha256, ",".join(modules)])
+
+
+def parse_entry(line: str) -> Entry | None:
+    fields = line.rstrip("\n").split("\t")
+    if len(fields) != 4:
+        return None
+
+    dist_info, wheel, sha256, modules = fields
+
+    return dist_info, wheel, sha256, tuple(filter(None, modules.split(",")))
+
+
+class LazyFinder:
+    def __init__(self, site_packages: str, entries: list[Entry]) -> None:
+        self._site_packages = site_packages
+        self._entries = {module: entry for entry in entries for module in entry[3]}
+
+    @classmethod
+    def load(cls, site_packages: str) -> LazyFinder | None:
+        try:
+            with open(
+                os.path.join(site_packages, MANIFEST_NAME), encoding="utf-8"
+            ) as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+
+        entries = [entry for entry in map(parse_entry, lines) if entry is not None]
+        if not entries:
+            return None
+
+        return cls(site_packages, entries)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        if path is not None:
+            return None
+
+        entry = self._entries.get(fullname)
+        if entry is None:
+            return None
+
+        materialize(self._site_packages, entry)
+
+        for module in entry[3]:
+            self._entries.pop(module, None)
+        if not self._entries:
+            sys.meta_path.remove(self)
+
+        import importlib
+
+        # Let the path finders see the unpacked modules
+        importlib.invalidate_caches()
+
+        # This finder may have been removed from sys.meta_path while the import
+        # system iterates over it, which would skip the next finder
+        for finder in list(sys.meta_path):
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                return spec
+
+        return None
+
+
+def materialize(site_packages: str, entry: Entry) -> bool:
+    """
+    Unpack the wheel of the given lazy distribution into site-packages,
+    unless it was materialized already.
+
+    Returns whether the distribution was materialized.
+    """
+    dist_info, wheel, sha256, _ = entry
+    name = dist_info[: -len(".dist-info")]
+    marker = os.path.join(site_packages, dist_info, MARKER_NAME)
+
+    try:
+        with _FileLock(os.path.join(site_packages, LOCK_NAME)):
+            if not os.path.exists(marker):
+                return False
+
+            archive = find_wheel(wheel)
+            if archive is None:
+                raise ImportError(
+                    f"The wheel {os.path.basename(wheel)} of the lazy distribution"
+                    f" {name} was not found; set {WHEELHOUSE_ENV} to the directory"
+                    " holding it"
+                )
+
+            actual = file_sha256(archive)
+            if actual != sha256:
+                raise ImportError(
+                    f"The hash of {archive} ({actual}) does not match the one"
+                    f" of the lazy distribution {name} ({sha256})"
+                )
+
+            _unpack(archive, site_packages)
+            os.unlink(marker)
+    except OSError as e:
+        # e.g. a read-only site-packages
+        raise ImportError(
+            f"The lazy distribution {name} could not be materialized from the wheel"
+            f" {os.path.basename(wheel)}: {e}"
+        ) from e
+
+    return True
+
+
+def find_wheel(wheel: str) -> str | None:
+    name = os.path.basename(wheel)
+    directories = os.environ.get(WHEELHOUSE_ENV, "").split(os.pathsep)
+    for candidate in [
+        *(os.path.join(directory, name) for directory in directories if directory),
+        wheel,
+    ]:
+        if os.path.isfile(candidate):
+            return candidate
+
+    return None
+
+
+def file_sha256(path: str) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _unpack(wheel: str, site_packages: str) -> None:
+    """
+    Unpack the modules of the given wheel into site-packages.
+
+    The metadata of the wheel, and its data other than modules, were installed
+    along with the bundle already.
+    """
+    import shutil
+    import tempfile
+    import zipfile
+
+    staging = tempfile.mkdtemp(prefix=".lazy-", dir=site_packages)
+    try:
+        with zipfile.ZipFile(wheel) as archive:
+            for info in archive.infolist():
+                parts = info.filename.split("/")
+                if parts[0].endswith(".dist-info"):
+                    continue
+
+                if parts[0].endswith(".data"):
+                    if len(parts) < 3 or parts[1] not in {"purelib", "platlib"}:
+                        continue
+                    parts = parts[2:]
+
+                path = os.path.normpath(os.path.join(staging, *parts))
+                if not path.startswith(staging + os.sep):
+                    raise ImportError(f"Invalid path {info.filename} in {wheel}")
+
+                if info.is_dir():
+                    os.makedirs(path, exist_ok=True)
+                    continue
+
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with archive.open(info) as source, open(path, "wb") as destination:
+                    shutil.copyfileobj(source, destination)
+
+        _merge(staging, site_packages)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _merge(source: str, destination: str) -> None:
+    """
+    Move the files of the source directory into the destination directory,
+    merging directories that exist in both, e.g. namespace packages.
+    """
+    for name in os.listdir(source):
+        path = os.path.join(source, name)
+        target = os.path.join(destination, name)
+        if os.path.isdir(path) and os.path.isdir(target):
+            _merge(path, target)
+        else:
+            os.replace(path, target)
+
+
+class _FileLock:
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._file: IO[bytes] | None = None
+
+    def __enter__(self) -> None:
+        self._file = open(self._path, "a+b")
+        if sys.platform == "win32":
+            import msvcrt
+            import time
+
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        else:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def __exit__(self, *args: object) -> None:
+        assert self._file is not None
+
+        if sys.platform == "win32":
+            import msvcrt
+
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+        self._file.close()
+
+
+def install() -> None:
+    from importlib.machinery import PathFinder
+
+    finder = LazyFinder.load(os.path.dirname(os.path.abspath(__file__)))
+    if finder is None:
+        return
+
+    for i, meta_path_finder in enumerate(sys.meta_path):
+        if meta_path_finder is PathFinder:
+            sys.meta_path.insert(i, finder)
+            return
+
+    sys.meta_path.append(finder)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+class LockDataCache:
+    """
+    Parsed lock files, by the hash of their content.
+
+    Parsing a lock file is one of the costliest steps of loading a project,
+    and many checkouts of the same project share the same lock file.
+    Only the most recently used lock files are kept.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self._max_size = max_size
+        self._data: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, lock: Path, parse: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """
+        Return the parsed content of the given lock file,
+        parsing it with the given function unless its content is known.
+        """
+        key = hashlib.sha256(lock.read_bytes()).hexdigest()
+
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+                return data
+
+        data = parse()
+
+        with self._lock:
+            self._data[key] = data
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+        return data
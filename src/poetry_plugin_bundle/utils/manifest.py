@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from pathlib import Path
+
+
+class BundleManifest:
+    """
+    Describes what a bundle was built from.
+
+    It is stored at the root of every bundle so that other bundling
+    operations can tell whether an existing bundle matches a project.
+    """
+
+    NAME = ".poetry-bundle.json"
+    VERSION = 1
+
+    def __init__(
+        self,
+        project: str,
+        version: str,
+        lock_hash: str | None,
+        groups: Collection[str] | None,
+    ) -> None:
+        self.project = project
+        self.version = version
+        self.lock_hash = lock_hash
+        self.groups = sorted(groups) if groups is not None else None
+
+    @classmethod
+    def hash_lock(cls, lock: Path) -> str | None:
+        try:
+            return hashlib.sha256(lock.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def read(cls, bundle: Path) -> BundleManifest | None:
+        try:
+            data = json.loads((bundle / cls.NAME).read_text(encoding="utf-8"))
+            if data["version"] != cls.VERSION:
+                return None
+
+            return cls.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BundleManifest:
+        return cls(
+            data["project"], data["project-version"], data["lock"], data["groups"]
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.VERSION,
+            "project": self.project,
+            "project-version": self.version,
+            "lock": self.lock_hash,
+            "groups": self.groups,
+        }
+
+    def write(self, bundle: Path) -> None:
+        path = bundle / self.NAME
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def matches(self, other: BundleManifest) -> bool:
+        """
+        Whether both manifests describe bundles of the same locked dependencies.
+        """
+        return (
+            self.project == other.project
+            and self.lock_hash is not None
+            and self.lock_hash == other.lock_hash
+            and self.groups == other.groups
+        )
+
+    @classmethod
+    def remove(cls, bundle: Path) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            (bundle / cls.NAME).unlink()
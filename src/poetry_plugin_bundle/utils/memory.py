@@ -0,0 +1,166 @@
+"""
+Measure and bound the memory used by the process bundling a project.
+
+The resident memory is read from /proc on Linux. Elsewhere, only the peak
+is known, from the resource usage of the process, and no job is held back.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import re
+import sys
+import threading
+import time
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+_SIZE = re.compile(
+    r"^(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[kmgt]?)(?:i?b)?$", re.IGNORECASE
+)
+_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
+# New jobs only start while the resident memory is below this fraction
+# of the limit, leaving the rest to the jobs already running.
+START_THRESHOLD = 0.75
+
+# The minimum number of seconds between two garbage collections
+# forced by a memory budget.
+_COLLECT_INTERVAL = 1.0
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a number of bytes, optionally followed by a binary unit,
+    e.g. ``512M``, ``1.5GiB`` or ``2g``.
+    """
+    match = _SIZE.match(value.strip())
+    if match is None:
+        raise ValueError(
+            f'Invalid size "{value}": a number of bytes, optionally followed by'
+            " K, M, G or T, is expected."
+        )
+
+    size = int(float(match.group("number")) * _UNITS[match.group("unit").lower()])
+    if size < 1:
+        raise ValueError(f'Invalid size "{value}": it must be positive.')
+
+    return size
+
+
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+
+    number = size / 1024
+    for unit in ("KiB", "MiB", "GiB"):
+        if number < 1024:
+            return f"{number:.1f} {unit}"
+        number /= 1024
+
+    return f"{number:.1f} TiB"
+
+
+def current_rss() -> int | None:
+    """
+    Return the resident memory of the process in bytes, if it can be measured.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss() -> int | None:
+    """
+    Return the peak resident memory of the process in bytes, since it started
+    or since the peak was last reset.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes everywhere but on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak resident memory of the process to its current one,
+    so that it describes a single bundle of a long-running process.
+
+    Returns whether the peak could be reset, which requires Linux.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        return False
+
+    return True
+
+
+class MemoryBudget:
+    """
+    A limit on the resident memory of the process, deciding whether new jobs
+    can start.
+
+    Memory is mostly held by running jobs, and released when they complete,
+    so that jobs held back by the budget wait for another job to complete.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        rss: Callable[[], int | None] = current_rss,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = limit
+        self._rss = rss
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_collection: float | None = None
+
+    def available(self) -> bool:
+        """
+        Return whether the resident memory leaves room for a new job,
+        collecting garbage before giving up.
+        """
+        threshold = self.limit * START_THRESHOLD
+        rss = self._rss()
+        if rss is None or rss < threshold:
+            return True
+
+        with self._lock:
+            now = self._clock()
+            if (
+                self._last_collection is not None
+                and now - self._last_collection < _COLLECT_INTERVAL
+            ):
+                return False
+            self._last_collection = now
+
+        gc.collect()
+        rss = self._rss()
+
+        return rss is None or rss < threshold
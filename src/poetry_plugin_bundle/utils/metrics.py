@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import time
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+
+Snapshot = dict[str, tuple[int, int]]
+
+_SAMPLE = re.compile(
+    r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?P<labels>\{.*\})?\s+(?P<value>\S+)"
+)
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+class BundleStats:
+    """
+    Statistics collected while bundling a project.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.duration = 0.0
+        self.phases: dict[str, float] = {}
+        self.operations: Counter[str] = Counter()
+        self.downloaded_bytes = 0
+        self.written_bytes = 0
+        self.size_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # The peak and mean number of jobs running at once, by pool
+        self.parallelism: dict[str, tuple[int, float]] = {}
+        # The peak resident memory of the process, if it could be measured
+        self.peak_rss_bytes: int | None = None
+
+        self._start = time.perf_counter()
+        self._phase: str | None = None
+        self._phase_start = 0.0
+
+    def start_phase(self, name: str) -> None:
+        """
+        Start timing the given phase, ending the current one if any.
+        """
+        self.end_phase()
+
+        self._phase = name
+        self._phase_start = time.perf_counter()
+
+    def end_phase(self) -> None:
+        if self._phase is None:
+            return
+
+        elapsed = time.perf_counter() - self._phase_start
+        self.phases[self._phase] = self.phases.get(self._phase, 0.0) + elapsed
+        self._phase = None
+
+    def finish(self) -> None:
+        self.end_phase()
+        self.duration = time.perf_counter() - self._start
+
+
+def snapshot(path: Path) -> Snapshot:
+    """
+    Return the modification time and size of every file under the given path,
+    by path relative to it.
+    """
+    files: Snapshot = {}
+    for directory, _, filenames in os.walk(path):
+        for filename in filenames:
+            file = os.path.join(directory, filename)
+            with contextlib.suppress(OSError):
+                stat = os.lstat(file)
+                files[os.path.relpath(file, path)] = (stat.st_mtime_ns, stat.st_size)
+
+    return files
+
+
+def written_bytes(before: Snapshot, after: Snapshot) -> int:
+    """
+    Return the number of bytes of the files that were added or modified.
+    """
+    return sum(
+        size
+        for file, (mtime, size) in after.items()
+        if before.get(file) != (mtime, size)
+    )
+
+
+def snapshot_size(files: Snapshot) -> int:
+    return sum(size for _, size in files.values())
+
+
+class MetricsFile:
+    """
+    A metrics file in the Prometheus text exposition format,
+    as read by the textfile collector of the node exporter.
+
+    Counters are cumulative: their values are added to those already present
+    in the file, so that a single file can be shared by all the bundles
+    of a build host. Gauges describe the last bundle only: those of the file
+    whose labels include the given scope labels are replaced, while those
+    of other bundles are kept.
+    """
+
+    PREFIX = "poetry_bundle"
+
+    def __init__(self, path: Path, scope: Mapping[str, str] | None = None) -> None:
+        self._path = path
+        self._scope = {
+            key: _escape_label(value) for key, value in (scope or {}).items()
+        }
+        self._metrics: dict[str, tuple[str, str]] = {}
+        self._samples: dict[tuple[str, str], float] = {}
+
+    def counter(
+        self, name: str, help: str, value: float, labels: Mapping[str, str]
+    ) -> None:
+        self._add(f"{name}_total", "counter", help, value, labels)
+
+    def gauge(
+        self, name: str, help: str, value: float, labels: Mapping[str, str]
+    ) -> None:
+        self._add(name, "gauge", help, value, labels)
+
+    def write(self) -> None:
+        from poetry_plugin_bundle.utils.atomic import bundle_lock
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Bundles sharing the file may write it at the same time,
+        # and must not lose the samples written by the others.
+        with bundle_lock(self._path):
+            previous_metrics, previous_samples = self._read_previous()
+            metrics = {**previous_metrics, **self._metrics}
+            samples = dict(self._samples)
+            for (name, labels), value in previous_samples.items():
+                if metrics[name][0] == "counter":
+                    samples[name, labels] = samples.get((name, labels), 0.0) + value
+                elif (name, labels) not in samples and not self._in_scope(labels):
+                    samples[name, labels] = value
+
+            lines = []
+            for name, (type_, help) in sorted(metrics.items()):
+                metric_samples = [
+                    (labels, value)
+                    for (sample_name, labels), value in sorted(samples.items())
+                    if sample_name == name
+                ]
+                if not metric_samples:
+                    continue
+
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {type_}")
+                for labels, value in metric_samples:
+                    lines.append(f"{name}{labels} {_format_value(value)}")
+
+            # The textfile collector may read the file at any time,
+            # so it must be replaced atomically.
+            tmp = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+            tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            os.replace(tmp, self._path)
+
+    def _add(
+        self,
+        name: str,
+        type_: str,
+        help: str,
+        value: float,
+        labels: Mapping[str, str],
+    ) -> None:
+        name = f"{self.PREFIX}_{name}"
+        self._metrics[name] = (type_, help)
+        key = (name, _format_labels(labels))
+        self._samples[key] = self._samples.get(key, 0.0) + value
+
+    def _in_scope(self, labels: str) -> bool:
+        values = dict(_LABEL.findall(labels))
+
+        return all(values.get(key) == value for key, value in self._scope.items())
+
+    def _read_previous(
+        self,
+    ) -> tuple[dict[str, tuple[str, str]], dict[tuple[str, str], float]]:
+        """
+        Return the types and help of the metrics of the file,
+        and the values of their samples.
+        """
+        metrics: dict[str, tuple[str, str]] = {}
+        samples: dict[tuple[str, str], float] = {}
+        try:
+            content = self._path.read_text(encoding="utf-8")
+        except OSError:
+            return metrics, samples
+
+        helps = {}
+        for line in content.splitlines():
+            if line.startswith("# HELP "):
+                _, _, name, *help = line.split(maxsplit=3)
+                helps[name] = help[0] if help else ""
+                continue
+
+            if line.startswith("# TYPE "):
+                _, _, name, type_ = line.split(maxsplit=3)
+                metrics[name] = (type_, helps.get(name, ""))
+                continue
+
+            match = _SAMPLE.match(line)
+            if match is None or match.group("name") not in metrics:
+                continue
+
+            with contextlib.suppress(ValueError):
+                samples[match.group("name"), match.group("labels") or ""] = float(
+                    match.group("value")
+                )
+
+        return metrics, samples
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+
+    return (
+        "{"
+        + ",".join(
+            f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())
+        )
+        + "}"
+    )
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+
+    return repr(value)
+
+
+def write_metrics(path: Path, stats: BundleStats, project: str, success: bool) -> None:
+    labels = {"project": project}
+    metrics = MetricsFile(path, scope=labels)
+
+    metrics.counter(
+        "runs",
+        "Number of bundles.",
+        1,
+        {**labels, "result": "success" if success else "failure"},
+    )
+    for operation in ("install", "update", "uninstall", "skip"):
+        metrics.counter(
+            "packages",
+            "Number of package operations performed by bundles.",
+            stats.operations[operation],
+            {**labels, "operation": operation},
+        )
+    metrics.counter(
+        "downloaded_bytes",
+        "Number of bytes downloaded into the artifact cache by bundles.",
+        stats.downloaded_bytes,
+        labels,
+    )
+    metrics.counter(
+        "written_bytes",
+        "Number of bytes of files added or modified in bundles.",
+        stats.written_bytes,
+        labels,
+    )
+    metrics.counter(
+        "cache_hits",
+        "Number of package artifacts found in the artifact cache.",
+        stats.cache_hits,
+        labels,
+    )
+    metrics.counter(
+        "cache_misses",
+        "Number of package artifacts missing from the artifact cache.",
+        stats.cache_misses,
+        labels,
+    )
+
+    metrics.gauge(
+        "duration_seconds",
+        "Duration of the last bundle.",
+        stats.duration,
+        labels,
+    )
+    for phase, duration in stats.phases.items():
+        metrics.gauge(
+            "phase_duration_seconds",
+            "Duration of each phase of the last bundle.",
+            duration,
+            {**labels, "phase": phase},
+        )
+    for pool, (peak, mean) in stats.parallelism.items():
+        metrics.gauge(
+            "peak_jobs",
+            "Peak number of jobs running at once in each pool of the last bundle.",
+            peak,
+            {**labels, "pool": pool},
+        )
+        metrics.gauge(
+            "mean_jobs",
+            "Mean number of jobs running at once in each pool of the last bundle.",
+            mean,
+            {**labels, "pool": pool},
+        )
+    if stats.peak_rss_bytes is not None:
+        metrics.gauge(
+            "peak_rss_bytes",
+            "Peak resident memory of the process building the last bundle.",
+            stats.peak_rss_bytes,
+            labels,
+        )
+    metrics.gauge(
+        "size_bytes",
+        "Size of the last bundle.",
+        stats.size_bytes,
+        labels,
+    )
+    metrics.gauge(
+        "last_run_timestamp_seconds",
+        "Time at which the last bundle started.",
+        stats.started,
+        labels,
+    )
+
+    metrics.write()
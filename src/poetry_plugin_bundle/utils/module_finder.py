@@ -0,0 +1,133 @@
+"""
+A meta path finder locating the modules of a site-packages directory
+from a precomputed index, instead of scanning every entry of sys.path.
+
+This module is copied into bundles as _poetry_bundle_finder and installed
+at startup by a .pth file. It only uses lightweight modules of the standard
+library, and must support every Python version a bundle can target.
+
+The index is ignored as a whole if any indexed directory changed since it was built,
+and a module is only located from the index if no path entry preceding
+its directory, that was unknown when the index was built, provides it.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+
+from importlib.machinery import PathFinder
+from importlib.util import spec_from_file_location
+
+
+# Importing typing would slow the startup down
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+    from typing import Any
+
+
+INDEX_VERSION = 1
+INDEX_NAME = "_poetry_bundle_index.marshal"
+
+
+class IndexFinder:
+    def __init__(self, site_packages: str, index: dict[str, Any]) -> None:
+        self._site_packages = site_packages
+        self._index = index
+        self._modules: dict[str, tuple[str, str, bool]] = index["modules"]
+        self._known_path = set(index["known_path"])
+        self._fresh = self._is_fresh()
+
+    @classmethod
+    def load(cls, site_packages: str) -> IndexFinder | None:
+        try:
+            with open(os.path.join(site_packages, INDEX_NAME), "rb") as f:
+                index = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != INDEX_VERSION
+            or index.get("cache_tag") != sys.implementation.cache_tag
+        ):
+            return None
+
+        finder = cls(site_packages, index)
+
+        return finder if finder._fresh else None
+
+    def invalidate_caches(self) -> None:
+        self._fresh = self._is_fresh()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        if not self._fresh:
+            return None
+
+        module = self._modules.get(fullname)
+        if module is None:
+            return None
+
+        parent, origin, is_package = module
+        directory = (
+            os.path.join(self._site_packages, parent) if parent else self._site_packages
+        )
+
+        preceding = []
+        for entry in sys.path if path is None else path:
+            if entry == directory:
+                break
+
+            if path is not None or entry not in self._known_path:
+                preceding.append(entry)
+        else:
+            return None
+
+        if preceding:
+            spec = PathFinder.find_spec(fullname, preceding)
+            # Namespace packages only take precedence if no module is found
+            if spec is not None and spec.origin is not None:
+                return None
+
+        origin = os.path.join(self._site_packages, origin)
+        if is_package:
+            return spec_from_file_location(
+                fullname, origin, submodule_search_locations=[os.path.dirname(origin)]
+            )
+
+        return spec_from_file_location(fullname, origin)
+
+    def _is_fresh(self) -> bool:
+        directories: dict[str, int] = self._index["directories"]
+        for directory, mtime in directories.items():
+            try:
+                stat = os.stat(os.path.join(self._site_packages, directory))
+            except OSError:
+                return False
+
+            if stat.st_mtime_ns != mtime:
+                return False
+
+        return True
+
+
+def install() -> None:
+    finder = IndexFinder.load(os.path.dirname(os.path.abspath(__file__)))
+    if finder is None:
+        return
+
+    for i, meta_path_finder in enumerate(sys.meta_path):
+        if meta_path_finder is PathFinder:
+            sys.meta_path.insert(i, finder)
+            return
+
+    sys.meta_path.append(finder)
@@ -0,0 +1,194 @@
+"""
+Build the module index used by the finder of module_finder.
+
+The index is built by the Python interpreter of the bundle, running this module,
+since the modules it finds depend on the version of the interpreter.
+It only uses the standard library.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import shutil
+import sys
+
+from importlib.machinery import FrozenImporter
+from importlib.machinery import PathFinder
+from importlib.machinery import all_suffixes
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from poetry.utils.env import Env
+
+
+# These must match the ones of module_finder
+INDEX_VERSION = 1
+INDEX_NAME = "_poetry_bundle_index.marshal"
+
+FINDER_MODULE = "_poetry_bundle_finder"
+FINDER_PTH = "_poetry_bundle_finder.pth"
+
+
+def install_module_index(env: Env) -> int:
+    """
+    Install the module finder in the given environment and build its index.
+
+    Returns the number of indexed modules.
+    """
+    site_packages = Path(env.paths["purelib"])
+
+    shutil.copyfile(
+        Path(__file__).with_name("module_finder.py"),
+        site_packages / f"{FINDER_MODULE}.py",
+    )
+    (site_packages / FINDER_PTH).write_text(
+        f"import {FINDER_MODULE}; {FINDER_MODULE}.install()\n", encoding="utf-8"
+    )
+
+    script = Path(__file__).read_text(encoding="utf-8")
+    script += f"\nprint(write_index({str(site_packages)!r}))\n"
+
+    return int(env.run_python_script(script).strip())
+
+
+def rebuild_module_index(env: Env) -> int | None:
+    """
+    Rebuild the index of the module finder installed in the given environment,
+    e.g. after the modification times of its directories changed.
+
+    Returns the number of indexed modules, or None if no finder is installed.
+    """
+    site_packages = Path(env.paths["purelib"])
+    if not (site_packages / INDEX_NAME).exists():
+        return None
+
+    script = Path(__file__).read_text(encoding="utf-8")
+    script += f"\nprint(write_index({str(site_packages)!r}))\n"
+
+    return int(env.run_python_script(script).strip())
+
+
+def remove_module_index(env: Env) -> None:
+    site_packages = Path(env.paths["purelib"])
+
+    for name in (FINDER_PTH, f"{FINDER_MODULE}.py", INDEX_NAME):
+        (site_packages / name).unlink(missing_ok=True)
+
+
+def write_index(site_packages: str) -> int:
+    """
+    Index the given site-packages directory of the running interpreter.
+
+    Returns the number of indexed modules.
+    """
+    path = os.path.join(site_packages, INDEX_NAME)
+
+    # The index must exist before the modification time of the directory is recorded,
+    # and is then written in place, which does not modify it.
+    open(path, "ab").close()
+
+    index = build_index(site_packages)
+    with open(path, "wb") as f:
+        marshal.dump(index, f)
+
+    return len(index["modules"])
+
+
+def build_index(site_packages: str) -> dict[str, Any]:
+    entries = [entry for entry in sys.path if entry]
+    positions = [
+        position
+        for position, entry in enumerate(entries)
+        if os.path.isdir(entry) and os.path.samefile(entry, site_packages)
+    ]
+    if not positions:
+        raise ValueError(f"{site_packages} is not in sys.path")
+
+    # Use the path as it appears in sys.path at runtime
+    site_packages = entries[positions[0]]
+    known_path = entries[: positions[0]]
+    modules: dict[str, tuple[str, str, bool]] = {}
+    directories: dict[str, int] = {}
+
+    def index(parent: str, prefix: str) -> None:
+        directory = os.path.join(site_packages, parent) if parent else site_packages
+
+        # Creating the bytecode cache of the directory later on
+        # would modify it, and the index would not be used anymore.
+        os.makedirs(os.path.join(directory, "__pycache__"), exist_ok=True)
+        directories[parent] = 0
+
+        for name in _module_names(directory):
+            fullname = prefix + name
+            if not prefix and _is_shadowed(name, known_path):
+                continue
+
+            spec = PathFinder.find_spec(fullname, [directory])
+            if spec is None:
+                continue
+
+            if spec.origin is None:
+                # A portion of a namespace package is not indexed itself,
+                # since other portions may be added to sys.path later on.
+                index(os.path.join(parent, name), f"{fullname}.")
+                continue
+
+            modules[fullname] = (
+                parent,
+                os.path.relpath(spec.origin, site_packages),
+                spec.submodule_search_locations is not None,
+            )
+
+    index("", "")
+
+    for directory in directories:
+        directories[directory] = os.stat(
+            os.path.join(site_packages, directory)
+        ).st_mtime_ns
+
+    return {
+        "version": INDEX_VERSION,
+        "cache_tag": sys.implementation.cache_tag,
+        "known_path": known_path,
+        "directories": directories,
+        "modules": modules,
+    }
+
+
+def _module_names(directory: str) -> Iterator[str]:
+    suffixes = sorted(all_suffixes(), key=len, reverse=True)
+
+    names = set()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name.isidentifier() and entry.name != "__pycache__":
+                    names.add(entry.name)
+                continue
+
+            for suffix in suffixes:
+                if entry.name.endswith(suffix):
+                    stem = entry.name[: -len(suffix)]
+                    if stem.isidentifier():
+                        names.add(stem)
+                    break
+
+    yield from sorted(names)
+
+
+def _is_shadowed(name: str, known_path: list[str]) -> bool:
+    """
+    Whether the given top-level module is found before the site-packages directory.
+    """
+    if name in sys.builtin_module_names or FrozenImporter.find_spec(name):
+        return True
+
+    spec = PathFinder.find_spec(name, known_path)
+
+    return spec is not None and spec.origin is not None
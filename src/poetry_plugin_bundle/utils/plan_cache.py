@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from poetry.core.packages.package import Package
+
+
+class PlannedPackage(NamedTuple):
+    """
+    A locked package that has to be present in the bundle,
+    identified the same way Poetry identifies a locked package.
+    """
+
+    name: str
+    version: str
+    source_type: str | None = None
+    source_url: str | None = None
+    source_reference: str | None = None
+    priority: int = 0
+
+    @classmethod
+    def from_package(cls, package: Package, priority: int = 0) -> PlannedPackage:
+        return cls(
+            package.name,
+            package.version.text,
+            package.source_type,
+            package.source_url,
+            package.source_reference,
+            priority,
+        )
+
+    @property
+    def identity(self) -> tuple[str, str, str | None, str | None, str | None]:
+        return (
+            self.name,
+            self.version,
+            self.source_type,
+            self.source_url,
+            self.source_reference,
+        )
+
+
+class InstallPlanCache:
+    """
+    An on-disk cache of resolved install plans.
+
+    A plan is the list of locked packages, already filtered by the groups
+    and the environment markers of the target, that make up a bundle.
+    Plans are keyed on the content of the lock file, the activated groups,
+    the marker environment of the target and the Poetry version,
+    so that any change to one of them results in a cache miss.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory: Path, max_entries: int = 64) -> None:
+        self._directory = directory
+        self._max_entries = max_entries
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @classmethod
+    def inputs(
+        cls,
+        lock_content: bytes,
+        groups: Collection[str] | None,
+        marker_env: Mapping[str, Any],
+        poetry_version: str,
+    ) -> dict[str, Any]:
+        return {
+            "lock": hashlib.sha256(lock_content).hexdigest(),
+            "groups": sorted(groups) if groups is not None else None,
+            "markers": {key: str(value) for key, value in sorted(marker_env.items())},
+            "poetry": poetry_version,
+        }
+
+    @classmethod
+    def key(cls, inputs: Mapping[str, Any]) -> str:
+        payload = json.dumps(
+            {"version": cls.VERSION, **inputs}, sort_keys=True
+        ).encode()
+
+        return hashlib.sha256(payload).hexdigest()
+
+    def load(self, inputs: Mapping[str, Any]) -> list[PlannedPackage] | None:
+        path = self._path(inputs)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data["version"] != self.VERSION or data["inputs"] != dict(inputs):
+                raise ValueError("Stale install plan")
+
+            plan = [PlannedPackage(**package) for package in data["packages"]]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # Corrupted or stale entries are not worth keeping around
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+            return None
+
+        # Mark the entry as recently used so that it survives eviction
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+        return plan
+
+    def save(
+        self, inputs: Mapping[str, Any], packages: Collection[PlannedPackage]
+    ) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        path = self._path(inputs)
+        data = {
+            "version": self.VERSION,
+            "inputs": dict(inputs),
+            "packages": [
+                package._asdict()
+                for package in sorted(packages, key=lambda p: (p.name, p.version))
+            ],
+        }
+
+        # Write to a temporary file first so that concurrent bundles
+        # never read a partially written plan.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = sorted(
+            self._directory.glob("*.json"),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[self._max_entries :]:
+            with contextlib.suppress(OSError):
+                entry.unlink()
+
+    def _path(self, inputs: Mapping[str, Any]) -> Path:
+        return self._directory / f"{self.key(inputs)}.json"
@@ -0,0 +1,77 @@
+"""
+Warm the page cache with the files a bundle opens at startup,
+in the order they are opened, as listed by its readahead manifest.
+
+This module is copied into bundles as _poetry_bundle_prefetch, and is meant
+to be run at container start, ahead of the application:
+
+    /path/to/environment/bin/python -m _poetry_bundle_prefetch &
+
+It must support every Python version a bundle can target.
+
+The manifest lists one file per line, relative to the bundle or absolute
+for the files of the base interpreter. The kernel is asked to read each file
+ahead where it supports it, and each file is read otherwise.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+
+MANIFEST_NAME = ".poetry-bundle-readahead.txt"
+
+_CHUNK_SIZE = 1 << 20
+
+
+def read_manifest(bundle: str) -> list[str]:
+    with open(os.path.join(bundle, MANIFEST_NAME), encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def prefetch(bundle: str) -> int:
+    """
+    Warm the page cache with the files listed by the readahead manifest
+    of the given bundle, skipping those that cannot be opened.
+
+    Returns the number of files prefetched.
+    """
+    count = 0
+    for name in read_manifest(bundle):
+        try:
+            fd = os.open(os.path.join(bundle, name), os.O_RDONLY)
+        except OSError:
+            continue
+
+        try:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                while os.read(fd, _CHUNK_SIZE):
+                    pass
+        except OSError:
+            continue
+        finally:
+            os.close(fd)
+
+        count += 1
+
+    return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    bundle = argv[0] if argv else sys.prefix
+
+    try:
+        prefetch(bundle)
+    except OSError as e:
+        sys.stderr.write(f"The bundle {bundle} could not be prefetched: {e}\n")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
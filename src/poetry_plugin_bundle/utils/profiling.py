@@ -0,0 +1,260 @@
+"""
+Profile the bundle commands themselves.
+
+A profile is written as a pstats file, readable by the pstats module or snakeviz,
+and as a file of collapsed stacks, readable by flame graph tools
+such as flamegraph.pl or speedscope.
+
+The deterministic profiler is cProfile: it measures every call, but only those
+of the thread running the command before Python 3.12. Its collapsed stacks
+are reconstructed from its call graph, apportioning the time of each function
+between its callers, in microseconds.
+
+The sampling profiler records the stacks of every thread at a fixed interval,
+with a low overhead. Its collapsed stacks count samples, and its pstats
+are derived from them.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+
+from collections import Counter
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    import pstats
+
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import FrameType
+
+    Function = tuple[str, int, str]
+
+
+PROFILERS = ("deterministic", "sampling")
+
+# The interval between two samples of the sampling profiler, in seconds
+SAMPLING_INTERVAL = 0.005
+
+# Call paths below this time, in seconds, are dropped from reconstructed stacks
+_MINIMUM_PATH_TIME = 1e-6
+_MAXIMUM_DEPTH = 256
+
+
+class DeterministicProfiler:
+    def __init__(self) -> None:
+        import cProfile
+
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def stats(self) -> pstats.Stats:
+        import pstats
+
+        return pstats.Stats(self._profile)
+
+    def collapsed_stacks(self) -> Counter[str]:
+        return collapse_stats(self.stats().stats)  # type: ignore[attr-defined]
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = SAMPLING_INTERVAL) -> None:
+        self.interval = interval
+        # The number of samples of each stack, root first, by thread name
+        self.samples: Counter[tuple[str, tuple[Function, ...]]] = Counter()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._sample, name="poetry-bundle-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> pstats.Stats:
+        import pstats
+
+        stats = self._raw_stats()
+        # Commands shorter than the sampling interval have no samples
+        if not stats:
+            return pstats.Stats()
+
+        return pstats.Stats(_RawStats(stats))  # type: ignore[arg-type]
+
+    def collapsed_stacks(self) -> Counter[str]:
+        stacks: Counter[str] = Counter()
+        for (thread, stack), count in self.samples.items():
+            stacks[";".join([thread, *map(_label, stack)])] += count
+
+        return stacks
+
+    def _sample(self) -> None:
+        ident = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == ident:
+                    continue
+
+                stack = tuple(reversed([_function(f) for f in _walk(frame)]))
+                self.samples[names.get(thread_id, str(thread_id)), stack] += 1
+
+    def _raw_stats(
+        self,
+    ) -> dict[Function, tuple[int, int, float, float, dict[Any, Any]]]:
+        """
+        Return stats in the format of the pstats module: the number of primitive
+        and total calls, the total time spent in each function itself
+        and including its callees, and the same for each of its callers.
+        Calls are counted as the number of samples.
+        """
+        own: Counter[Function] = Counter()
+        inclusive: Counter[Function] = Counter()
+        edges: Counter[tuple[Function, Function]] = Counter()
+        edges_own: Counter[tuple[Function, Function]] = Counter()
+        for (_, stack), count in self.samples.items():
+            if not stack:
+                continue
+
+            own[stack[-1]] += count
+            for function in set(stack):
+                inclusive[function] += count
+            for edge in set(zip(stack, stack[1:])):
+                edges[edge] += count
+            if len(stack) > 1:
+                edges_own[stack[-2], stack[-1]] += count
+
+        callers: dict[Function, dict[Function, tuple[int, int, float, float]]] = {}
+        for (caller, callee), count in edges.items():
+            callers.setdefault(callee, {})[caller] = (
+                count,
+                count,
+                edges_own[caller, callee] * self.interval,
+                count * self.interval,
+            )
+
+        return {
+            function: (
+                count,
+                count,
+                own[function] * self.interval,
+                count * self.interval,
+                callers.get(function, {}),
+            )
+            for function, count in inclusive.items()
+        }
+
+
+class _RawStats:
+    """
+    Stats in the format of the pstats module, as loaded by pstats.Stats.
+    """
+
+    def __init__(self, stats: dict[Function, Any]) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def collapse_stats(stats: dict[Function, Any]) -> Counter[str]:
+    """
+    Reconstruct collapsed stacks from the call graph of the given pstats stats,
+    valued in microseconds.
+
+    The time of a function is apportioned between its callers in proportion
+    to the time it spent when called by each of them, and recursive calls
+    are folded into their first call.
+    """
+    callees: dict[Function, list[tuple[Function, float]]] = {}
+    roots = []
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+
+    stacks: Counter[str] = Counter()
+
+    def walk(function: Function, path: list[Function], ratio: float) -> None:
+        path.append(function)
+        own = int(stats[function][2] * ratio * 1e6)
+        if own > 0:
+            stacks[";".join(map(_label, path))] += own
+
+        for callee, cumulative in callees.get(function, []):
+            callee_total = stats[callee][3]
+            time = cumulative * ratio
+            if (
+                callee in path
+                or not callee_total
+                or time < _MINIMUM_PATH_TIME
+                or len(path) >= _MAXIMUM_DEPTH
+            ):
+                continue
+
+            walk(callee, path, time / callee_total)
+
+        path.pop()
+
+    for root in sorted(roots):
+        walk(root, [], 1.0)
+
+    return stacks
+
+
+def write_profile(
+    profiler: DeterministicProfiler | SamplingProfiler, output: Path
+) -> Path:
+    """
+    Write the pstats of the given profiler to the given path, and its collapsed
+    stacks next to it, with a .collapsed suffix.
+
+    Returns the path of the collapsed stacks.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    profiler.stats().dump_stats(output)
+
+    collapsed = output.with_suffix(".collapsed")
+    with collapsed.open("w", encoding="utf-8") as f:
+        for stack, value in sorted(profiler.collapsed_stacks().items()):
+            f.write(f"{stack} {value}\n")
+
+    return collapsed
+
+
+def _walk(frame: FrameType | None) -> Iterator[FrameType]:
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def _function(frame: FrameType) -> Function:
+    code = frame.f_code
+
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def _label(function: Function) -> str:
+    filename, lineno, name = function
+    # Built-in functions have no file
+    if filename == "~":
+        return name.replace(";", ",")
+
+    return f"{name} ({filename}:{lineno})".replace(";", ",")
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import csv
+import json
+import re
+import shutil
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from poetry.utils.env import Env
+
+
+# The merged file is processed first, since .pth files are processed in name order
+MERGED_PTH = "00-poetry-bundle.pth"
+HOOKS_MODULE = "_poetry_bundle_hooks"
+
+# .pth files of the bundle itself, which are left untouched
+OWN_PTH_PREFIX = "_poetry_bundle"
+
+# Modules imported by executable lines that only install import hooks,
+# by the top-level modules they hook into. Importing such a module
+# can be deferred until one of those modules is first imported.
+LAZY_HOOKS = {
+    "_distutils_hack": ("distutils", "pip"),
+    "_virtualenv": ("distutils", "setuptools"),
+}
+
+# Lines written by setuptools for legacy namespace packages,
+# which eagerly create the namespace package module at startup.
+_NAMESPACE_LINE = re.compile(
+    r"sys\._getframe\(1\)\.f_locals\['sitedir'\], \*\((?P<names>[^)]*)\)"
+)
+
+_FILE_MARKER = "# file: "
+# What the entries of a file are dropped with: the .dist-info directory
+# of the distribution that installed it, or the file itself
+_SOURCE_MARKER = "# source: "
+_HOOK_MARKER = "# hook: "
+
+STARTUP_COSTS_SCRIPT = """\
+import json, os, site, sys, time
+sitedir = sys.argv[1]
+known_paths = set()
+sys.path.append(sitedir)
+costs = {}
+for name in sorted(os.listdir(sitedir)):
+    if name.endswith(".pth") and not name.startswith("."):
+        start = time.perf_counter()
+        site.addpackage(sitedir, name, known_paths)
+        costs[name] = time.perf_counter() - start
+print(json.dumps(costs))
+"""
+
+
+Hook = tuple[tuple[str, ...], str]
+
+
+class PthFile(NamedTuple):
+    """
+    The lines of a .pth file, by what can be done with them.
+    """
+
+    name: str
+    paths: list[str]
+    hooks: list[Hook]
+    namespaces: list[str]
+    eager: list[str]
+
+    @property
+    def optimizable(self) -> bool:
+        return bool(self.paths or self.hooks or self.namespaces)
+
+
+def audit(site_packages: Path) -> list[PthFile]:
+    """
+    Classify the lines of the .pth files of the given site-packages directory,
+    apart from those of the bundle itself.
+    """
+    files = []
+    for path in sorted(site_packages.glob("*.pth")):
+        if path.name.startswith((".", OWN_PTH_PREFIX)) or path.name == MERGED_PTH:
+            continue
+
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        files.append(_classify(site_packages, path.name, lines))
+
+    return files
+
+
+def consolidate(site_packages: Path, files: Iterable[PthFile]) -> None:
+    """
+    Merge the path entries of the given .pth files into a single file,
+    turn their deferrable executable lines into lazy hooks, drop their lines
+    creating namespace packages the import system creates natively,
+    and leave their other lines in place.
+
+    Entries merged by a previous consolidation are kept, unless their file
+    is found again, so that consolidating is idempotent, or unless the
+    distribution that installed their file, or the file itself if it was kept
+    for its other lines, is gone.
+    """
+    groups = {
+        group.name: (group, source)
+        for group, source in _read_merged(site_packages)
+        if source is None or (site_packages / source).exists()
+    }
+
+    owners = None
+    for file in files:
+        if not file.optimizable:
+            continue
+
+        if owners is None:
+            owners = _pth_owners(site_packages)
+
+        path = site_packages / file.name
+        if file.eager:
+            path.write_text("\n".join(file.eager) + "\n", encoding="utf-8")
+        else:
+            path.unlink()
+
+        groups[file.name] = (
+            file,
+            owners.get(file.name, file.name if file.eager else None),
+        )
+
+    lines = ["# Merged by poetry-plugin-bundle, do not edit."]
+    hooks: list[Hook] = []
+    for name, (group, source) in sorted(groups.items()):
+        paths = [entry for entry in group.paths if (site_packages / entry).exists()]
+        if not paths and not group.hooks:
+            continue
+
+        lines.append(f"{_FILE_MARKER}{name}")
+        if source is not None:
+            lines.append(f"{_SOURCE_MARKER}{source}")
+        lines.extend(paths)
+        for triggers, line in group.hooks:
+            if not _module_exists(site_packages, _hooked_module(line)):
+                # The distribution providing the hook was uninstalled
+                continue
+
+            lines.append(f"{_HOOK_MARKER}{line}")
+            hooks.append((triggers, line))
+
+    if hooks:
+        shutil.copyfile(
+            Path(__file__).with_name("lazy_hooks.py"),
+            site_packages / f"{HOOKS_MODULE}.py",
+        )
+        lines.append(f"import {HOOKS_MODULE}; {HOOKS_MODULE}.install({hooks!r})")
+    else:
+        (site_packages / f"{HOOKS_MODULE}.py").unlink(missing_ok=True)
+
+    (site_packages / MERGED_PTH).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def startup_costs(env: Env, site_packages: Path) -> dict[str, float]:
+    """
+    Measure the time spent processing each .pth file at the startup
+    of the interpreter of the given environment, in seconds.
+    """
+    output = env.run(
+        "python", "-S", "-I", "-c", STARTUP_COSTS_SCRIPT, str(site_packages)
+    )
+    costs: dict[str, float] = json.loads(output)
+
+    return costs
+
+
+def _classify(site_packages: Path, name: str, lines: list[str]) -> PthFile:
+    file = PthFile(name, [], [], [], [])
+    for line in lines:
+        stripped = line.rstrip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        if not stripped.startswith(("import ", "import\t")):
+            file.paths.append(stripped)
+            continue
+
+        hook = _lazy_hook(stripped)
+        # A hook can only be deferred if its module is found to install it later
+        if hook is not None and _module_exists(site_packages, _hooked_module(stripped)):
+            file.hooks.append(hook)
+        elif _is_native_namespace(site_packages, stripped):
+            file.namespaces.append(stripped)
+        else:
+            file.eager.append(stripped)
+
+    return file
+
+
+def _lazy_hook(line: str) -> Hook | None:
+    module = _hooked_module(line)
+    if module is None:
+        return None
+
+    return LAZY_HOOKS[module], line
+
+
+def _hooked_module(line: str) -> str | None:
+    for module in LAZY_HOOKS:
+        if re.search(rf"\b{module}\b", line):
+            return module
+
+    return None
+
+
+def _module_exists(site_packages: Path, module: str | None) -> bool:
+    """
+    Whether the given top-level module can be imported from the given
+    site-packages directory, in any form: sources, bytecode only
+    (as left by sourceless bundles) or extension modules.
+    """
+    from importlib.machinery import all_suffixes
+
+    if module is None:
+        return False
+
+    return (site_packages / module).is_dir() or any(
+        (site_packages / f"{module}{suffix}").exists() for suffix in all_suffixes()
+    )
+
+
+def _is_native_namespace(site_packages: Path, line: str) -> bool:
+    """
+    Whether the given line creates a namespace package
+    that the import system would create natively (PEP 420),
+    i.e. whose directory is not a regular package.
+    """
+    match = _NAMESPACE_LINE.search(line)
+    if match is None:
+        return False
+
+    names = re.findall(r"'([^']+)'", match.group("names"))
+    if not names:
+        return False
+
+    directory = site_packages.joinpath(*names)
+
+    return directory.is_dir() and not any(
+        (directory / f"__init__{suffix}").exists() for suffix in (".py", ".pyc")
+    )
+
+
+def _pth_owners(site_packages: Path) -> dict[str, str]:
+    """
+    Return the .dist-info directories of the distributions
+    that installed the .pth files of the given site-packages directory,
+    by file name.
+    """
+    owners = {}
+    for record in site_packages.glob("*.dist-info/RECORD"):
+        try:
+            content = record.read_text(encoding="utf-8")
+        except OSError:
+            continue
+
+        for row in csv.reader(content.splitlines()):
+            if row and row[0].endswith(".pth") and "/" not in row[0]:
+                owners[row[0]] = record.parent.name
+
+    return owners
+
+
+def _read_merged(site_packages: Path) -> list[tuple[PthFile, str | None]]:
+    try:
+        lines = (site_packages / MERGED_PTH).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+
+    groups: list[tuple[PthFile, str | None]] = []
+    for line in lines:
+        if line.startswith(_FILE_MARKER):
+            groups.append((PthFile(line[len(_FILE_MARKER) :], [], [], [], []), None))
+        elif not groups:
+            continue
+        elif line.startswith(_SOURCE_MARKER):
+            groups[-1] = (groups[-1][0], line[len(_SOURCE_MARKER) :])
+        elif line.startswith(_HOOK_MARKER):
+            hook = _lazy_hook(line[len(_HOOK_MARKER) :])
+            if hook is not None:
+                groups[-1][0].hooks.append(hook)
+        elif line and not line.startswith(("#", "import ")):
+            groups[-1][0].paths.append(line)
+
+    return groups
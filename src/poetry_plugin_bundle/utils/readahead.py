@@ -0,0 +1,212 @@
+"""
+Record the files a bundle opens at startup, in the order they are opened,
+by running the console scripts of the project once in the bundle,
+and list them in a readahead manifest at the root of the bundle.
+
+The manifest is read by the prefetch module shipped in the bundle to warm
+the page cache, and by bundle deltas to store these files first.
+"""
+
+from __future__ import annotations
+
+import configparser
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.prefetch import MANIFEST_NAME
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from poetry.utils.env import Env
+
+
+PREFETCH_MODULE = "_poetry_bundle_prefetch"
+
+# The time a console script is given to start, in seconds
+STARTUP_TIMEOUT = 60.0
+
+# Files of these directories are not worth prefetching
+_PSEUDO_FILESYSTEMS = ("/dev/", "/proc/", "/sys/")
+
+# Run a console script with --help, recording the files opened for reading
+# once the interpreter is initialized, and those it opened before:
+# the interpreter, the configuration of the environment and the modules
+# already imported.
+TRACE_SCRIPT = """\
+import os, sys
+output, name, value = sys.argv[1:4]
+opened = []
+known = set()
+tracing = True
+
+def record(path):
+    path = os.path.abspath(path)
+    if path not in known:
+        known.add(path)
+        opened.append(path)
+
+def hook(event, args):
+    if not tracing:
+        return
+    if event == "import" and isinstance(args[1], str):
+        # Extension modules are loaded without an open event
+        record(args[1])
+    elif event == "open":
+        path, mode, flags = args
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        if not isinstance(path, str):
+            return
+        if mode is None and flags & (os.O_WRONLY | os.O_RDWR):
+            return
+        if mode is not None and any(c in mode for c in "wax+"):
+            return
+        record(path)
+
+record(os.path.realpath(sys.executable))
+if os.path.exists(os.path.join(sys.prefix, "pyvenv.cfg")):
+    record(os.path.join(sys.prefix, "pyvenv.cfg"))
+for module in list(sys.modules.values()):
+    spec = getattr(module, "__spec__", None)
+    path = getattr(spec, "cached", None)
+    if not path or not os.path.exists(path):
+        path = getattr(module, "__file__", None)
+    if isinstance(path, str) and os.path.exists(path):
+        record(path)
+
+sys.addaudithook(hook)
+sys.argv = [name, "--help"]
+module, _, attributes = value.partition("[")[0].partition(":")
+try:
+    import importlib
+    target = importlib.import_module(module.strip())
+    for attribute in filter(None, attributes.strip().split(".")):
+        target = getattr(target, attribute)
+    target()
+except BaseException:
+    pass
+
+tracing = False
+import json
+with open(output, "w") as f:
+    json.dump(opened, f)
+os._exit(0)
+"""
+
+
+def console_scripts(dist_info: Path) -> list[tuple[str, str]]:
+    """
+    Return the names and object references of the console scripts
+    of the given distribution.
+    """
+    entry_points = dist_info / "entry_points.txt"
+    if not entry_points.is_file():
+        return []
+
+    parser = configparser.ConfigParser(delimiters=("=",), interpolation=None)
+    parser.optionxform = str  # type: ignore[assignment, method-assign]
+    try:
+        parser.read(entry_points, encoding="utf-8")
+    except configparser.Error:
+        return []
+
+    if not parser.has_section("console_scripts"):
+        return []
+
+    return [
+        (name.strip(), value.strip())
+        for name, value in parser["console_scripts"].items()
+    ]
+
+
+def trace_startup(
+    env: Env, name: str, value: str, timeout: float = STARTUP_TIMEOUT
+) -> list[str]:
+    """
+    Run a console script of the given environment with ``--help``,
+    and return the absolute paths of the files it opened for reading, in order.
+
+    The script is run a first time beforehand, so that the bytecode it writes
+    is what is recorded, rather than the sources it compiles.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "trace.json")
+        for _ in range(2):
+            env.run(
+                "python",
+                "-c",
+                TRACE_SCRIPT,
+                output,
+                name,
+                value,
+                call=True,
+                cwd=directory,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout,
+            )
+
+        with open(output, encoding="utf-8") as f:
+            paths: list[str] = json.load(f)
+
+    return paths
+
+
+def startup_files(bundle: Path, paths: Iterable[str]) -> list[str]:
+    """
+    Return the regular files among the given paths, in order and without
+    duplicates, relative to the given bundle if they belong to it.
+    """
+    root = os.path.realpath(bundle)
+    files: dict[str, None] = {}
+    for path in paths:
+        if path.startswith(_PSEUDO_FILESYSTEMS) or not os.path.isfile(path):
+            continue
+
+        real = os.path.realpath(path)
+        if os.path.commonpath([root, real]) == root:
+            path = Path(os.path.relpath(real, root)).as_posix()
+        files.setdefault(path, None)
+
+    return list(files)
+
+
+def read_readahead(bundle: Path) -> list[str]:
+    """
+    Return the files listed by the readahead manifest of the given bundle,
+    if it has one.
+    """
+    try:
+        lines = (bundle / MANIFEST_NAME).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+
+    return [line for line in lines if line.strip()]
+
+
+def write_readahead(bundle: Path, site_packages: Path, files: Iterable[str]) -> None:
+    """
+    Write the readahead manifest of the given bundle,
+    and install the prefetch module reading it.
+    """
+    (bundle / MANIFEST_NAME).write_text(
+        "".join(f"{file}\n" for file in files), encoding="utf-8"
+    )
+    shutil.copyfile(
+        Path(__file__).with_name("prefetch.py"),
+        site_packages / f"{PREFETCH_MODULE}.py",
+    )
+
+
+def remove_readahead(bundle: Path, site_packages: Path) -> None:
+    (bundle / MANIFEST_NAME).unlink(missing_ok=True)
+    (site_packages / f"{PREFETCH_MODULE}.py").unlink(missing_ok=True)
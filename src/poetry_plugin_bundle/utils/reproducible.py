@@ -0,0 +1,182 @@
+"""
+Make bundles byte-reproducible.
+
+hash_bytecode() is run by the Python interpreter of the bundle, running this module,
+since bytecode depends on the version of the interpreter.
+It only uses the standard library.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import io
+import os
+import threading
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+# The earliest timestamp a ZIP archive, and hence a wheel, can hold
+DEFAULT_SOURCE_DATE_EPOCH = 315532800
+
+_environ_lock = threading.Lock()
+_environ_users = 0
+
+
+def get_source_date_epoch() -> int:
+    """
+    Return the timestamp of reproducible bundles: the SOURCE_DATE_EPOCH
+    environment variable if set, 1980-01-01 otherwise.
+    """
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    if not value:
+        return DEFAULT_SOURCE_DATE_EPOCH
+
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f'SOURCE_DATE_EPOCH must be an integer, not "{value}".'
+        ) from None
+
+
+@contextlib.contextmanager
+def source_date_epoch(timestamp: int) -> Iterator[None]:
+    """
+    Export SOURCE_DATE_EPOCH while bundling, unless it is set already,
+    so that built wheels use it as the time of their files and bytecode
+    is compiled with hash-based invalidation.
+    """
+    global _environ_users
+
+    with _environ_lock:
+        exported = _environ_users > 0 or "SOURCE_DATE_EPOCH" not in os.environ
+        if exported:
+            _environ_users += 1
+            os.environ["SOURCE_DATE_EPOCH"] = str(timestamp)
+
+    try:
+        yield
+    finally:
+        if exported:
+            with _environ_lock:
+                _environ_users -= 1
+                if not _environ_users:
+                    os.environ.pop("SOURCE_DATE_EPOCH", None)
+
+
+def normalize_mtimes(root: Path, timestamp: int) -> None:
+    """
+    Set the modification time of every file and directory under the given root,
+    including the root itself, to the given timestamp.
+    """
+    follow_symlinks = os.utime not in os.supports_follow_symlinks
+
+    for directory, dirnames, filenames in os.walk(root):
+        for name in [*dirnames, *filenames]:
+            path = os.path.join(directory, name)
+            if os.path.islink(path) and follow_symlinks:
+                continue
+
+            os.utime(path, (timestamp, timestamp), follow_symlinks=follow_symlinks)
+
+    os.utime(root, (timestamp, timestamp))
+
+
+def hash_bytecode(root: str) -> int:
+    """
+    Recompile the timestamp-based bytecode cached under the given root,
+    e.g. written by the interpreter when it imported a module,
+    with hash-based invalidation.
+
+    Returns the number of recompiled files.
+    """
+    import importlib.util
+    import py_compile
+
+    count = 0
+    for directory, _, filenames in os.walk(root):
+        if os.path.basename(directory) != "__pycache__":
+            continue
+
+        for name in sorted(filenames):
+            pyc = os.path.join(directory, name)
+            try:
+                source = importlib.util.source_from_cache(pyc)
+            except ValueError:
+                continue
+
+            with open(pyc, "rb") as f:
+                header = f.read(8)
+            flags = int.from_bytes(header[4:8], "little")
+            if (
+                header[:4] != importlib.util.MAGIC_NUMBER
+                or flags
+                or not os.path.isfile(source)
+            ):
+                continue
+
+            optimization = name.split(".")[-2]
+            py_compile.compile(
+                source,
+                cfile=pyc,
+                optimize=int(optimization[4:])
+                if optimization.startswith("opt-")
+                else 0,
+                invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+                doraise=True,
+            )
+            count += 1
+
+    return count
+
+
+def sort_record(dist_info: Path) -> None:
+    """
+    Sort the rows of the RECORD of a distribution, which otherwise follow
+    the order in which its files were installed.
+    """
+    record = dist_info / "RECORD"
+    if not record.is_file():
+        return
+
+    with record.open(encoding="utf-8", newline="") as f:
+        rows = [row for row in csv.reader(f) if row]
+
+    content = io.StringIO()
+    csv.writer(content, lineterminator="\n").writerows(sorted(rows))
+    record.write_text(content.getvalue(), encoding="utf-8", newline="")
+
+
+def remove_direct_url(dist_info: Path) -> bool:
+    """
+    Remove the direct URL (PEP 610) of a distribution, along with its RECORD row.
+
+    Returns whether the distribution had a direct URL.
+    """
+    direct_url = dist_info / "direct_url.json"
+    if not direct_url.is_file():
+        return False
+
+    direct_url.unlink()
+
+    record = dist_info / "RECORD"
+    if record.is_file():
+        with record.open(encoding="utf-8", newline="") as f:
+            rows = [
+                row
+                for row in csv.reader(f)
+                if row and row[0] != f"{dist_info.name}/direct_url.json"
+            ]
+
+        content = io.StringIO()
+        csv.writer(content, lineterminator="\n").writerows(rows)
+        record.write_text(content.getvalue(), encoding="utf-8", newline="")
+
+    return True
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import csv
+import os
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from packaging.utils import canonicalize_name
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Iterator
+
+    from packaging.utils import NormalizedName
+
+
+def iter_distributions(site_packages: Path) -> Iterator[tuple[NormalizedName, Path]]:
+    """
+    Yield the normalized name and the .dist-info directory
+    of every distribution installed in the given site-packages directory.
+    """
+    if not site_packages.is_dir():
+        return
+
+    for dist_info in sorted(site_packages.glob("*.dist-info")):
+        if not dist_info.is_dir():
+            continue
+
+        name = dist_info.name[: -len(".dist-info")].split("-", 1)[0]
+        yield canonicalize_name(name), dist_info
+
+
+def distribution_record(dist_info: Path) -> list[Path]:
+    """
+    Return the absolute paths of the files listed in the RECORD of a distribution.
+    """
+    record = dist_info / "RECORD"
+    if not record.exists():
+        return []
+
+    site_packages = dist_info.parent
+    with record.open(encoding="utf-8", newline="") as f:
+        # Paths in RECORD are relative to site-packages but may escape it
+        # (scripts, data files), so they are normalized without resolving symlinks.
+        return [
+            Path(os.path.normpath(site_packages / row[0]))
+            for row in csv.reader(f)
+            if row and row[0]
+        ]
+
+
+def distribution_files(site_packages: Path, names: Collection[str]) -> set[Path]:
+    """
+    Return the files belonging to the given distributions,
+    as listed in their RECORD files.
+    """
+    wanted = {canonicalize_name(name) for name in names}
+    files: set[Path] = set()
+    for name, dist_info in iter_distributions(site_packages):
+        if name in wanted:
+            files.update(distribution_record(dist_info))
+
+    return files
+
+
+def remove_distribution(
+    dist_info: Path, root: Path, keep_metadata: bool = False
+) -> int:
+    """
+    Remove the files of a distribution listed in its RECORD, and their cached
+    bytecode, along with the directories of site-packages left empty.
+    Files outside the given root directory are left untouched,
+    as well as the .dist-info directory if keeping the metadata.
+
+    Returns the number of removed files.
+    """
+    root = Path(os.path.normpath(root.absolute()))
+    metadata = Path(os.path.normpath(dist_info.absolute()))
+    files = [
+        file
+        for file in distribution_record(dist_info)
+        if file.is_relative_to(root)
+        and file != root
+        and not (keep_metadata and file.is_relative_to(metadata))
+    ]
+
+    removed = 0
+    directories = set()
+    for file in files:
+        if file.suffix == ".py":
+            for cached in file.parent.glob(f"__pycache__/{file.stem}.*.pyc"):
+                cached.unlink()
+            directories.add(file.parent / "__pycache__")
+
+        if file.is_file() or file.is_symlink():
+            file.unlink()
+            removed += 1
+
+        directories.add(file.parent)
+
+    site_packages = dist_info.parent
+    for directory in sorted(directories, key=lambda d: len(d.parts), reverse=True):
+        while directory != site_packages and directory.is_relative_to(site_packages):
+            try:
+                directory.rmdir()
+            except OSError:
+                # Not empty, or already removed
+                if directory.exists():
+                    break
+            directory = directory.parent
+
+    return removed
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+
+Snapshot = dict[Path, tuple[int, int]]
+
+
+class ProjectWatcher:
+    """
+    Watch the files of a project directory for changes.
+
+    Changes are detected by periodically comparing the modification time
+    and size of every file, which works on every platform and file system
+    without requiring any additional dependency.
+    Hidden directories (like .git or .venv) and __pycache__ directories
+    are ignored, as well as the excluded paths.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        exclude: Collection[Path] = (),
+        interval: float = 0.5,
+    ) -> None:
+        self._root = root.absolute()
+        self._exclude = {path.absolute() for path in exclude}
+        self._interval = interval
+        self._snapshot = self.snapshot()
+
+    def snapshot(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        for directory, dirnames, filenames in os.walk(self._root):
+            current = Path(directory)
+            dirnames[:] = [
+                name
+                for name in dirnames
+                if not name.startswith(".")
+                and name != "__pycache__"
+                and current / name not in self._exclude
+            ]
+            for filename in filenames:
+                path = current / filename
+                if path in self._exclude:
+                    continue
+
+                try:
+                    stat = path.stat()
+                except OSError:
+                    # The file was removed while walking the directory
+                    continue
+
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def changes(self) -> set[Path]:
+        """
+        Return the files that were added, modified or removed since the last call.
+        """
+        snapshot = self.snapshot()
+        changed = {
+            path
+            for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+
+        return changed
+
+    def wait(self) -> set[Path]:
+        """
+        Block until some files change and return them.
+
+        Changes are accumulated until the project has been stable for one interval,
+        so that saving several files at once (or a lock file being rewritten)
+        results in a single notification.
+        """
+        changed: set[Path] = set()
+        while True:
+            time.sleep(self._interval)
+            new_changes = self.changes()
+            if new_changes:
+                changed |= new_changes
+            elif changed:
+                return changed
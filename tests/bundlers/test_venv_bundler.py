@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import shutil
 import sys
 
@@ -12,6 +13,7 @@ from cleo.formatters.style import Style
 from cleo.io.buffered_io import BufferedIO
 from poetry.core.packages.package import Package
 from poetry.factory import Factory
+from poetry.installation.installer import Installer
 from poetry.installation.operations.install import Install
 from poetry.puzzle.exceptions import SolverProblemError
 from poetry.repositories.repository import Repository
@@ -21,10 +23,12 @@ from poetry.utils.env import MockEnv
 from poetry.utils.env import VirtualEnv
 
 from poetry_plugin_bundle.bundlers.venv_bundler import VenvBundler
+from poetry_plugin_bundle.installation.executor import BundleExecutor
 
 
 if TYPE_CHECKING:
     from poetry.config.config import Config
+    from poetry.installation.operations.operation import Operation
     from poetry.poetry import Poetry
     from pytest_mock import MockerFixture
 
@@ -422,3 +426,1044 @@ def test_bundler_non_package_mode(
   • Bundled simple-project-non-package-mode (1.2.3) into {path}
 """
     assert expected == io.fetch_output()
+
+
+def test_bundler_does_not_prune_without_a_root_package(
+    io: BufferedIO, tmp_venv: VirtualEnv, mocker: MockerFixture, config: Config
+) -> None:
+    poetry = Factory().create_poetry(
+        Path(__file__).parent.parent / "fixtures" / "non_package_mode"
+    )
+    poetry.set_config(config)
+
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_dist_info(site_packages, "requests", "1.0.0")
+    (site_packages / "requests.py").write_text("")
+    (site_packages / "requests-1.0.0.dist-info" / "RECORD").write_text(
+        "requests.py,,\n"
+    )
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_prune_unreachable(True)
+
+    assert bundler.bundle(poetry, io)
+
+    assert (site_packages / "requests.py").exists()
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project-non-package-mode (1.2.3) into {path}
+  • Bundling simple-project-non-package-mode (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project-non-package-mode (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project-non-package-mode (1.2.3) into {path}: Skipping installation for non package project simple-project-non-package-mode
+  • Bundling simple-project-non-package-mode (1.2.3) into {path}: Analyzing imports
+  • Bundled simple-project-non-package-mode (1.2.3) into {path}
+  • The root package is not installed and no package to keep was given: unreachable packages were not searched for, and none was removed.
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_sourceless(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    module = tmp_venv.site_packages.path / "sourceless_module.py"
+    module.write_text("VALUE = 1\n", encoding="utf-8")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_sourceless(True)
+
+    assert bundler.bundle(poetry, io)
+
+    assert not module.exists()
+    assert module.with_suffix(".pyc").exists()
+    output = tmp_venv.run_python_script(
+        "import sourceless_module; print(sourceless_module.VALUE)"
+    )
+    assert output.strip() == "1"
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundling simple-project (1.2.3) into {path}: Compiling bytecode and removing sources
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_reuses_cached_install_plan(
+    io: BufferedIO,
+    tmp_venv: VirtualEnv,
+    poetry: Poetry,
+    mocker: MockerFixture,
+    config_cache_dir: Path,
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    execute = mocker.spy(BundleExecutor, "execute")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_cache_plan(True)
+
+    assert bundler.bundle(poetry, io)
+    assert len(list((config_cache_dir / "bundle" / "plans").glob("*.json"))) == 1
+
+    io.clear_output()
+    run = mocker.spy(Installer, "run")
+
+    assert bundler.bundle(poetry, io)
+    run.assert_not_called()
+
+    # The cached plan results in the operations Poetry planned, in the same order,
+    # the root package being installed after the dependencies.
+    planned, cached = (
+        [(o.job_type, o.package.name, o.priority, o.skipped) for o in call.args[1]]
+        for call in execute.call_args_list[::2]
+    )
+    assert cached == planned
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies from cached install plan
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_plans_installed_packages_like_poetry(mocker: MockerFixture) -> None:
+    from poetry.core.packages.package import Package
+
+    from poetry_plugin_bundle.utils.plan_cache import PlannedPackage
+
+    foo = Package("foo", "1.0.0")
+    bar = Package("bar", "2.0.0")
+    locker = mocker.Mock()
+    locker.locked_repository.return_value.packages = [foo, bar]
+    installed = mocker.Mock(packages=[Package("bar", "2.0.0")], system_site_packages=[])
+
+    operations = VenvBundler()._get_plan_operations(
+        [
+            PlannedPackage.from_package(foo, priority=1),
+            PlannedPackage.from_package(bar, priority=2),
+        ],
+        locker,
+        installed,
+        "simple-project",
+    )
+
+    assert [
+        (o.job_type, o.package.name, o.priority, o.skipped) for o in operations or []
+    ] == [("install", "foo", 1, False), ("install", "bar", 0, True)]
+
+
+def test_bundler_can_only_install_the_root_package(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    run = mocker.spy(Installer, "run")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_only_root(True)
+
+    assert bundler.bundle(poetry, io)
+    run.assert_not_called()
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_writes_metrics_file(
+    io: BufferedIO,
+    tmp_venv: VirtualEnv,
+    poetry: Poetry,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    metrics_file = tmp_path / "metrics" / "bundle.prom"
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_metrics_file(metrics_file)
+
+    assert bundler.bundle(poetry, io)
+
+    assert set(bundler.stats.phases) == {"environment", "dependencies", "root"}
+    assert bundler.stats.operations["install"] > 0
+
+    content = metrics_file.read_text(encoding="utf-8")
+    runs = 'poetry_bundle_runs_total{project="simple-project",result="success"} 1'
+    assert runs in content
+    assert 'poetry_bundle_phase_duration_seconds{phase="root"' in content
+
+
+def test_bundler_clones_a_matching_bundle(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    source = tmp_path / "source"
+    bundler = VenvBundler()
+    bundler.set_path(source)
+    assert bundler.bundle(poetry, io)
+
+    marker_file = _create_venv_marker_file(source)
+    io.clear_output()
+
+    clone = tmp_path / "clone"
+    bundler = VenvBundler()
+    bundler.set_path(clone)
+    bundler.set_clone_source(source)
+    assert bundler.bundle(poetry, io)
+
+    assert (clone / marker_file.name).exists()
+    assert str(source) not in (clone / "pyvenv.cfg").read_text(encoding="utf-8")
+    assert VirtualEnv(clone).is_sane()
+
+    path = str(clone)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Cloning {source}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_does_not_clone_a_bundle_of_other_groups(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    source = tmp_path / "source"
+    bundler = VenvBundler()
+    bundler.set_path(source)
+    bundler.set_activated_groups({"main", "dev"})
+    assert bundler.bundle(poetry, io)
+
+    marker_file = _create_venv_marker_file(source)
+
+    clone = tmp_path / "clone"
+    bundler = VenvBundler()
+    bundler.set_path(clone)
+    bundler.set_activated_groups({"main"})
+    bundler.set_clone_source(source)
+    assert bundler.bundle(poetry, io)
+
+    assert not (clone / marker_file.name).exists()
+    assert (
+        f"The bundle {source} was not cloned because it does not match"
+        " the lock file and dependency groups of the project."
+    ) in io.fetch_output()
+
+
+def test_bundler_swaps_in_an_atomic_bundle(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_atomic(True)
+    assert bundler.bundle(poetry, io)
+
+    marker_file = _create_venv_marker_file(path)
+    io.clear_output()
+
+    assert bundler.bundle(poetry, io)
+
+    # The new bundle was seeded with the previous one
+    assert marker_file.exists()
+    assert VirtualEnv(path).is_sane()
+    assert "bundle-" not in (path / "bin" / "activate").read_text(encoding="utf-8")
+    assert sorted(tmp_path.glob("*bundle*")) == [tmp_path / ".bundle.lock", path]
+
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_leaves_the_bundle_untouched_when_an_atomic_bundle_fails(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    assert bundler.bundle(poetry, io)
+
+    marker_file = _create_venv_marker_file(path)
+    mocker.patch("poetry.installation.installer.Installer.run", return_value=1)
+
+    bundler.set_atomic(True)
+    assert not bundler.bundle(poetry, io)
+
+    assert marker_file.exists()
+    assert (path / ".poetry-bundle.json").exists()
+    assert sorted(tmp_path.glob("*bundle*")) == [tmp_path / ".bundle.lock", path]
+
+
+def _create_dist_info(site_packages: Path, name: str, version: str) -> None:
+    dist_info = site_packages / f"{name}-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+    )
+    (dist_info / "RECORD").write_text("")
+
+
+def test_bundler_sourceless_keeps_sources_uncompiled(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    for name in ["foo", "bar"]:
+        _create_dist_info(site_packages, name, "1.0.0")
+        (site_packages / f"{name}.py").write_text("VALUE = 1\n")
+        (site_packages / f"{name}-1.0.0.dist-info" / "RECORD").write_text(
+            f"{name}.py,,\n{name}-1.0.0.dist-info/RECORD,,\n"
+        )
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_sourceless(True)
+    bundler.set_keep_sources(("bar",))
+
+    assert bundler.bundle(poetry, io)
+
+    assert not (site_packages / "foo.py").exists()
+    assert (site_packages / "bar.py").exists()
+    assert not (site_packages / "bar.pyc").exists()
+    record = (site_packages / "foo-1.0.0.dist-info" / "RECORD").read_text()
+    assert record.startswith("foo.pyc,sha256=")
+    assert (site_packages / "bar-1.0.0.dist-info" / "RECORD").read_text() == (
+        "bar.py,,\nbar-1.0.0.dist-info/RECORD,,\n"
+    )
+
+
+def test_bundler_chains_an_overlay_to_its_base(
+    io: BufferedIO,
+    tmp_path: Path,
+    tmp_venv: VirtualEnv,
+    poetry: Poetry,
+    mocker: MockerFixture,
+) -> None:
+    execute_operation = mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation"
+    )
+
+    base_site_packages = Path(tmp_venv.paths["purelib"])
+    _create_dist_info(base_site_packages, "foo", "1.0.0")
+    _create_dist_info(base_site_packages, "bar", "2.0.0")
+
+    path = tmp_path / "overlay"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_base(tmp_venv.path)
+
+    assert bundler.bundle(poetry, io)
+
+    operations = {
+        call.args[0].package.name: call.args[0]
+        for call in execute_operation.call_args_list
+    }
+    # foo is provided by the base and bar is never uninstalled from it
+    assert operations["foo"].skipped
+    assert "bar" not in operations
+
+    overlay = VirtualEnv(path)
+    sys_path = overlay.run_python_script("import sys; print('\\n'.join(sys.path))")
+    assert str(base_site_packages) in sys_path.splitlines()
+
+
+def test_bundler_fails_with_a_missing_base(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    path = tmp_path / "overlay"
+    base = tmp_path / "base"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_base(base)
+
+    assert not bundler.bundle(poetry, io)
+
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: The base bundle {base}"
+        " is not a virtual environment of the same Python version"
+    ) in io.fetch_output()
+
+
+def test_bundler_installs_a_module_index(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_module_index(True)
+
+    assert bundler.bundle(poetry, io)
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    assert (site_packages / "_poetry_bundle_finder.pth").exists()
+    assert (site_packages / "_poetry_bundle_index.marshal").exists()
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundling simple-project (1.2.3) into {path}: Indexing modules
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_optimizes_pth_files(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_optimize_pth(True)
+
+    assert bundler.bundle(poetry, io)
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    assert not (site_packages / "_virtualenv.pth").exists()
+    assert (site_packages / "00-poetry-bundle.pth").exists()
+
+    path = str(tmp_venv.path)
+    output = io.fetch_output()
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: Optimizing .pth files\n"
+        f"  • Bundled simple-project (1.2.3) into {path}\n"
+        "  - _virtualenv.pth ("
+    ) in output
+    assert "ms): deferred 1 import hooks\n" in output
+    assert "  - Startup cost of .pth files: " in output
+
+
+def test_bundler_optimizes_pth_files_of_sourceless_bundles(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_sourceless(True)
+    bundler.set_optimize_pth(True)
+
+    assert bundler.bundle(poetry, io)
+
+    # Only the bytecode of the module installing the hook is left
+    site_packages = Path(tmp_venv.paths["purelib"])
+    assert not (site_packages / "_virtualenv.py").exists()
+    assert (site_packages / "_virtualenv.pyc").exists()
+    assert not (site_packages / "_virtualenv.pth").exists()
+    assert "# hook: import _virtualenv" in (
+        site_packages / "00-poetry-bundle.pth"
+    ).read_text(encoding="utf-8")
+    assert "ms): deferred 1 import hooks\n" in io.fetch_output()
+
+
+def test_bundler_records_the_files_read_at_startup(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    from poetry_plugin_bundle.utils.readahead import read_readahead
+
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_dist_info(site_packages, "simple_project", "1.2.3")
+    (site_packages / "simple_project-1.2.3.dist-info" / "entry_points.txt").write_text(
+        "[console_scripts]\nsimple = simple_project.cli:main\n"
+    )
+    (site_packages / "simple_project").mkdir()
+    (site_packages / "simple_project" / "__init__.py").write_text("")
+    (site_packages / "simple_project" / "data.txt").write_text("data")
+    (site_packages / "simple_project" / "cli.py").write_text(
+        "import os\n"
+        "def main():\n"
+        "    with open(os.path.join(os.path.dirname(__file__), 'data.txt')) as f:\n"
+        "        f.read()\n"
+    )
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_readahead(True)
+
+    assert bundler.bundle(poetry, io)
+
+    files = read_readahead(tmp_venv.path)
+    assert "pyvenv.cfg" in files
+    package = site_packages.relative_to(tmp_venv.path).as_posix() + "/simple_project"
+    cli = next(file for file in files if file.startswith(package) and "/cli." in file)
+    assert files.index(cli) < files.index(f"{package}/data.txt")
+    assert (site_packages / "_poetry_bundle_prefetch.py").exists()
+
+    path = str(tmp_venv.path)
+    output = io.fetch_output()
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}:"
+        " Recording the files read at startup\n"
+        f"  • Bundled simple-project (1.2.3) into {path}\n"
+        f"  - Readahead: files read at startup: {len(files)} ("
+    ) in output
+    assert "), by console scripts: 1\n" in output
+
+    # Bundling without the option removes the manifest
+    bundler.set_readahead(False)
+
+    assert bundler.bundle(poetry, io)
+
+    assert read_readahead(tmp_venv.path) == []
+    assert not (site_packages / "_poetry_bundle_prefetch.py").exists()
+
+
+def test_bundler_keeps_the_module_index_valid_with_readahead(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_dist_info(site_packages, "simple_project", "1.2.3")
+    (site_packages / "simple_project-1.2.3.dist-info" / "entry_points.txt").write_text(
+        "[console_scripts]\nsimple = simple_project:main\n"
+    )
+    (site_packages / "simple_project.py").write_text("def main():\n    pass\n")
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_module_index(True)
+    bundler.set_readahead(True)
+
+    assert bundler.bundle(poetry, io)
+    assert (site_packages / "_poetry_bundle_prefetch.py").exists()
+
+    output = tmp_venv.run_python_script(
+        "import sys, _poetry_bundle_finder\n"
+        "print(any(isinstance(finder, _poetry_bundle_finder.IndexFinder)"
+        " for finder in sys.meta_path))\n"
+    )
+    assert output.strip() == "True"
+
+
+def test_bundler_pipelines_downloads_with_environment_creation(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    from poetry_plugin_bundle.installation.pipeline import Pipeline
+
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    download = mocker.patch.object(
+        Pipeline, "_download", return_value=tmp_path / "foo-1.0.0.tar.gz"
+    )
+    wheel = mocker.spy(Pipeline, "wheel")
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_pipeline(True)
+
+    assert bundler.bundle(poetry, io)
+
+    assert [call.args[1].package.name for call in download.call_args_list] == ["foo"]
+    assert wheel.spy_return.name == "simple_project-1.2.3-py2.py3-none-any.whl"
+
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_makes_packages_lazy(
+    io: BufferedIO,
+    tmp_path: Path,
+    tmp_venv: VirtualEnv,
+    poetry: Poetry,
+    mocker: MockerFixture,
+) -> None:
+    import zipfile
+
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_dist_info(site_packages, "foo", "1.0.0")
+    (site_packages / "foo.py").write_text("")
+    (site_packages / "foo-1.0.0.dist-info" / "RECORD").write_text(
+        "foo.py,,\nfoo-1.0.0.dist-info/METADATA,,\nfoo-1.0.0.dist-info/RECORD,,\n"
+    )
+    wheel = tmp_path / "foo-1.0.0-py3-none-any.whl"
+    with zipfile.ZipFile(wheel, "w") as archive:
+        archive.writestr("foo.py", "")
+    mocker.patch.object(VenvBundler, "_get_cached_wheel", return_value=wheel)
+
+    wheelhouse = tmp_path / "wheelhouse"
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_lazy(["foo"])
+    bundler.set_lazy_wheelhouse(wheelhouse)
+
+    assert bundler.bundle(poetry, io)
+
+    assert not (site_packages / "foo.py").exists()
+    assert (site_packages / "foo-1.0.0.dist-info" / "METADATA").exists()
+    assert (site_packages / "_poetry_bundle_lazy.pth").exists()
+    assert (wheelhouse / wheel.name).exists()
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundling simple-project (1.2.3) into {path}: Making packages lazy
+  • Bundled simple-project (1.2.3) into {path}
+  - foo is lazy: loaded on first import of foo
+"""
+    assert expected == io.fetch_output()
+
+    # Packages no longer lazy are materialized
+    bundler.set_lazy([])
+
+    assert bundler.bundle(poetry, io)
+
+    assert (site_packages / "foo.py").exists()
+    assert not (site_packages / "_poetry_bundle_lazy.pth").exists()
+    assert "  - foo is no longer lazy" in io.fetch_output()
+
+
+def test_bundler_limits_and_reports_parallelism(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    def execute_operation(executor: BundleExecutor, operation: Operation) -> None:
+        assert executor._jobs is not None
+        with executor._jobs.install.slot():
+            pass
+
+    mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation",
+        autospec=True,
+        side_effect=execute_operation,
+    )
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_jobs("download=8,install=2")
+
+    assert bundler.bundle(poetry, io)
+
+    # The dependency and the root package
+    assert bundler.stats.parallelism == {"install": (1, 1.0)}
+
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+  - Installs: 2 (1.0 at once on average, 1 at peak, limit 2)
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_bounds_and_reports_memory(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    def execute_operation(executor: BundleExecutor, operation: Operation) -> None:
+        # Memory is bounded in the default pools
+        assert executor._jobs is not None
+        assert executor._jobs.memory is not None
+        assert executor._jobs.memory.limit == 512 << 20
+
+    mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation",
+        autospec=True,
+        side_effect=execute_operation,
+    )
+    mocker.patch("poetry_plugin_bundle.utils.memory.peak_rss", return_value=600 << 20)
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_memory_limit("512M")
+
+    assert bundler.bundle(poetry, io)
+
+    assert bundler.stats.peak_rss_bytes == 600 << 20
+
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+  - Peak memory: 600.0 MiB (limit 512.0 MiB)
+  • The peak memory of the bundle (600.0 MiB) exceeded its limit (512.0 MiB).
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_rejects_invalid_memory_limit() -> None:
+    with pytest.raises(ValueError, match='Invalid size "lots"'):
+        VenvBundler().set_memory_limit("lots")
+
+
+def test_bundler_evicts_cold_cache_entries_beyond_its_quota(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation", autospec=True
+    )
+
+    artifacts = Path(poetry.config.artifacts_cache_directory)
+    cold = artifacts / "aa" / "bb" / "cc" / "dd"
+    cold.mkdir(parents=True)
+    (cold / "foo-1.0.0-py3-none-any.whl").write_bytes(b"0" * 2048)
+    os.utime(cold, (0, 0))
+    hot = artifacts / "aa" / "bb" / "cc" / "ee"
+    hot.mkdir(parents=True)
+    (hot / "foo-1.0.0.tar.gz").write_bytes(b"0" * 1024)
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_cache_quota("size=1K")
+
+    assert bundler.bundle(poetry, io)
+
+    assert not cold.exists()
+    assert hot.exists()
+
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+  - Cold entries evicted from the artifacts cache to stay within its quota: 1 (2.0 KiB)
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_rejects_invalid_jobs() -> None:
+    with pytest.raises(ValueError, match='The pool "compile" does not exist'):
+        VenvBundler().set_jobs("compile=2")
+
+
+def test_bundler_builds_and_verifies_reproducible_bundles(
+    io: BufferedIO,
+    tmp_path: Path,
+    poetry: Poetry,
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_verify_reproducible(True)
+
+    assert bundler.bundle(poetry, io)
+
+    assert path.stat().st_mtime == 1700000000
+    assert all(file.lstat().st_mtime == 1700000000 for file in path.rglob("*"))
+    assert not list(path.rglob("direct_url.json"))
+
+    output = io.fetch_output()
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: Normalizing the bundle\n"
+        f"  • Bundled simple-project (1.2.3) into {path}\n"
+        "  - Bundle digest: "
+    ) in output
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}:"
+        " Rebuilding to verify reproducibility\n"
+        "  - The bundle is reproducible\n"
+    ) in output
+    assert "verify" in bundler.stats.phases
+
+
+def test_bundler_reports_unreproducible_bundles(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    import time
+
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    normalize = VenvBundler._normalize
+
+    def unreproducible(
+        bundler: VenvBundler, env: VirtualEnv, poetry: Poetry, timestamp: int
+    ) -> None:
+        (bundler._build_path / "build-time.txt").write_text(str(time.time_ns()))
+        normalize(bundler, env, poetry, timestamp)
+
+    mocker.patch.object(
+        VenvBundler, "_normalize", autospec=True, side_effect=unreproducible
+    )
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_verify_reproducible(True)
+
+    assert not bundler.bundle(poetry, io)
+
+    # The first build is kept
+    assert (path / "build-time.txt").exists()
+    assert not list(tmp_path.glob(".bundle.bundle-*"))
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: The bundle is not"
+        " reproducible, files differing between two builds: 1\n"
+        "  - build-time.txt\n"
+    ) in io.fetch_error()
+
+
+def test_bundler_rejects_invalid_source_date_epoch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+
+    with pytest.raises(ValueError, match="SOURCE_DATE_EPOCH must be an integer"):
+        VenvBundler().set_reproducible(True)
+
+
+def _create_wheel(directory: Path, name: str, version: str, tag: str) -> Path:
+    import zipfile
+
+    dist_info = f"{name}-{version}.dist-info"
+    wheel = directory / f"{name}-{version}-{tag}.whl"
+    with zipfile.ZipFile(wheel, "w") as archive:
+        archive.writestr(f"{name}.py", "")
+        archive.writestr(
+            f"{dist_info}/METADATA",
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        )
+        archive.writestr(
+            f"{dist_info}/WHEEL",
+            f"Wheel-Version: 1.0\nRoot-Is-Purelib: false\nTag: {tag}\n",
+        )
+        archive.writestr(
+            f"{dist_info}/entry_points.txt",
+            f"[console_scripts]\n{name} = {name}:main\n",
+        )
+        archive.writestr(f"{dist_info}/RECORD", "")
+
+    return wheel
+
+
+def test_bundler_bundles_for_a_target(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    from poetry.core.packages.utils.link import Link
+
+    wheel = _create_wheel(
+        tmp_path, "foo", "1.0.0", "cp311-cp311-manylinux_2_17_aarch64"
+    )
+    mocker.patch(
+        "poetry.installation.chooser.Chooser.choose_for",
+        return_value=Link(wheel.as_uri()),
+    )
+
+    path = tmp_path / "bundle"
+    target = "platform=manylinux_2_28_aarch64,python=3.11.9,home=/usr/local/bin"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_target(target)
+
+    assert bundler.bundle(poetry, io)
+
+    site_packages = path / "lib" / "python3.11" / "site-packages"
+    assert (site_packages / "foo.py").exists()
+    assert (site_packages / "simple_project").is_dir()
+    assert (path / "bin" / "foo").read_text().startswith(f"#!{path}/bin/python\n")
+    assert (path / "bin" / "python3.11").readlink() == Path("/usr/local/bin/python3.11")
+    assert "home = /usr/local/bin\n" in (path / "pyvenv.cfg").read_text()
+
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Laying out a virtual environment for platform=manylinux_2_28_aarch64,python=3.11.9,abi=cp311,implementation=cp,home=/usr/local/bin
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundled simple-project (1.2.3) into {path}
+"""
+    assert expected == io.fetch_output()
+
+
+def test_bundler_fails_for_a_target_without_wheels(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    from poetry.core.packages.utils.link import Link
+
+    mocker.patch(
+        "poetry.installation.chooser.Chooser.choose_for",
+        return_value=Link("https://example.com/foo-1.0.0.tar.gz"),
+    )
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_target("platform=manylinux_2_28_aarch64,python=3.11")
+
+    assert not bundler.bundle(poetry, io)
+
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: Failed at step"
+        " Installing dependencies\n"
+    ) in io.fetch_output()
+    assert io.fetch_error() == (
+        "  - No wheel of foo (1.0.0) matches the environment,"
+        " only a source distribution is available\n"
+    )
+
+
+def test_bundler_warns_about_a_target_without_home(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    from poetry.core.packages.utils.link import Link
+
+    wheel = _create_wheel(tmp_path, "foo", "1.0.0", "py3-none-any")
+    mocker.patch(
+        "poetry.installation.chooser.Chooser.choose_for",
+        return_value=Link(wheel.as_uri()),
+    )
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_target("platform=manylinux_2_28_aarch64,python=3.11")
+
+    assert bundler.bundle(poetry, io)
+
+    assert not (path / "bin" / "python").exists()
+    assert (
+        "  • The target has no home: the bundle does not link to an interpreter,"
+        " and its scripts cannot run until one is linked into it.\n"
+    ) in io.fetch_output()
+
+
+def test_bundler_requires_the_micro_version_of_a_target_for_its_markers(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry.packages.locker.Locker.lock_data",
+        new_callable=mocker.PropertyMock,
+        return_value={
+            "package": [{"name": "foo", "markers": 'python_full_version >= "3.11.4"'}]
+        },
+    )
+
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_target("platform=manylinux_2_28_aarch64,python=3.11,home=/usr/bin")
+
+    assert not bundler.bundle(poetry, io)
+
+    assert not path.exists()
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: The dependencies depend"
+        " on the full Python version of the target, whose micro version must be"
+        " given\n"
+    ) in io.fetch_output()
+
+
+def test_bundler_rejects_options_running_the_target_interpreter(
+    io: BufferedIO, tmp_path: Path, poetry: Poetry
+) -> None:
+    path = tmp_path / "bundle"
+    bundler = VenvBundler()
+    bundler.set_path(path)
+    bundler.set_target("platform=win_amd64,python=3.12")
+    bundler.set_compile(True)
+    bundler.set_module_index(True)
+
+    assert not bundler.bundle(poetry, io)
+
+    assert not path.exists()
+    assert (
+        f"  • Bundling simple-project (1.2.3) into {path}: The --compile,"
+        " --module-index options require running the interpreter of the bundle"
+        " and cannot be used with a target\n"
+    ) in io.fetch_output()
+
+
+def test_bundler_prunes_unreachable_packages(
+    io: BufferedIO, tmp_venv: VirtualEnv, poetry: Poetry, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_dist_info(site_packages, "foo", "1.0.0")
+    (site_packages / "foo.py").write_text("")
+    (site_packages / "foo-1.0.0.dist-info" / "RECORD").write_text(
+        "foo.py,,\nfoo-1.0.0.dist-info/METADATA,,\nfoo-1.0.0.dist-info/RECORD,,\n"
+    )
+    # The root package is not actually installed by the mocked executor
+    _create_dist_info(site_packages, "simple_project", "1.2.3")
+    (site_packages / "simple_project.py").write_text("import os\n")
+    (site_packages / "simple_project-1.2.3.dist-info" / "RECORD").write_text(
+        "simple_project.py,,\n"
+    )
+
+    bundler = VenvBundler()
+    bundler.set_path(tmp_venv.path)
+    bundler.set_prune_unreachable(True)
+
+    assert bundler.bundle(poetry, io)
+
+    assert not (site_packages / "foo.py").exists()
+    assert not (site_packages / "foo-1.0.0.dist-info").exists()
+
+    path = str(tmp_venv.path)
+    expected = f"""\
+  • Bundling simple-project (1.2.3) into {path}
+  • Bundling simple-project (1.2.3) into {path}: Creating a virtual environment using Poetry-determined Python
+  • Bundling simple-project (1.2.3) into {path}: Installing dependencies
+  • Bundling simple-project (1.2.3) into {path}: Installing simple-project (1.2.3)
+  • Bundling simple-project (1.2.3) into {path}: Analyzing imports
+  • Bundled simple-project (1.2.3) into {path}
+  - foo is never imported: removed
+"""
+    assert expected == io.fetch_output()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.bundlers.bundler_manager import BundlerManager
+from poetry_plugin_bundle.console.commands.bundle.bundle_command import BundleCommand
+
+
+if TYPE_CHECKING:
+    from cleo.testers.application_tester import ApplicationTester
+    from pytest_mock import MockerFixture
+
+
+class NoProfileCommand(BundleCommand):
+    name = "bundle noprofile"
+    bundler_name = "venv"
+
+
+def test_bundle_commands_without_profile_options_run(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    bundle = mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    command = NoProfileCommand()
+    command.set_bundler_manager(BundlerManager())
+    app_tester.application.add(command)
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle noprofile") == 0
+    bundle.assert_called_once()
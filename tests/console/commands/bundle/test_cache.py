@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cleo.testers.command_tester import CommandTester
+
+from poetry_plugin_bundle.console.commands.bundle.cache import BundleCacheEvictCommand
+from poetry_plugin_bundle.console.commands.bundle.cache import BundleCacheUsageCommand
+
+
+if TYPE_CHECKING:
+    from poetry.config.config import Config
+
+
+# The application tester does not rearrange the input of commands
+# whose name has more than two words, so they are tested on their own.
+@pytest.fixture
+def usage_tester() -> CommandTester:
+    return CommandTester(BundleCacheUsageCommand())
+
+
+@pytest.fixture
+def evict_tester() -> CommandTester:
+    return CommandTester(BundleCacheEvictCommand())
+
+
+def _create_artifact(
+    config: Config, key: str, name: str, size: int, age: float
+) -> Path:
+    directory = Path(config.artifacts_cache_directory).joinpath(
+        key[:2], key[2:4], key[4:6], key[6:]
+    )
+    directory.mkdir(parents=True)
+    (directory / name).write_bytes(b"0" * size)
+    used = time.time() - age
+    os.utime(directory, (used, used))
+
+    return directory
+
+
+def test_cache_usage_reports_caches_and_packages(
+    usage_tester: CommandTester, config: Config
+) -> None:
+    _create_artifact(config, "a" * 64, "foo-1.0.0-py3-none-any.whl", 2048, 3 * 86400)
+    _create_artifact(config, "b" * 64, "foo-1.0.0.tar.gz", 1024, 7200)
+    _create_artifact(config, "c" * 64, "bar-2.0.0-py3-none-any.whl", 512, 60)
+
+    assert usage_tester.execute("--packages") == 0
+
+    plans = Path(config.get("cache-dir")) / "bundle" / "plans"
+    expected = f"""\
+artifacts ({config.artifacts_cache_directory}): 3.5 KiB in entries: 3, least recently used 3 days ago
+  - foo: 3.0 KiB in entries: 2, last used 2 hours ago
+  - bar: 512 B in entries: 1, last used 1 minute ago
+plans ({plans}): 0 B in entries: 0
+"""
+    assert usage_tester.io.fetch_output() == expected
+
+
+def test_cache_evict_evicts_cold_entries_down_to_the_quota(
+    evict_tester: CommandTester, config: Config
+) -> None:
+    old = _create_artifact(config, "a" * 64, "foo-1.0.0.tar.gz", 2048, 3 * 86400)
+    cold = _create_artifact(config, "b" * 64, "foo-1.0.0-py3-none-any.whl", 2048, 7200)
+    hot = _create_artifact(config, "c" * 64, "bar-2.0.0-py3-none-any.whl", 2048, 60)
+
+    assert evict_tester.execute("size=1K --cache artifacts --dry-run") == 0
+    assert evict_tester.io.fetch_output() == (
+        "Entries to evict from the artifacts cache: 2 (4.0 KiB)\n"
+    )
+    assert old.exists()
+
+    assert evict_tester.execute("age=1d") == 0
+    assert evict_tester.io.fetch_output() == (
+        "Entries evicted from the artifacts cache: 1 (2.0 KiB)\n"
+        "Entries evicted from the plans cache: 0 (0 B)\n"
+    )
+    assert not old.exists()
+    assert cold.exists()
+    assert hot.exists()
+
+
+def test_cache_evict_rejects_invalid_quotas_and_caches(
+    evict_tester: CommandTester,
+) -> None:
+    assert evict_tester.execute("count=3") == 1
+    assert 'Invalid quota item "count=3"' in evict_tester.io.fetch_error()
+
+    assert evict_tester.execute("size=1G --cache wheels") == 1
+    assert 'The cache "wheels" does not exist' in evict_tester.io.fetch_error()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import sys
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle.daemon import BundleDaemon
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from cleo.testers.application_tester import ApplicationTester
+    from pytest_mock import MockerFixture
+
+
+# Unix socket paths are limited to 104 bytes on macOS, and Windows
+# has no Unix stream servers
+@pytest.mark.skipif(sys.platform != "linux", reason="requires Unix sockets")
+def test_daemon_listens_on_the_given_socket(
+    app_tester: ApplicationTester, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    init = mocker.spy(BundleDaemon, "__init__")
+    mocker.patch.object(
+        BundleDaemon,
+        "serve_forever",
+        side_effect=lambda on_ready: on_ready(),
+    )
+    socket_path = tmp_path / "daemon.sock"
+
+    assert app_tester.execute(f"bundle daemon --socket {socket_path} --max-jobs 8") == 0
+
+    init.assert_called_once_with(mocker.ANY, str(socket_path), 8)
+    assert (
+        f"Listening on {socket_path} (8 concurrent bundles)"
+        in app_tester.io.fetch_output()
+    )
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires Unix sockets")
+def test_daemon_requires_a_positive_number_of_jobs(
+    app_tester: ApplicationTester,
+) -> None:
+    assert app_tester.execute("bundle daemon --max-jobs 0") == 1
+    assert "The maximum number of jobs must be positive." in app_tester.io.fetch_error()
+
+
+def test_daemon_requires_unix_sockets(
+    app_tester: ApplicationTester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import socketserver
+
+    monkeypatch.delattr(socketserver, "ThreadingUnixStreamServer", raising=False)
+
+    assert app_tester.execute("bundle daemon") == 1
+    assert (
+        "Unix sockets are not supported on this platform."
+        in app_tester.io.fetch_error()
+    )
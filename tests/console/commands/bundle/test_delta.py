@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.delta import file_manifest
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from cleo.testers.application_tester import ApplicationTester
+
+
+def test_delta_and_apply_patch_a_bundle(
+    app_tester: ApplicationTester, tmp_path: Path
+) -> None:
+    old = tmp_path / "old"
+    (old / "lib").mkdir(parents=True)
+    (old / "lib" / "foo.py").write_text("VALUE = 1")
+    new = tmp_path / "new"
+    (new / "lib").mkdir(parents=True)
+    (new / "lib" / "foo.py").write_text("VALUE = 2")
+    (new / "lib" / "bar.py").write_text("")
+
+    manifest = tmp_path / "old.json"
+    delta = tmp_path / "delta.tar.xz"
+
+    assert app_tester.execute(f"bundle manifest {old} {manifest}") == 0
+    assert app_tester.execute(f"bundle delta {manifest} {new} {delta}") == 0
+    assert "1 added, 1 changed and 0 removed files" in app_tester.io.fetch_output()
+
+    assert app_tester.execute(f"bundle apply {delta} {old}") == 0
+    assert file_manifest(old) == file_manifest(new)
+
+    # The bundle does not match the base of the delta anymore
+    assert app_tester.execute(f"bundle apply {delta} {old}") == 1
+    assert "was created from" in app_tester.io.fetch_error()
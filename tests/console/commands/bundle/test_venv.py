@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import pytest
+
 from poetry.console.application import Application
 
 from poetry_plugin_bundle.bundlers.venv_bundler import VenvBundler
@@ -81,3 +83,552 @@ def test_venv_calls_venv_bundler(
         mocker.call(mocker.ANY, False),
         mocker.call(mocker.ANY, True),
     ]
+
+
+def test_venv_passes_sourceless_options(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_sourceless = mocker.spy(VenvBundler, "set_sourceless")
+    set_keep_sources = mocker.spy(VenvBundler, "set_keep_sources")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert (
+        app_tester.execute(
+            "bundle venv /foo --sourceless --keep-sources foo --keep-sources bar"
+        )
+        == 0
+    )
+
+    assert set_sourceless.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+    assert set_keep_sources.call_args_list == [
+        mocker.call(mocker.ANY, []),
+        mocker.call(mocker.ANY, ["foo", "bar"]),
+    ]
+
+
+def test_venv_passes_cache_plan_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_cache_plan = mocker.spy(VenvBundler, "set_cache_plan")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --cache-plan") == 0
+
+    assert set_cache_plan.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+def test_venv_passes_metrics_file_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_metrics_file = mocker.spy(VenvBundler, "set_metrics_file")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --metrics-file /bundle.prom") == 0
+
+    assert set_metrics_file.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, Path("/bundle.prom")),
+    ]
+
+
+def test_venv_watch_rebundles_on_changes(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    bundle = mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_only_root = mocker.spy(VenvBundler, "set_only_root")
+
+    assert isinstance(app_tester.application, Application)
+    project_directory = app_tester.application.poetry.file.path.parent
+    mocker.patch(
+        "poetry_plugin_bundle.utils.watcher.ProjectWatcher.wait",
+        side_effect=[
+            {project_directory / "simple_project" / "__init__.py"},
+            {project_directory / "README.md"},
+            {project_directory / "poetry.lock"},
+            KeyboardInterrupt(),
+        ],
+    )
+    set_clone_source = mocker.spy(VenvBundler, "set_clone_source")
+    bundles_when_watched = []
+
+    def snapshot() -> dict[Path, tuple[int, int]]:
+        bundles_when_watched.append(bundle.call_count)
+        return {}
+
+    mocker.patch(
+        "poetry_plugin_bundle.utils.watcher.ProjectWatcher.snapshot",
+        side_effect=snapshot,
+    )
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo --watch --from /bar") == 0
+
+    # Changes made while the project is first bundled are not missed
+    assert bundles_when_watched == [0]
+    assert bundle.call_count == 3
+    assert set_only_root.call_args_list == [
+        mocker.call(mocker.ANY, True),
+        mocker.call(mocker.ANY, False),
+    ]
+    # Only the first bundle is cloned
+    assert [call.args[1] for call in set_clone_source.call_args_list] == [
+        Path("/bar"),
+        Path("/bar"),
+        None,
+        Path("/bar"),
+        None,
+    ]
+
+
+def test_venv_watch_survives_invalid_project_changes(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    from poetry.core.pyproject.exceptions import PyProjectError
+
+    bundle = mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        side_effect=[True, False, True],
+    )
+    set_only_root = mocker.spy(VenvBundler, "set_only_root")
+
+    assert isinstance(app_tester.application, Application)
+    application = app_tester.application
+    project_directory = application.poetry.file.path.parent
+    mocker.patch(
+        "poetry_plugin_bundle.utils.watcher.ProjectWatcher.wait",
+        side_effect=[
+            # An invalid pyproject.toml, then a failed bundle once fixed
+            {project_directory / "pyproject.toml"},
+            {project_directory / "pyproject.toml"},
+            # Dependencies are still synchronized after the failed bundle
+            {project_directory / "simple_project" / "__init__.py"},
+            KeyboardInterrupt(),
+        ],
+    )
+    mocker.patch(
+        "poetry_plugin_bundle.utils.watcher.ProjectWatcher.snapshot",
+        return_value={},
+    )
+    reset_poetry = application.reset_poetry
+    resets = []
+
+    def reset() -> None:
+        resets.append(True)
+        if len(resets) == 1:
+            raise PyProjectError("Invalid TOML file")
+        reset_poetry()
+
+    mocker.patch.object(application, "reset_poetry", side_effect=reset)
+
+    application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo --watch") == 0
+
+    assert bundle.call_count == 3
+    assert set_only_root.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, False),
+    ]
+    error = app_tester.io.fetch_error()
+    assert "Invalid TOML file" in error
+    assert error.count("The bundle could not be updated") == 2
+
+
+def test_venv_passes_install_engine_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_install_engine = mocker.spy(VenvBundler, "set_install_engine")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --install-engine direct") == 0
+
+    assert set_install_engine.call_args_list == [
+        mocker.call(mocker.ANY, "poetry"),
+        mocker.call(mocker.ANY, "direct"),
+    ]
+
+
+def test_venv_passes_clone_source_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_clone_source = mocker.spy(VenvBundler, "set_clone_source")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --from /bar") == 0
+
+    assert set_clone_source.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, Path("/bar")),
+    ]
+
+
+def test_venv_passes_atomic_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_atomic = mocker.spy(VenvBundler, "set_atomic")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --atomic") == 0
+
+    assert set_atomic.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+def test_venv_passes_pipeline_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_pipeline = mocker.spy(VenvBundler, "set_pipeline")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --pipeline") == 0
+
+    assert set_pipeline.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+def test_venv_passes_lazy_options(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_lazy = mocker.spy(VenvBundler, "set_lazy")
+    set_lazy_wheelhouse = mocker.spy(VenvBundler, "set_lazy_wheelhouse")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert (
+        app_tester.execute(
+            "bundle venv /foo --lazy torch --lazy scipy --lazy-wheelhouse /wheels"
+        )
+        == 0
+    )
+
+    assert set_lazy.call_args_list == [
+        mocker.call(mocker.ANY, []),
+        mocker.call(mocker.ANY, ["torch", "scipy"]),
+    ]
+    assert set_lazy_wheelhouse.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, Path("/wheels")),
+    ]
+
+
+def test_venv_passes_jobs_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_jobs = mocker.spy(VenvBundler, "set_jobs")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --jobs auto,download=16") == 0
+
+    assert set_jobs.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, "auto,download=16"),
+    ]
+
+
+def test_venv_passes_memory_limit_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_memory_limit = mocker.spy(VenvBundler, "set_memory_limit")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --memory-limit 512M") == 0
+
+    assert set_memory_limit.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, "512M"),
+    ]
+
+
+def test_venv_passes_cache_quota_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_cache_quota = mocker.spy(VenvBundler, "set_cache_quota")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --cache-quota size=10G,age=30d") == 0
+
+    assert set_cache_quota.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, "size=10G,age=30d"),
+    ]
+
+
+def test_venv_passes_readahead_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_readahead = mocker.spy(VenvBundler, "set_readahead")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --readahead") == 0
+
+    assert set_readahead.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+def test_venv_passes_target_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_target = mocker.spy(VenvBundler, "set_target")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert (
+        app_tester.execute(
+            "bundle venv /foo --target platform=manylinux_2_28_aarch64,python=3.11"
+        )
+        == 0
+    )
+
+    assert set_target.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, "platform=manylinux_2_28_aarch64,python=3.11"),
+    ]
+
+
+def test_venv_passes_reproducible_options(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_reproducible = mocker.spy(VenvBundler, "set_reproducible")
+    set_verify_reproducible = mocker.spy(VenvBundler, "set_verify_reproducible")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --reproducible") == 0
+    assert app_tester.execute("bundle venv /foo --verify-reproducible") == 0
+
+    assert set_reproducible.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+        mocker.call(mocker.ANY, False),
+    ]
+    assert set_verify_reproducible.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+def test_venv_passes_prune_options(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_find_unreachable = mocker.spy(VenvBundler, "set_find_unreachable")
+    set_prune_unreachable = mocker.spy(VenvBundler, "set_prune_unreachable")
+    set_prune_keep = mocker.spy(VenvBundler, "set_prune_keep")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo --find-unreachable") == 0
+    assert (
+        app_tester.execute(
+            "bundle venv /foo --prune-unreachable --prune-keep foo --prune-keep bar"
+        )
+        == 0
+    )
+
+    assert set_find_unreachable.call_args_list == [
+        mocker.call(mocker.ANY, True),
+        mocker.call(mocker.ANY, False),
+    ]
+    assert set_prune_unreachable.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+    assert set_prune_keep.call_args_list == [
+        mocker.call(mocker.ANY, []),
+        mocker.call(mocker.ANY, ["foo", "bar"]),
+    ]
+
+
+def test_venv_passes_base_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_base = mocker.spy(VenvBundler, "set_base")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --base /base") == 0
+
+    assert set_base.call_args_list == [
+        mocker.call(mocker.ANY, None),
+        mocker.call(mocker.ANY, Path("/base")),
+    ]
+
+
+def test_venv_passes_module_index_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_module_index = mocker.spy(VenvBundler, "set_module_index")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --module-index") == 0
+
+    assert set_module_index.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+def test_venv_passes_optimize_pth_option(
+    app_tester: ApplicationTester, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    set_optimize_pth = mocker.spy(VenvBundler, "set_optimize_pth")
+
+    app_tester.application.catch_exceptions(False)
+    assert app_tester.execute("bundle venv /foo") == 0
+    assert app_tester.execute("bundle venv /foo --optimize-pth") == 0
+
+    assert set_optimize_pth.call_args_list == [
+        mocker.call(mocker.ANY, False),
+        mocker.call(mocker.ANY, True),
+    ]
+
+
+@pytest.mark.parametrize("profiler", ["deterministic", "sampling"])
+def test_venv_profiles_the_command(
+    app_tester: ApplicationTester,
+    mocker: MockerFixture,
+    tmp_path: Path,
+    profiler: str,
+) -> None:
+    mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+    output = tmp_path / "bundle.prof"
+
+    assert (
+        app_tester.execute(f"bundle venv /foo --profile {output} --profiler {profiler}")
+        == 0
+    )
+
+    assert output.exists()
+    assert (tmp_path / "bundle.collapsed").exists()
+    assert (
+        f"  - Profile written to {output}, with collapsed stacks in"
+        f" {tmp_path / 'bundle.collapsed'}\n"
+    ) in app_tester.io.fetch_output()
+
+
+def test_venv_rejects_unknown_profilers(app_tester: ApplicationTester) -> None:
+    assert app_tester.execute("bundle venv /foo --profile out --profiler perf") == 1
+    assert 'The profiler "perf" does not exist' in app_tester.io.fetch_error()
+
+
+@pytest.mark.parametrize(
+    ("options", "error"),
+    [
+        ("--install-engine pip", 'The install engine "pip" does not exist.'),
+        ("--jobs 0", 'Invalid number of jobs "0"'),
+        ("--target python=3.11", "The target must have a platform"),
+        ("--memory-limit lots", 'Invalid size "lots"'),
+        ("--cache-quota size=10G,count=3", 'Invalid quota item "count=3"'),
+    ],
+)
+def test_venv_rejects_invalid_option_values(
+    app_tester: ApplicationTester, mocker: MockerFixture, options: str, error: str
+) -> None:
+    bundle = mocker.patch(
+        "poetry_plugin_bundle.bundlers.venv_bundler.VenvBundler.bundle",
+        return_value=True,
+    )
+
+    assert app_tester.execute(f"bundle venv /foo {options}") == 1
+    assert error in app_tester.io.fetch_error()
+    bundle.assert_not_called()
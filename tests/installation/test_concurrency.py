@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from poetry_plugin_bundle.installation.concurrency import AdaptiveLimit
+from poetry_plugin_bundle.installation.concurrency import ConcurrencyLimiter
+from poetry_plugin_bundle.installation.concurrency import JobControl
+from poetry_plugin_bundle.installation.concurrency import JobLimits
+from poetry_plugin_bundle.utils.memory import MemoryBudget
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("4", JobLimits(4, 4, 4)),
+        ("auto", JobLimits(adaptive=True)),
+        ("download=16, install=2", JobLimits(download=16, install=2)),
+        ("8,build=1", JobLimits(8, 1, 8)),
+        ("auto,download=16", JobLimits(download=16, adaptive=True)),
+    ],
+)
+def test_job_limits_parse(value: str, expected: JobLimits) -> None:
+    assert JobLimits.parse(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("0", 'Invalid number of jobs "0"'),
+        ("many", 'Invalid number of jobs "many"'),
+        ("download=", 'Invalid number of jobs ""'),
+        ("compile=2", 'The pool "compile" does not exist'),
+    ],
+)
+def test_job_limits_parse_rejects_invalid_values(value: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        JobLimits.parse(value)
+
+
+def test_limiter_records_achieved_parallelism() -> None:
+    clock = Clock()
+    limiter = ConcurrencyLimiter("install", 2, clock=clock)
+
+    with limiter.slot():
+        clock.now = 1.0
+        with limiter.slot():
+            clock.now = 2.0
+        clock.now = 3.0
+
+    # Idle time does not count
+    clock.now = 10.0
+    with limiter.slot():
+        clock.now = 11.0
+
+    assert limiter.jobs == 3
+    assert limiter.peak == 2
+    # 1 job for 3 seconds, plus 2 jobs for 1 second, over 4 busy seconds
+    assert limiter.mean == pytest.approx(1.25)
+
+
+def test_adaptive_limit_grows_while_throughput_improves() -> None:
+    adaptive = AdaptiveLimit(1, maximum=3)
+    adaptive.start(0.0)
+
+    # 1 unit per second with one job, then 2 with two jobs
+    assert adaptive.record(1, 1.0, 1.0) == 2
+    assert adaptive.record(2, 1.0, 1.5) == 2
+    assert adaptive.record(2, 1.0, 2.0) == 3
+    # Throughput no longer improves
+    assert adaptive.record(2, 1.0, 2.5) == 3
+    assert adaptive.record(1, 1.0, 2.5) == 3
+    assert adaptive.record(1, 1.0, 3.0) == 3
+    # The maximum is never exceeded
+    for now in (3.1, 3.2, 3.3):
+        limit = adaptive.record(100, 0.1, now)
+
+    assert limit == 3
+
+
+def test_adaptive_limit_shrinks_when_latency_rises() -> None:
+    adaptive = AdaptiveLimit(2, maximum=8)
+    adaptive.start(0.0)
+
+    assert adaptive.record(10, 1.0, 1.0) == 2
+    assert adaptive.record(10, 1.0, 1.0) == 3
+    # Same throughput, but each job is much slower: the disk is saturated
+    for now in (1.5, 2.0, 2.5):
+        limit = adaptive.record(10, 5.0, now)
+
+    assert limit == 2
+
+
+def test_job_control_sizes_pools() -> None:
+    jobs = JobControl(JobLimits(download=8), default=4, cpu_count=2)
+
+    assert [limiter.limit for limiter in jobs.limiters()] == [8, 4, 4]
+    assert jobs.max_jobs == 8
+    assert not jobs.adaptive
+
+
+def test_adaptive_job_control_bounds_pools_by_cpu_count() -> None:
+    jobs = JobControl(JobLimits(build=4, adaptive=True), default=2, cpu_count=2)
+
+    assert [limiter.limit for limiter in jobs.limiters()] == [2, 4, 2]
+    # Up to 4 downloads per CPU
+    assert jobs.max_jobs == 8
+    assert jobs.adaptive
+
+
+def test_limiter_holds_jobs_back_while_memory_is_exceeded() -> None:
+    budget = MemoryBudget(1000, rss=lambda: 900)
+    limiter = ConcurrencyLimiter("install", 4, memory=budget)
+    started = threading.Event()
+
+    def job() -> None:
+        with limiter.slot():
+            started.set()
+
+    with limiter.slot():
+        thread = threading.Thread(target=job)
+        thread.start()
+
+        # The second job waits for the first one to complete
+        assert not started.wait(0.1)
+
+    thread.join()
+
+    assert started.is_set()
+    assert limiter.peak == 1
+    assert limiter.held_back == 1
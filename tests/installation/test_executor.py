@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cleo.io.buffered_io import BufferedIO
+from poetry.core.packages.package import Package
+from poetry.core.packages.utils.link import Link
+from poetry.installation.operations.install import Install
+from poetry.installation.operations.uninstall import Uninstall
+from poetry.repositories.repository_pool import RepositoryPool
+from poetry.utils.env import MockEnv
+
+from poetry_plugin_bundle.installation.executor import BundleExecutor
+
+
+if TYPE_CHECKING:
+    from poetry.config.config import Config
+    from poetry.installation.operations.operation import Operation
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture()
+def executor(config: Config, tmp_path: Path) -> BundleExecutor:
+    env = MockEnv(path=tmp_path / "venv")
+
+    return BundleExecutor(env, RepositoryPool(), config, BufferedIO())
+
+
+def test_executor_records_executed_operations(
+    executor: BundleExecutor, mocker: MockerFixture
+) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    operations = [
+        Install(Package("foo", "1.0.0")),
+        Uninstall(Package("bar", "1.0.0")),
+    ]
+
+    assert executor.execute(operations) == 0
+    assert executor.executed_operations == operations
+
+
+def test_executor_installs_wheels_directly(
+    executor: BundleExecutor, mocker: MockerFixture
+) -> None:
+    execute_operation = mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation"
+    )
+    links = {
+        "foo": Link("https://example.com/foo-1.0.0-py3-none-any.whl"),
+        "baz": Link("https://example.com/baz-1.0.0.tar.gz"),
+    }
+    mocker.patch.object(
+        executor._chooser,
+        "choose_for",
+        side_effect=lambda package: links[package.name],
+    )
+    mocker.patch.object(
+        executor,
+        "_download_link",
+        side_effect=lambda operation, link: Path(link.filename),
+    )
+    install = mocker.patch.object(executor._wheel_installer, "install")
+
+    foo = Install(Package("foo", "1.0.0"))
+    bar = Install(
+        Package(
+            "bar",
+            "1.0.0",
+            source_type="git",
+            source_url="https://example.com/bar.git",
+        )
+    )
+    baz = Install(Package("baz", "1.0.0"))
+    executor.enable_direct_installation()
+
+    assert executor.execute([foo, bar, baz]) == 0
+
+    install.assert_called_once_with(Path("foo-1.0.0-py3-none-any.whl"))
+    delegated = [call.args[0] for call in execute_operation.call_args_list]
+    assert sorted(delegated, key=lambda operation: operation.package.name) == [
+        bar,
+        baz,
+    ]
+
+
+def test_executor_reports_direct_installation_failures(
+    executor: BundleExecutor, mocker: MockerFixture
+) -> None:
+    execute_operation = mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation"
+    )
+    mocker.patch.object(
+        executor._chooser,
+        "choose_for",
+        return_value=Link("https://example.com/foo-1.0.0-py3-none-any.whl"),
+    )
+    mocker.patch.object(
+        executor, "_download_link", side_effect=RuntimeError("Hash mismatch")
+    )
+    executor.enable_direct_installation()
+
+    assert executor.execute([Install(Package("foo", "1.0.0"))]) == 1
+
+    execute_operation.assert_not_called()
+    assert isinstance(executor._io, BufferedIO)
+    assert "Hash mismatch" in executor._io.fetch_error()
+
+
+def test_executor_waits_for_prefetched_artifacts(
+    executor: BundleExecutor, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    pipeline = mocker.Mock(downloaded={})
+    pipeline.pop_download.return_value = None
+    executor.set_pipeline(pipeline)
+    download_link = mocker.patch(
+        "poetry.installation.executor.Executor._download_link",
+        return_value=tmp_path / "foo-1.0.0-py3-none-any.whl",
+    )
+    operation = Install(Package("foo", "1.0.0"))
+    link = Link("https://example.com/foo-1.0.0-py3-none-any.whl")
+
+    assert executor._download_link(operation, link) == download_link.return_value
+
+    pipeline.wait_for.assert_called_once_with(operation.package)
+    download_link.assert_called_once_with(operation, link)
+    assert executor.cache_hits == 1
+
+
+def test_executor_counts_prefetched_artifacts_as_downloaded(
+    executor: BundleExecutor, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    from poetry_plugin_bundle.installation.pipeline import Pipeline
+
+    def download_archive(operation: Install, url: str, dest: Path) -> None:
+        dest.write_bytes(b"x" * len(operation.package.name) * 10)
+
+    mocker.patch(
+        "poetry.installation.executor.Executor._download_archive",
+        side_effect=download_archive,
+    )
+    pipeline = Pipeline()
+    prefetcher = BundleExecutor(
+        executor._env, RepositoryPool(), executor._config, BufferedIO()
+    )
+    for name in ["foo", "bar"]:
+        pipeline._download_archive(
+            prefetcher,
+            Install(Package(name, "1.0.0")),
+            f"https://example.com/{name}-1.0.0-py3-none-any.whl",
+            tmp_path / f"{name}-1.0.0-py3-none-any.whl",
+        )
+    executor.set_pipeline(pipeline)
+    mocker.patch(
+        "poetry.installation.executor.Executor._download_link",
+        return_value=tmp_path / "foo-1.0.0-py3-none-any.whl",
+    )
+    link = Link("https://example.com/foo-1.0.0-py3-none-any.whl")
+
+    executor._download_link(Install(Package("foo", "1.0.0")), link)
+    executor._download_link(Install(Package("baz", "1.0.0")), link)
+    pipeline.close()
+
+    # The artifact of bar was prefetched, but not used
+    assert executor.cache_hits == 1
+    assert executor.cache_misses == 2
+    assert executor.downloaded_bytes == 60
+
+
+def test_executor_runs_stages_in_their_own_pools(
+    executor: BundleExecutor, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    from poetry_plugin_bundle.installation.concurrency import JobControl
+    from poetry_plugin_bundle.installation.concurrency import JobLimits
+
+    jobs = JobControl(JobLimits(download=6, build=1, install=2), default=4)
+    executor.set_jobs(jobs)
+
+    assert executor._max_workers == 6
+    assert executor._executor._max_workers == 6
+    assert executor._chef.limiter is jobs.build
+    assert executor._wheel_installer.limiter is jobs.install
+
+    def download(operation: Install, url: str, dest: Path) -> None:
+        dest.write_bytes(b"wheel")
+
+    mocker.patch(
+        "poetry.installation.executor.Executor._download_archive",
+        side_effect=download,
+    )
+    executor._download_archive(
+        Install(Package("foo", "1.0.0")),
+        "https://example.com/foo-1.0.0-py3-none-any.whl",
+        tmp_path / "foo-1.0.0-py3-none-any.whl",
+    )
+
+    assert jobs.download.jobs == 1
+    assert jobs.download.peak == 1
+
+
+def test_executor_requires_wheels(
+    executor: BundleExecutor, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    execute_operation = mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation"
+    )
+    links = {
+        "foo": Link("https://example.com/foo-1.0.0-py3-none-any.whl"),
+        "baz": Link("https://example.com/baz-1.0.0.tar.gz"),
+    }
+    mocker.patch.object(
+        executor._chooser,
+        "choose_for",
+        side_effect=lambda package: links[package.name],
+    )
+    install = mocker.patch.object(executor._wheel_installer, "install")
+    bar = Package(
+        "bar",
+        "1.0.0",
+        source_type="git",
+        source_url="https://example.com/bar.git",
+        source_reference="abcdef",
+    )
+    executor.require_wheels()
+
+    operations: list[Operation] = [
+        Install(Package("foo", "1.0.0")),
+        Install(bar),
+        Install(Package("baz", "1.0.0")),
+    ]
+    assert executor.execute(operations) == 1
+
+    # Nothing is installed unless every package has a wheel
+    install.assert_not_called()
+    execute_operation.assert_not_called()
+    assert executor.wheel_errors == [
+        (
+            "<c1>bar</c1> (<c2>1.0.0 abcdef</c2>) is a git dependency,"
+            " which cannot be built for the environment"
+        ),
+        (
+            "No wheel of <c1>baz</c1> (<c2>1.0.0</c2>) matches the environment,"
+            " only a source distribution is available"
+        ),
+    ]
+
+
+def test_executor_installs_and_removes_wheels_only(
+    executor: BundleExecutor, mocker: MockerFixture, tmp_path: Path
+) -> None:
+    site_packages = Path(executor._env.paths["purelib"])
+    dist_info = site_packages / "bar-1.0.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (site_packages / "bar.py").write_text("")
+    (dist_info / "RECORD").write_text(
+        "bar.py,,\nbar-1.0.0.dist-info/RECORD,,\n", encoding="utf-8"
+    )
+    execute_operation = mocker.patch(
+        "poetry.installation.executor.Executor._execute_operation"
+    )
+    install = mocker.patch.object(executor._wheel_installer, "install")
+    wheel = tmp_path / "foo-1.0.0-py3-none-any.whl"
+    foo = Package("foo", "1.0.0", source_type="file", source_url=str(wheel))
+    executor.require_wheels()
+
+    assert executor.execute([Install(foo), Uninstall(Package("bar", "1.0.0"))]) == 0
+
+    install.assert_called_once_with(wheel)
+    execute_operation.assert_not_called()
+    assert not (site_packages / "bar.py").exists()
+    assert not dist_info.exists()
+
+
+def test_executor_counts_artifact_cache_hits_and_misses(
+    executor: BundleExecutor, mocker: MockerFixture
+) -> None:
+    def download_archive(
+        self: BundleExecutor, operation: Operation, url: str, dest: Path
+    ) -> None:
+        dest.write_bytes(b"wheel")
+
+    mocker.patch(
+        "poetry.installation.executor.Executor._download_archive", download_archive
+    )
+    link = Link("https://example.com/foo-1.0.0-py3-none-any.whl")
+
+    executor._download_link(Install(Package("foo", "1.0.0")), link)
+    executor._download_link(Install(Package("foo", "1.0.0")), link)
+
+    assert executor.cache_misses == 1
+    assert executor.cache_hits == 1
+    assert executor.downloaded_bytes == 5
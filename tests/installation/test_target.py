@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from poetry_plugin_bundle.installation.target import TargetEnv
+from poetry_plugin_bundle.installation.target import TargetError
+from poetry_plugin_bundle.installation.target import TargetSpec
+from poetry_plugin_bundle.installation.target import read_target
+from poetry_plugin_bundle.installation.target import uses_full_version
+
+
+def test_parse_target() -> None:
+    target = TargetSpec.parse(
+        "platform=manylinux_2_28_aarch64, platform=musllinux_1_2_aarch64,python=3.11"
+    )
+
+    assert target == TargetSpec(
+        ("manylinux_2_28_aarch64", "musllinux_1_2_aarch64"),
+        (3, 11, 0),
+        "cp311",
+        full_version=False,
+    )
+    assert target.version == "3.11"
+    assert TargetSpec.parse(str(target)) == target
+    assert TargetSpec.parse("platform=linux_x86_64,python=3.11.0").full_version
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("platform=linux_x86_64", "must have a platform and a Python version"),
+        ("platform=linux_x86_64,python=3", 'Invalid Python version "3"'),
+        ("platform=linux_x86_64,python=3.11,os=linux", 'The target key "os"'),
+        ("platform=linux_x86_64,python=3.11,python=3.12", "given multiple times"),
+        ("platform=linux_x86_64,python", 'Invalid target item "python"'),
+        ("platform=any,python=3.11", 'The platform "any" is not supported'),
+        ("platform=linux_x86_64,python=3.10,implementation=pp", "must have an ABI"),
+    ],
+)
+def test_parse_invalid_target(value: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        TargetSpec.parse(value)
+
+
+def test_target_markers() -> None:
+    linux = TargetSpec.parse("platform=manylinux_2_17_aarch64,python=3.11.9")
+    windows = TargetSpec.parse("platform=win_amd64,python=3.12.1")
+    macos = TargetSpec.parse("platform=macosx_11_0_arm64,python=3.12.1")
+
+    assert linux.marker_env() == {
+        "implementation_name": "cpython",
+        "implementation_version": "3.11.9",
+        "os_name": "posix",
+        "platform_machine": "aarch64",
+        "platform_release": "",
+        "platform_system": "Linux",
+        "platform_version": "",
+        "python_full_version": "3.11.9",
+        "platform_python_implementation": "CPython",
+        "python_version": "3.11",
+        "sys_platform": "linux",
+        "version_info": (3, 11, 9, "final", 0),
+        "interpreter_name": "cp",
+        "interpreter_version": "311",
+    }
+    assert windows.marker_env()["sys_platform"] == "win32"
+    assert windows.marker_env()["os_name"] == "nt"
+    assert windows.script_kind == "win-amd64"
+    assert macos.marker_env()["sys_platform"] == "darwin"
+    assert macos.marker_env()["platform_machine"] == "arm64"
+
+
+def test_target_supported_tags() -> None:
+    target = TargetSpec.parse("platform=manylinux_2_28_aarch64,python=3.11")
+    tags = [str(tag) for tag in target.supported_tags()]
+
+    assert tags[0] == "cp311-cp311-manylinux_2_28_aarch64"
+    assert "cp311-cp311-manylinux2014_aarch64" in tags
+    assert "cp311-abi3-manylinux_2_17_aarch64" in tags
+    assert "cp38-abi3-linux_aarch64" in tags
+    assert "py3-none-any" in tags
+    assert "cp311-cp311-manylinux_2_29_aarch64" not in tags
+    assert not any(tag.endswith("x86_64") for tag in tags)
+    assert not any("musllinux" in tag for tag in tags)
+
+
+def test_create_target_env(tmp_path: Path) -> None:
+    path = tmp_path / "bundle"
+    target = TargetSpec.parse("platform=linux_x86_64,python=3.12.1,home=/opt/bin")
+
+    env = TargetEnv.create(path, target)
+
+    assert env.paths["purelib"] == str(path / "lib" / "python3.12" / "site-packages")
+    assert Path(env.paths["purelib"]).is_dir()
+    assert env.python == path / "bin" / "python"
+    assert (path / "bin" / "python").readlink() == Path("python3.12")
+    assert (path / "bin" / "python3.12").readlink() == Path("/opt/bin/python3.12")
+    assert read_target(path) == str(target)
+
+    with pytest.raises(TargetError, match="cannot be run"):
+        env.run_python_script("print(1)")
+
+    # The environment is reused for the same target only
+    TargetEnv.create(path, target)
+    other = TargetSpec.parse("platform=linux_x86_64,python=3.11")
+    with pytest.raises(TargetError, match="not a virtual environment for the same"):
+        TargetEnv.create(path, other)
+
+    assert TargetEnv.create(path, other, clear=True).target == other
+    assert not (path / "bin" / "python").exists()
+    # The micro version is not made up
+    assert "version = 3.11\n" in (path / "pyvenv.cfg").read_text()
+
+
+def test_create_windows_target_env(tmp_path: Path) -> None:
+    target = TargetSpec.parse("platform=win_amd64,python=3.12")
+
+    env = TargetEnv.create(tmp_path / "bundle", target)
+
+    assert env.paths["purelib"] == str(tmp_path / "bundle" / "Lib" / "site-packages")
+    assert env.paths["scripts"] == str(tmp_path / "bundle" / "Scripts")
+    assert env.python == tmp_path / "bundle" / "Scripts" / "python.exe"
+
+
+def test_create_target_env_in_a_directory(tmp_path: Path) -> None:
+    target = TargetSpec.parse("platform=linux_x86_64,python=3.12")
+    (tmp_path / "file").write_text("")
+
+    with pytest.raises(TargetError, match="is not empty"):
+        TargetEnv.create(tmp_path, target)
+
+
+def test_uses_full_version() -> None:
+    assert uses_full_version(
+        {"package": [{"name": "foo", "markers": 'python_full_version >= "3.11.4"'}]}
+    )
+    assert uses_full_version(
+        [{"dependencies": {"bar": ['implementation_version > "3"']}}]
+    )
+    assert not uses_full_version({"package": [{"markers": 'python_version >= "3.11"'}]})
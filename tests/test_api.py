@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle import api
+from poetry_plugin_bundle.api import BundleJob
+from poetry_plugin_bundle.api import BundleOptions
+from poetry_plugin_bundle.api import bundle
+from poetry_plugin_bundle.api import bundle_many
+
+
+if TYPE_CHECKING:
+    from poetry.config.config import Config
+    from pytest_mock import MockerFixture
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(autouse=True)
+def projects(config: Config, mocker: MockerFixture) -> None:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    mocker.patch.object(api, "_projects", {})
+
+
+def test_bundle_returns_a_structured_result(tmp_path: Path) -> None:
+    path = tmp_path / "bundle"
+
+    result = bundle(FIXTURES / "simple_project", path, BundleOptions(compile=True))
+
+    assert result.success
+    assert result.error is None
+    assert result.path == path
+    # The locked dependency and the root package
+    assert result.operations == {"install": 2}
+    assert set(result.phases) == {"environment", "dependencies", "root"}
+    assert result.duration >= sum(result.phases.values())
+    assert result.warnings == []
+    assert result.output.endswith(f"\n  • Bundled simple-project (1.2.3) into {path}\n")
+
+
+def test_bundle_reports_warnings(tmp_path: Path) -> None:
+    result = bundle(FIXTURES / "simple_project_with_no_module", tmp_path / "bundle")
+
+    assert result.success
+    assert result.warnings == [
+        (
+            "The root package was not installed because no matching module or"
+            " package was found."
+        )
+    ]
+
+
+def test_bundle_reuses_loaded_projects(tmp_path: Path, mocker: MockerFixture) -> None:
+    from poetry.factory import Factory
+
+    create_poetry = mocker.spy(Factory, "create_poetry")
+
+    bundle(FIXTURES / "simple_project", tmp_path / "first")
+    bundle(FIXTURES / "simple_project", tmp_path / "second")
+
+    assert create_poetry.call_count == 1
+
+
+def test_bundle_reloads_projects_when_the_configuration_changes(
+    tmp_path: Path, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from poetry.factory import Factory
+
+    create_poetry = mocker.spy(Factory, "create_poetry")
+
+    bundle(FIXTURES / "simple_project", tmp_path / "first")
+    monkeypatch.setenv("POETRY_INSTALLER_MAX_WORKERS", "2")
+    bundle(FIXTURES / "simple_project", tmp_path / "second")
+
+    assert create_poetry.call_count == 2
+
+
+def test_bundle_records_the_default_groups(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    from poetry_plugin_bundle.bundlers.venv_bundler import VenvBundler
+
+    mocker.patch.object(VenvBundler, "bundle", return_value=True)
+    set_activated_groups = mocker.spy(VenvBundler, "set_activated_groups")
+
+    bundle(FIXTURES / "simple_project_with_dev_dep", tmp_path / "bundle")
+
+    assert set_activated_groups.call_args_list == [
+        mocker.call(mocker.ANY, {"main", "dev"})
+    ]
+
+
+def test_bundle_runs_bundles_with_a_memory_limit_alone(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    import time
+
+    from poetry_plugin_bundle.bundlers.venv_bundler import VenvBundler
+
+    events: list[str] = []
+
+    def run(bundler: VenvBundler, *args: object) -> bool:
+        name = bundler._path.name
+        events.append(f"start {name}")
+        time.sleep(0.05)
+        events.append(f"end {name}")
+        return True
+
+    mocker.patch.object(VenvBundler, "bundle", autospec=True, side_effect=run)
+    # The peak memory of the process only describes a bundle running alone
+    options = [BundleOptions(), BundleOptions(memory_limit="1G"), BundleOptions()]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = []
+        for i, option in enumerate(options):
+            futures.append(
+                pool.submit(
+                    bundle, FIXTURES / "simple_project", tmp_path / str(i), option
+                )
+            )
+            time.sleep(0.01)
+
+    assert all(future.result().success for future in futures)
+    start = events.index("start 1")
+    assert events[start + 1] == "end 1"
+
+
+def test_bundle_many_runs_every_job(tmp_path: Path, mocker: MockerFixture) -> None:
+    # Mocks do not cross process boundaries
+    mocker.patch.object(api, "ProcessPoolExecutor", ThreadPoolExecutor)
+    jobs = [
+        BundleJob(FIXTURES / "simple_project", tmp_path / "first"),
+        BundleJob(
+            FIXTURES / "simple_project",
+            tmp_path / "second",
+            BundleOptions(install_engine="pip"),
+        ),
+    ]
+
+    first, second = bundle_many(jobs, max_workers=2)
+
+    assert first.success
+    assert first.path == tmp_path / "first"
+    assert not second.success
+    assert second.error == 'ValueError: The install engine "pip" does not exist.'
+
+
+def test_bundle_many_rejects_jobs_of_the_same_path(tmp_path: Path) -> None:
+    jobs = [
+        BundleJob(FIXTURES / "simple_project", tmp_path / "bundle"),
+        BundleJob(FIXTURES / "simple_project_with_dev_dep", tmp_path / "bundle"),
+    ]
+
+    with pytest.raises(ValueError, match="Several jobs bundle into"):
+        bundle_many(jobs)
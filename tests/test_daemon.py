@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import stat
+import sys
+import threading
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle import api
+from poetry_plugin_bundle.api import SharedLock
+from poetry_plugin_bundle.client import DaemonError
+from poetry_plugin_bundle.client import main
+from poetry_plugin_bundle.client import submit
+from poetry_plugin_bundle.daemon import BundleDaemon
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from poetry.config.config import Config
+    from pytest_mock import MockerFixture
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Unix socket paths are limited to 104 bytes on macOS, and Windows
+# has no Unix stream servers
+unix_sockets = pytest.mark.skipif(
+    sys.platform != "linux", reason="requires Unix sockets"
+)
+
+
+@pytest.fixture()
+def socket_path(tmp_path: Path) -> str:
+    return str(tmp_path / "daemon.sock")
+
+
+@pytest.fixture()
+def daemon(
+    config: Config, socket_path: str, mocker: MockerFixture
+) -> Iterator[BundleDaemon]:
+    mocker.patch("poetry.installation.executor.Executor._execute_operation")
+    mocker.patch.object(api, "_projects", {})
+
+    daemon = BundleDaemon(socket_path, max_jobs=2)
+    ready = threading.Event()
+    thread = threading.Thread(target=daemon.serve_forever, args=(ready.set,))
+    thread.start()
+    ready.wait(timeout=10)
+
+    yield daemon
+
+    daemon.shutdown()
+    thread.join()
+
+
+@unix_sockets
+def test_daemon_streams_output_and_result(
+    daemon: BundleDaemon, socket_path: str, tmp_path: Path
+) -> None:
+    path = tmp_path / "bundle"
+    lines: list[str] = []
+
+    result = submit(
+        socket_path,
+        str(FIXTURES / "simple_project"),
+        str(path),
+        {"compile": True},
+        on_output=lines.append,
+    )
+
+    assert result["success"]
+    assert result["path"] == str(path)
+    assert result["operations"] == {"install": 2}
+    assert lines[0] == f"  • Bundling simple-project (1.2.3) into {path}"
+    assert lines[-1] == f"  • Bundled simple-project (1.2.3) into {path}"
+
+
+@unix_sockets
+def test_daemon_only_lets_its_user_connect(
+    daemon: BundleDaemon, socket_path: str
+) -> None:
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+@unix_sockets
+def test_daemon_reuses_loaded_projects_and_lock_files(
+    daemon: BundleDaemon, socket_path: str, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    from poetry.factory import Factory
+
+    create_poetry = mocker.spy(Factory, "create_poetry")
+    parse = mocker.spy(api._lock_cache, "get")
+    project = str(FIXTURES / "simple_project")
+
+    assert submit(socket_path, project, str(tmp_path / "first"))["success"]
+    assert submit(socket_path, project, str(tmp_path / "second"))["success"]
+
+    assert create_poetry.call_count == 1
+    assert parse.call_count >= 2
+
+
+@unix_sockets
+def test_daemon_rejects_unknown_options(
+    daemon: BundleDaemon, socket_path: str, tmp_path: Path
+) -> None:
+    with pytest.raises(DaemonError, match="Invalid request: unknown options foo"):
+        submit(socket_path, "project", str(tmp_path), {"foo": True})
+
+
+@unix_sockets
+def test_client_fails_without_daemon(
+    socket_path: str, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert main(["--socket", socket_path, "project", str(tmp_path)]) == 1
+    assert "No bundle daemon is listening on" in capsys.readouterr().err
+
+
+def test_shared_lock_runs_exclusive_holders_alone() -> None:
+    lock = SharedLock()
+    events: list[str] = []
+
+    def hold(name: str, exclusive: bool) -> None:
+        with lock.hold(exclusive):
+            events.append(f"start {name}")
+            time.sleep(0.05)
+            events.append(f"end {name}")
+
+    threads = [
+        threading.Thread(target=hold, args=("shared-1", False)),
+        threading.Thread(target=hold, args=("exclusive", True)),
+        threading.Thread(target=hold, args=("shared-2", False)),
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    start = events.index("start exclusive")
+    assert events[start + 1] == "end exclusive"
+    assert events.index("end shared-1") < start
+    assert events.index("start shared-2") > start
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.atomic import bundle_lock
+from poetry_plugin_bundle.utils.atomic import current_bundle
+from poetry_plugin_bundle.utils.atomic import staging_path
+from poetry_plugin_bundle.utils.atomic import swap
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_swap_replaces_a_directory(tmp_path: Path) -> None:
+    path = tmp_path / "bundle"
+    path.mkdir()
+    (path / "old").touch()
+    staging = staging_path(path)
+    staging.mkdir()
+    (staging / "new").touch()
+
+    previous = swap(staging, path)
+
+    assert (path / "new").exists()
+    assert len(previous) == 1
+    assert (previous[0] / "old").exists()
+
+
+def test_swap_renames_to_a_missing_path(tmp_path: Path) -> None:
+    path = tmp_path / "bundle"
+    staging = staging_path(path)
+    staging.mkdir()
+    (staging / "new").touch()
+
+    assert swap(staging, path) == []
+    assert (path / "new").exists()
+    assert not staging.exists()
+
+
+def test_swap_flips_a_symlink_and_keeps_the_previous_bundle(tmp_path: Path) -> None:
+    path = tmp_path / "bundle"
+    oldest = staging_path(path)
+    oldest.mkdir()
+    previous = staging_path(path)
+    previous.mkdir()
+    os.symlink(previous.name, path)
+    staging = staging_path(path)
+    staging.mkdir()
+    (staging / "new").touch()
+
+    assert swap(staging, path) == [oldest]
+    assert os.readlink(path) == staging.name
+    assert current_bundle(path) == staging.resolve()
+    assert (path / "new").exists()
+
+
+def test_swap_keeps_the_previous_bundle_through_a_symlinked_parent(
+    tmp_path: Path,
+) -> None:
+    real = tmp_path / "real"
+    real.mkdir()
+    parent = tmp_path / "parent"
+    os.symlink(real, parent)
+
+    path = parent / "bundle"
+    previous = staging_path(path)
+    previous.mkdir()
+    os.symlink(previous.name, path)
+    staging = staging_path(path)
+    staging.mkdir()
+
+    assert swap(staging, path) == []
+    assert previous.exists()
+
+
+def test_bundle_lock_excludes_concurrent_holders(tmp_path: Path) -> None:
+    path = tmp_path / "bundle"
+    waited = threading.Event()
+    acquired = threading.Event()
+
+    def other() -> None:
+        with bundle_lock(path, on_wait=waited.set):
+            acquired.set()
+
+    with bundle_lock(path):
+        thread = threading.Thread(target=other)
+        thread.start()
+        assert waited.wait(5)
+        assert not acquired.is_set()
+
+    thread.join(5)
+    assert acquired.is_set()
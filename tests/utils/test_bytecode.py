@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.bytecode import compilable_sources
+from poetry_plugin_bundle.utils.bytecode import strip_sources
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _install(site_packages: Path, name: str, files: dict[str, str]) -> None:
+    dist_info = site_packages / f"{name}-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    for file, content in files.items():
+        path = site_packages / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    record = [*files, f"{dist_info.name}/RECORD"]
+    (dist_info / "RECORD").write_text(
+        "".join(f"{file},,\n" for file in record), encoding="utf-8"
+    )
+
+
+def test_strip_sources_removes_compiled_sources(tmp_path: Path) -> None:
+    _install(
+        tmp_path,
+        "foo",
+        {
+            "foo/__init__.py": "",
+            "foo/__init__.pyc": "",
+            "foo/__pycache__/__init__.cpython-312.pyc": "",
+            "foo/bar.py": "",
+        },
+    )
+
+    assert strip_sources(tmp_path) == 1
+
+    assert not (tmp_path / "foo" / "__init__.py").exists()
+    assert (tmp_path / "foo" / "__init__.pyc").exists()
+    assert not (tmp_path / "foo" / "__pycache__").exists()
+    # No bytecode could be generated for this module, so the source must be kept
+    assert (tmp_path / "foo" / "bar.py").exists()
+
+
+def test_strip_sources_keeps_sources_of_allowed_distributions(
+    tmp_path: Path,
+) -> None:
+    _install(tmp_path, "foo", {"foo.py": "", "foo.pyc": ""})
+    _install(tmp_path, "Bar_Baz", {"bar_baz.py": "", "bar_baz.pyc": ""})
+
+    assert strip_sources(tmp_path, keep=["bar-baz"]) == 1
+
+    assert not (tmp_path / "foo.py").exists()
+    assert (tmp_path / "bar_baz.py").exists()
+    assert (tmp_path / "bar_baz.pyc").exists()
+
+
+def test_strip_sources_lists_bytecode_in_records(tmp_path: Path) -> None:
+    _install(
+        tmp_path,
+        "foo",
+        {
+            "foo/__init__.py": "",
+            "foo/__init__.pyc": "bytecode",
+            "foo/__pycache__/__init__.cpython-312.pyc": "",
+            "foo/bar.py": "",
+        },
+    )
+
+    strip_sources(tmp_path)
+
+    assert (tmp_path / "foo-1.0.dist-info" / "RECORD").read_text().splitlines() == [
+        "foo/__init__.pyc,sha256=jolhhxJ3JqraL25AfXCjkENVR2jdQ2f00Nz0V5IMBDI,8",
+        "foo/bar.py,,",
+        "foo-1.0.dist-info/RECORD,,",
+    ]
+
+
+def test_compilable_sources_leave_out_kept_distributions(tmp_path: Path) -> None:
+    _install(tmp_path, "foo", {"foo/__init__.py": "", "foo/bar.py": ""})
+    _install(tmp_path, "bar", {"bar.py": ""})
+
+    assert compilable_sources(tmp_path, keep=["bar"]) == [
+        tmp_path / "foo" / "__init__.py",
+        tmp_path / "foo" / "bar.py",
+    ]
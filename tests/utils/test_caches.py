@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle.utils.caches import COLD_AFTER
+from poetry_plugin_bundle.utils.caches import CacheEntry
+from poetry_plugin_bundle.utils.caches import CacheQuota
+from poetry_plugin_bundle.utils.caches import evict
+from poetry_plugin_bundle.utils.caches import format_age
+from poetry_plugin_bundle.utils.caches import list_entries
+from poetry_plugin_bundle.utils.caches import mark_used
+from poetry_plugin_bundle.utils.caches import pinned_wheels
+from poetry_plugin_bundle.utils.caches import register_lazy_bundle
+from poetry_plugin_bundle.utils.caches import select_cold_entries
+from poetry_plugin_bundle.utils.lazy_loader import MARKER_NAME
+from poetry_plugin_bundle.utils.lazy_loader import format_entry
+
+
+if TYPE_CHECKING:
+    from poetry.config.config import Config
+
+
+def _create_artifact(root: Path, key: str, name: str, size: int, used: float) -> Path:
+    directory = root / key[:2] / key[2:4] / key[4:6] / key[6:]
+    directory.mkdir(parents=True)
+    (directory / name).write_bytes(b"0" * size)
+    os.utime(directory, (used, used))
+
+    return directory
+
+
+def _entry(name: str, size: int, last_used: float) -> CacheEntry:
+    return CacheEntry("artifacts", Path(name), name, size, last_used)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("size=10G", CacheQuota(max_size=10 << 30)),
+        ("age=30d", CacheQuota(max_age=30 * 86400)),
+        ("size=512M, age=12h", CacheQuota(512 << 20, 12 * 3600)),
+    ],
+)
+def test_cache_quota_parse(value: str, expected: CacheQuota) -> None:
+    assert CacheQuota.parse(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("count=3", 'Invalid quota item "count=3"'),
+        ("age=soon", 'Invalid duration "soon"'),
+        ("size=", 'Invalid size ""'),
+    ],
+)
+def test_cache_quota_parse_rejects_invalid_values(value: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        CacheQuota.parse(value)
+
+
+def test_format_age() -> None:
+    assert format_age(30) == "just now"
+    assert format_age(3600) == "1 hour ago"
+    assert format_age(3 * 86400 + 5) == "3 days ago"
+
+
+def test_list_entries_of_the_artifact_cache(tmp_path: Path) -> None:
+    _create_artifact(tmp_path, "a" * 64, "foo-1.0.0-py3-none-any.whl", 10, 2000.0)
+    _create_artifact(tmp_path, "b" * 64, "Bar_Baz-2.0.tar.gz", 20, 1000.0)
+    _create_artifact(tmp_path, "c" * 64, "unknown.bin", 30, 3000.0)
+
+    entries = list_entries("artifacts", tmp_path)
+
+    assert [(e.package, e.size, e.last_used) for e in entries] == [
+        ("bar-baz", 20, 1000.0),
+        ("foo", 10, 2000.0),
+        (None, 30, 3000.0),
+    ]
+
+
+def test_select_cold_entries_evicts_least_recently_used_first() -> None:
+    now = 100 * COLD_AFTER
+    entries = [
+        _entry("recent", 100, now - 10),
+        _entry("old", 100, now - 50 * COLD_AFTER),
+        _entry("older", 100, now - 60 * COLD_AFTER),
+    ]
+
+    assert select_cold_entries(entries, CacheQuota(max_size=250), now) == [entries[2]]
+    assert select_cold_entries(entries, CacheQuota(max_age=55 * COLD_AFTER), now) == [
+        entries[2]
+    ]
+    # Entries used recently are kept even if the cache exceeds its quota
+    assert select_cold_entries(entries, CacheQuota(max_size=50), now) == [
+        entries[2],
+        entries[1],
+    ]
+
+
+def test_evict_removes_entries_and_empty_directories(tmp_path: Path) -> None:
+    kept = _create_artifact(tmp_path, "ab" + "a" * 62, "foo.whl", 10, 1000.0)
+    evicted = _create_artifact(tmp_path, "ab" + "b" * 62, "bar.whl", 20, 1000.0)
+
+    freed = evict(
+        [e for e in list_entries("artifacts", tmp_path) if e.path == evicted], tmp_path
+    )
+
+    assert freed == 20
+    assert kept.exists()
+    assert not evicted.exists()
+    assert not (tmp_path / "ab" / "bb").exists()
+    assert (tmp_path / "ab").exists()
+
+
+def test_mark_used_only_touches_the_artifact_cache(tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    directory = _create_artifact(cache, "a" * 64, "foo.whl", 10, 1000.0)
+    outside = tmp_path / "wheels"
+    outside.mkdir()
+    os.utime(outside, (1000.0, 1000.0))
+
+    mark_used([directory / "foo.whl", outside / "bar.whl"], cache)
+
+    assert directory.stat().st_mtime > 1000.0
+    assert outside.stat().st_mtime == 1000.0
+
+
+def test_select_cold_entries_keeps_pinned_entries() -> None:
+    now = 100 * COLD_AFTER
+    entries = [
+        _entry("old", 100, now - 50 * COLD_AFTER),
+        _entry("older", 100, now - 60 * COLD_AFTER),
+    ]
+
+    assert select_cold_entries(
+        entries, CacheQuota(max_size=50), now, pinned=[Path("older", "foo.whl")]
+    ) == [entries[0]]
+
+
+def test_pinned_wheels_of_lazy_bundles(tmp_path: Path, config: Config) -> None:
+    config.merge({"cache-dir": str(tmp_path / "cache")})
+    wheel = tmp_path / "cache" / "artifacts" / "foo-1.0-py3-none-any.whl"
+    bundle = tmp_path / "bundle"
+    dist_info = bundle / "lib" / "python3.12" / "site-packages" / "foo-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / MARKER_NAME).write_text(
+        format_entry((dist_info.name, str(wheel), "0" * 64, ("foo",))) + "\n"
+    )
+
+    register_lazy_bundle(config, bundle)
+
+    assert pinned_wheels(config) == {wheel}
+
+    # Bundles that are removed no longer pin their wheels
+    shutil.rmtree(bundle)
+
+    assert pinned_wheels(config) == set()
+    assert not list((tmp_path / "cache" / "bundle" / "lazy-bundles").iterdir())
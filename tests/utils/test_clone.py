@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.clone import clone_tree
+from poetry_plugin_bundle.utils.clone import rewrite_paths
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_clone_tree_clones_files_and_symlinks(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    (source / "lib" / "site-packages").mkdir(parents=True)
+    (source / "lib" / "site-packages" / "foo.py").write_text("VALUE = 1")
+    os.symlink("lib", source / "lib64")
+    os.symlink("/usr/bin/python3", source / "python")
+
+    methods = clone_tree(source, tmp_path / "clone")
+
+    clone = tmp_path / "clone"
+    assert (clone / "lib" / "site-packages" / "foo.py").read_text() == "VALUE = 1"
+    assert os.readlink(clone / "lib64") == "lib"
+    assert os.readlink(clone / "python") == "/usr/bin/python3"
+    assert methods["symlink"] == 1
+    assert methods["reflink"] + methods["copy"] == 1
+
+    # Modifying the clone must never modify the source
+    (clone / "lib" / "site-packages" / "foo.py").write_text("VALUE = 2")
+    assert (source / "lib" / "site-packages" / "foo.py").read_text() == "VALUE = 1"
+
+
+def test_rewrite_paths_replaces_the_environment_path(tmp_path: Path) -> None:
+    old = tmp_path / "old"
+    new = tmp_path / "new"
+    (new / "bin").mkdir(parents=True)
+    (new / "pyvenv.cfg").write_text(f"home = /usr/bin\ncommand = venv {old}\n")
+    script = new / "bin" / "foo"
+    script.write_text(f"#!{old}/bin/python\nimport foo\n")
+    script.chmod(0o755)
+    (new / "bin" / "bar").write_text("#!/usr/bin/python\n")
+    os.symlink(old / "bin" / "foo", new / "bin" / "baz")
+
+    rewritten = rewrite_paths(new, old, new)
+
+    assert sorted(rewritten) == sorted(
+        [new / "pyvenv.cfg", script, new / "bin" / "baz"]
+    )
+    assert script.read_text() == f"#!{new}/bin/python\nimport foo\n"
+    assert os.access(script, os.X_OK)
+    assert (
+        new / "pyvenv.cfg"
+    ).read_text() == f"home = /usr/bin\ncommand = venv {new}\n"
+    assert os.readlink(new / "bin" / "baz") == str(new / "bin" / "foo")
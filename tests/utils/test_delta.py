@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle.utils.delta import DeltaError
+from poetry_plugin_bundle.utils.delta import DeltaStats
+from poetry_plugin_bundle.utils.delta import apply_delta
+from poetry_plugin_bundle.utils.delta import create_delta
+from poetry_plugin_bundle.utils.delta import file_manifest
+from poetry_plugin_bundle.utils.delta import read_manifest
+from poetry_plugin_bundle.utils.delta import write_manifest
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _create_bundle(path: Path, files: dict[str, str]) -> Path:
+    for name, content in files.items():
+        file = path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content)
+
+    return path
+
+
+@pytest.fixture
+def old(tmp_path: Path) -> Path:
+    old = _create_bundle(
+        tmp_path / "old",
+        {
+            "bin/foo": "#!/bin/python",
+            "lib/site-packages/foo/__init__.py": "VALUE = 1",
+            "lib/site-packages/bar/__init__.py": "",
+            "lib/site-packages/baz.py": "",
+        },
+    )
+    os.symlink("lib", old / "lib64")
+
+    return old
+
+
+@pytest.fixture
+def new(tmp_path: Path) -> Path:
+    new = _create_bundle(
+        tmp_path / "new",
+        {
+            "bin/foo": "#!/bin/python",
+            "bin/bar": "#!/bin/python",
+            "lib/site-packages/foo/__init__.py": "VALUE = 2",
+            "lib/site-packages/baz.py": "",
+        },
+    )
+    (new / "bin" / "bar").chmod(0o755)
+    os.symlink("lib", new / "lib64")
+
+    return new
+
+
+def test_apply_delta_patches_the_old_bundle(
+    tmp_path: Path, old: Path, new: Path
+) -> None:
+    delta = tmp_path / "delta.tar.xz"
+
+    assert create_delta(file_manifest(old), new, delta) == DeltaStats(1, 1, 1)
+    assert apply_delta(delta, old) == DeltaStats(1, 1, 1)
+
+    assert file_manifest(old) == file_manifest(new)
+    assert not (old / "lib" / "site-packages" / "bar").exists()
+    assert os.access(old / "bin" / "bar", os.X_OK)
+
+
+def test_create_delta_from_a_file_manifest(
+    tmp_path: Path, old: Path, new: Path
+) -> None:
+    manifest = tmp_path / "manifest.json"
+    write_manifest(file_manifest(old), manifest)
+    delta = tmp_path / "delta.tar.xz"
+
+    create_delta(read_manifest(manifest), new, delta)
+    apply_delta(delta, old)
+
+    assert file_manifest(old) == file_manifest(new)
+
+
+def test_apply_delta_refuses_another_bundle(
+    tmp_path: Path, old: Path, new: Path
+) -> None:
+    delta = tmp_path / "delta.tar.xz"
+    create_delta(file_manifest(old), new, delta)
+
+    (old / "lib" / "site-packages" / "baz.py").write_text("VALUE = 3")
+
+    with pytest.raises(DeltaError, match="is not the one the delta"):
+        apply_delta(delta, old)
+
+    assert (old / "lib" / "site-packages" / "bar" / "__init__.py").exists()
+
+
+def test_create_delta_stores_the_files_read_at_startup_first(
+    tmp_path: Path, old: Path, new: Path
+) -> None:
+    import tarfile
+
+    (new / ".poetry-bundle-readahead.txt").write_text(
+        "lib/site-packages/foo/__init__.py\nbin/bar\n/usr/lib/libpython.so\n"
+    )
+    delta = tmp_path / "delta.tar.xz"
+    create_delta(file_manifest(old), new, delta)
+
+    with tarfile.open(delta) as archive:
+        names = archive.getnames()
+
+    assert names[:3] == [
+        "delta.json",
+        "files/lib/site-packages/foo/__init__.py",
+        "files/bin/bar",
+    ]
+
+
+def test_apply_delta_ignores_bytecode_caches(
+    tmp_path: Path, old: Path, new: Path
+) -> None:
+    delta = tmp_path / "delta.tar.xz"
+    create_delta(file_manifest(old), new, delta)
+
+    cache = old / "lib" / "site-packages" / "foo" / "__pycache__"
+    cache.mkdir()
+    (cache / "__init__.cpython-312.pyc").write_bytes(b"\x00")
+
+    assert apply_delta(delta, old) == DeltaStats(1, 1, 1)
+
+
+def test_apply_delta_refuses_a_corrupt_archive(tmp_path: Path, old: Path) -> None:
+    delta = tmp_path / "delta.tar.xz"
+    delta.write_bytes(b"not a delta")
+
+    with pytest.raises(DeltaError, match="could not be read"):
+        apply_delta(delta, old)
+
+
+def test_apply_delta_leaves_the_bundle_unchanged_on_a_truncated_archive(
+    tmp_path: Path, old: Path, new: Path
+) -> None:
+    delta = tmp_path / "delta.tar.xz"
+    create_delta(file_manifest(old), new, delta)
+    delta.write_bytes(delta.read_bytes()[: delta.stat().st_size // 2])
+    files = file_manifest(old)
+
+    with pytest.raises(DeltaError):
+        apply_delta(delta, old)
+
+    assert file_manifest(old) == files
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["delta.tar.xz", "new", "old"]
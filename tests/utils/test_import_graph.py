@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle.utils.import_graph import analyze_imports
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _install(
+    site_packages: Path,
+    name: str,
+    files: dict[str, str],
+    entry_points: str | None = None,
+) -> None:
+    dist_info = site_packages / f"{name}-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    for file, content in files.items():
+        path = site_packages / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    record = [*files, f"{dist_info.name}/RECORD"]
+    if entry_points is not None:
+        (dist_info / "entry_points.txt").write_text(entry_points, encoding="utf-8")
+        record.append(f"{dist_info.name}/entry_points.txt")
+
+    (dist_info / "RECORD").write_text(
+        "".join(f"{file},,\n" for file in record), encoding="utf-8"
+    )
+
+
+def test_analyze_imports_follows_the_import_graph(tmp_path: Path) -> None:
+    _install(
+        tmp_path,
+        "app",
+        {
+            "app/__init__.py": "from . import views\n",
+            "app/views.py": (
+                "from ..lib import helpers\n"
+                "def view():\n"
+                "    import importlib\n"
+                "    importlib.import_module('plugin')\n"
+            ),
+        },
+        entry_points="[console_scripts]\napp = cli.main:run\n",
+    )
+    _install(tmp_path, "lib", {"lib/__init__.py": "", "lib/helpers.py": "import deep"})
+    _install(tmp_path, "deep", {"deep.py": ""})
+    _install(tmp_path, "plugin", {"plugin.py": ""})
+    _install(tmp_path, "cli", {"cli/__init__.py": "", "cli/main.py": ""})
+    _install(tmp_path, "bloat", {"bloat/__init__.py": "import lib"})
+
+    analysis = analyze_imports(
+        [tmp_path],
+        roots=["app"],
+        candidates=["lib", "deep", "plugin", "cli", "bloat", "missing"],
+    )
+
+    assert analysis.reachable == {"app", "lib", "deep", "plugin", "cli"}
+    assert analysis.unreachable == {"bloat"}
+    assert analysis.unparsable == []
+
+
+def test_analyze_imports_keeps_the_roots_and_modules_of_pth_files(
+    tmp_path: Path,
+) -> None:
+    _install(tmp_path, "app", {"app.py": "import broken"})
+    _install(tmp_path, "broken", {"broken.py": "def ("})
+    _install(tmp_path, "hook", {"hook.py": "", "hook.pth": "import hook; hook.run()"})
+    _install(tmp_path, "data", {"data/file.txt": ""})
+
+    analysis = analyze_imports(
+        [tmp_path], roots=["app", "data"], candidates=["broken", "hook", "data"]
+    )
+
+    assert analysis.unreachable == set()
+    assert analysis.unparsable == [tmp_path / "broken.py"]
+
+
+def test_analyze_imports_requires_an_installed_root(tmp_path: Path) -> None:
+    _install(tmp_path, "requests", {"requests/__init__.py": ""})
+
+    with pytest.raises(ValueError, match="None of the root distributions"):
+        analyze_imports([tmp_path], roots=["app"], candidates=["requests"])
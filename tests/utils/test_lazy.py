@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import zipfile
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle.utils.lazy import install_lazy_loader
+from poetry_plugin_bundle.utils.lazy import lazy_entry
+from poetry_plugin_bundle.utils.lazy import make_lazy
+from poetry_plugin_bundle.utils.lazy_loader import MARKER_NAME
+from poetry_plugin_bundle.utils.lazy_loader import WHEELHOUSE_ENV
+from poetry_plugin_bundle.utils.lazy_loader import materialize
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+FILES = {
+    "foo/__init__.py": "VALUE = 42\n",
+    "foo/sub.py": "",
+    "foo_ext.py": "",
+}
+
+
+def _install(tmp_path: Path) -> tuple[Path, Path]:
+    """
+    Build a wheel of foo and install it into a site-packages directory.
+    """
+    wheel = tmp_path / "wheels" / "foo-1.0-py3-none-any.whl"
+    wheel.parent.mkdir()
+    with zipfile.ZipFile(wheel, "w") as archive:
+        for name, content in FILES.items():
+            archive.writestr(name, content)
+        archive.writestr("foo-1.0.data/purelib/foo_data.py", "")
+        archive.writestr("foo-1.0.data/scripts/foo", "")
+        archive.writestr("foo-1.0.dist-info/METADATA", "Name: foo\nVersion: 1.0\n")
+
+    site_packages = tmp_path / "site-packages"
+    dist_info = site_packages / "foo-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    for name, content in {**FILES, "foo_data.py": ""}.items():
+        (site_packages / name).parent.mkdir(parents=True, exist_ok=True)
+        (site_packages / name).write_text(content)
+    (dist_info / "METADATA").write_text("Name: foo\nVersion: 1.0\n")
+    (dist_info / "RECORD").write_text(
+        "".join(f"{name},,\n" for name in [*FILES, "foo_data.py"])
+        + "foo-1.0.dist-info/METADATA,,\nfoo-1.0.dist-info/RECORD,,\n"
+    )
+
+    return site_packages, wheel
+
+
+def test_make_lazy_keeps_metadata_only(tmp_path: Path) -> None:
+    site_packages, wheel = _install(tmp_path)
+    dist_info = site_packages / "foo-1.0.dist-info"
+
+    entry = make_lazy(dist_info, wheel)
+
+    assert entry[0] == "foo-1.0.dist-info"
+    assert entry[1] == str(wheel)
+    assert entry[3] == ("foo", "foo_data", "foo_ext")
+    assert lazy_entry(dist_info) == entry
+    assert sorted(path.name for path in site_packages.iterdir()) == [
+        "foo-1.0.dist-info"
+    ]
+    assert f"foo-1.0.dist-info/{MARKER_NAME},," in (dist_info / "RECORD").read_text()
+
+
+def test_materialize_unpacks_wheel_once(tmp_path: Path) -> None:
+    site_packages, wheel = _install(tmp_path)
+    dist_info = site_packages / "foo-1.0.dist-info"
+    entry = make_lazy(dist_info, wheel)
+
+    assert materialize(str(site_packages), entry)
+    assert not materialize(str(site_packages), entry)
+
+    assert (site_packages / "foo" / "__init__.py").read_text() == "VALUE = 42\n"
+    assert (site_packages / "foo_data.py").exists()
+    assert not (site_packages / "foo").with_name("foo-1.0.data").exists()
+    assert lazy_entry(dist_info) is None
+    # The installed metadata is kept
+    assert f"foo-1.0.dist-info/{MARKER_NAME},," in (dist_info / "RECORD").read_text()
+
+
+def test_materialize_checks_the_wheel_hash(tmp_path: Path) -> None:
+    site_packages, wheel = _install(tmp_path)
+    entry = make_lazy(site_packages / "foo-1.0.dist-info", wheel)
+    with zipfile.ZipFile(wheel, "a") as archive:
+        archive.writestr("foo/evil.py", "")
+
+    with pytest.raises(ImportError, match="does not match"):
+        materialize(str(site_packages), entry)
+
+    assert not (site_packages / "foo").exists()
+
+
+def test_materialize_looks_up_wheelhouse(tmp_path: Path, mocker: MockerFixture) -> None:
+    site_packages, wheel = _install(tmp_path)
+    entry = make_lazy(site_packages / "foo-1.0.dist-info", wheel)
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    wheel.rename(wheelhouse / wheel.name)
+
+    with pytest.raises(ImportError, match=f"set {WHEELHOUSE_ENV}"):
+        materialize(str(site_packages), entry)
+
+    mocker.patch.dict("os.environ", {WHEELHOUSE_ENV: str(wheelhouse)})
+
+    assert materialize(str(site_packages), entry)
+    assert (site_packages / "foo" / "sub.py").exists()
+
+
+def test_materialize_reports_unwritable_site_packages(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    site_packages, wheel = _install(tmp_path)
+    dist_info = site_packages / "foo-1.0.dist-info"
+    entry = make_lazy(dist_info, wheel)
+    # Permissions do not hold root back
+    mocker.patch("os.replace", side_effect=PermissionError(13, "Permission denied"))
+
+    with pytest.raises(
+        ImportError,
+        match=r"The lazy distribution foo-1\.0 could not be materialized from the"
+        r" wheel foo-1\.0-py3-none-any\.whl: .*Permission denied",
+    ):
+        materialize(str(site_packages), entry)
+
+    assert lazy_entry(dist_info) == entry
+
+
+def test_lazy_loader_materializes_on_first_import(tmp_path: Path) -> None:
+    site_packages, wheel = _install(tmp_path)
+    make_lazy(site_packages / "foo-1.0.dist-info", wheel)
+
+    assert install_lazy_loader(site_packages) == 1
+
+    script = (
+        "import site, sys;"
+        f" site.addsitedir({str(site_packages)!r});"
+        " assert 'foo' not in sys.modules;"
+        " import foo.sub;"
+        " print(foo.VALUE)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", script], text=True)
+
+    assert output.strip() == "42"
+    assert lazy_entry(site_packages / "foo-1.0.dist-info") is None
+
+
+def test_install_lazy_loader_removes_loader_without_lazy_distributions(
+    tmp_path: Path,
+) -> None:
+    site_packages, wheel = _install(tmp_path)
+    entry = make_lazy(site_packages / "foo-1.0.dist-info", wheel)
+    install_lazy_loader(site_packages)
+    materialize(str(site_packages), entry)
+
+    assert install_lazy_loader(site_packages) == 0
+
+    assert not list(site_packages.glob("_poetry_bundle_lazy*"))
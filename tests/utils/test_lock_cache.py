@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.lock_cache import LockDataCache
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_lock_cache_parses_each_content_once(tmp_path: Path) -> None:
+    cache = LockDataCache()
+    first = tmp_path / "first.lock"
+    first.write_text("content")
+    second = tmp_path / "second.lock"
+    second.write_text("content")
+    parsed = []
+
+    def parse(lock: Path) -> dict[str, str]:
+        parsed.append(lock)
+        return {"content": lock.read_text()}
+
+    assert cache.get(first, lambda: parse(first)) == {"content": "content"}
+    assert cache.get(second, lambda: parse(second)) == {"content": "content"}
+    assert parsed == [first]
+
+    second.write_text("other content")
+
+    assert cache.get(second, lambda: parse(second)) == {"content": "other content"}
+    assert parsed == [first, second]
+
+
+def test_lock_cache_evicts_the_least_recently_used_content(tmp_path: Path) -> None:
+    cache = LockDataCache(max_size=2)
+    locks = []
+    for i in range(3):
+        lock = tmp_path / f"{i}.lock"
+        lock.write_text(str(i))
+        locks.append(lock)
+
+    cache.get(locks[0], dict)
+    cache.get(locks[1], dict)
+    cache.get(locks[0], dict)
+    cache.get(locks[2], dict)
+
+    assert len(cache) == 2
+    assert cache.get(locks[0], lambda: {"parsed": True}) == {}
+    assert cache.get(locks[1], lambda: {"parsed": True}) == {"parsed": True}
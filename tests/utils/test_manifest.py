@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.manifest import BundleManifest
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_manifest_round_trip(tmp_path: Path) -> None:
+    manifest = BundleManifest("foo", "1.2.3", "abc", {"main", "dev"})
+    manifest.write(tmp_path)
+
+    read = BundleManifest.read(tmp_path)
+
+    assert read is not None
+    assert read.to_dict() == manifest.to_dict()
+    assert read.groups == ["dev", "main"]
+
+
+def test_manifest_is_missing_for_other_directories(tmp_path: Path) -> None:
+    assert BundleManifest.read(tmp_path) is None
+
+    (tmp_path / BundleManifest.NAME).write_text("{", encoding="utf-8")
+
+    assert BundleManifest.read(tmp_path) is None
+
+
+def test_manifest_matches_same_lock_and_groups() -> None:
+    manifest = BundleManifest("foo", "1.2.3", "abc", {"main"})
+
+    assert manifest.matches(BundleManifest("foo", "1.2.4", "abc", ["main"]))
+    assert not manifest.matches(BundleManifest("foo", "1.2.3", "def", {"main"}))
+    assert not manifest.matches(BundleManifest("foo", "1.2.3", "abc", {"dev"}))
+    assert not manifest.matches(BundleManifest("bar", "1.2.3", "abc", {"main"}))
+    assert not BundleManifest("foo", "1.2.3", None, None).matches(
+        BundleManifest("foo", "1.2.3", None, None)
+    )
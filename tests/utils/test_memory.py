@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from poetry_plugin_bundle.utils.memory import MemoryBudget
+from poetry_plugin_bundle.utils.memory import current_rss
+from poetry_plugin_bundle.utils.memory import format_size
+from poetry_plugin_bundle.utils.memory import parse_size
+from poetry_plugin_bundle.utils.memory import peak_rss
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1024", 1024),
+        ("512M", 512 << 20),
+        ("512mb", 512 << 20),
+        ("1.5GiB", 3 << 29),
+        (" 2 g ", 2 << 30),
+    ],
+)
+def test_parse_size(value: str, expected: int) -> None:
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "M", "-1G", "0", "12 apples"])
+def test_parse_size_rejects_invalid_values(value: str) -> None:
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size(value)
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [(512, "512 B"), (1536, "1.5 KiB"), (512 << 20, "512.0 MiB"), (3 << 40, "3.0 TiB")],
+)
+def test_format_size(size: int, expected: str) -> None:
+    assert format_size(size) == expected
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires /proc")
+def test_rss_is_measured() -> None:
+    rss = current_rss()
+    peak = peak_rss()
+
+    assert rss is not None
+    assert peak is not None
+    assert 0 < rss <= peak
+
+
+def test_memory_budget_collects_garbage_before_holding_jobs_back() -> None:
+    rss = [700, 800, 800, 800, 800, 700]
+    clock = 0.0
+    budget = MemoryBudget(1000, rss=lambda: rss.pop(0), clock=lambda: clock)
+
+    assert budget.available()
+
+    # Collecting garbage did not release enough memory
+    assert not budget.available()
+    assert len(rss) == 3
+
+    # Garbage is not collected again right away
+    assert not budget.available()
+    assert len(rss) == 2
+
+    clock = 2.0
+    assert budget.available()
+    assert not rss
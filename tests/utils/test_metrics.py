@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.metrics import BundleStats
+from poetry_plugin_bundle.utils.metrics import snapshot
+from poetry_plugin_bundle.utils.metrics import write_metrics
+from poetry_plugin_bundle.utils.metrics import written_bytes
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_bundle_stats_records_phase_durations() -> None:
+    stats = BundleStats()
+    stats.start_phase("environment")
+    stats.start_phase("dependencies")
+    stats.start_phase("environment")
+    stats.finish()
+
+    assert set(stats.phases) == {"environment", "dependencies"}
+    assert stats.duration >= sum(stats.phases.values())
+
+
+def test_written_bytes_counts_added_and_modified_files(tmp_path: Path) -> None:
+    (tmp_path / "unchanged").write_bytes(b"a")
+    (tmp_path / "modified").write_bytes(b"b")
+    before = snapshot(tmp_path)
+
+    (tmp_path / "modified").write_bytes(b"bbb")
+    (tmp_path / "added").write_bytes(b"cccc")
+
+    assert written_bytes(before, snapshot(tmp_path)) == 7
+
+
+def test_write_metrics_accumulates_counters(tmp_path: Path) -> None:
+    metrics_file = tmp_path / "bundle.prom"
+
+    stats = BundleStats()
+    stats.operations.update({"install": 2, "skip": 1})
+    stats.downloaded_bytes = 100
+    stats.phases = {"dependencies": 1.5}
+    stats.size_bytes = 1000
+    write_metrics(metrics_file, stats, "foo", success=True)
+
+    stats = BundleStats()
+    stats.operations.update({"install": 1, "uninstall": 1})
+    stats.phases = {"dependencies": 0.5}
+    stats.size_bytes = 900
+    stats.parallelism = {"download": (4, 2.5)}
+    write_metrics(metrics_file, stats, "foo", success=False)
+
+    samples = {
+        line.rsplit(" ", 1)[0]: line.rsplit(" ", 1)[1]
+        for line in metrics_file.read_text(encoding="utf-8").splitlines()
+        if not line.startswith("#")
+    }
+
+    assert samples['poetry_bundle_runs_total{project="foo",result="success"}'] == "1"
+    assert samples['poetry_bundle_runs_total{project="foo",result="failure"}'] == "1"
+    assert (
+        samples['poetry_bundle_packages_total{operation="install",project="foo"}']
+        == "3"
+    )
+    assert (
+        samples['poetry_bundle_packages_total{operation="uninstall",project="foo"}']
+        == "1"
+    )
+    assert samples['poetry_bundle_downloaded_bytes_total{project="foo"}'] == "100"
+    assert (
+        samples[
+            'poetry_bundle_phase_duration_seconds{phase="dependencies",project="foo"}'
+        ]
+        == "0.5"
+    )
+    assert samples['poetry_bundle_size_bytes{project="foo"}'] == "900"
+    assert samples['poetry_bundle_peak_jobs{pool="download",project="foo"}'] == "4"
+    assert samples['poetry_bundle_mean_jobs{pool="download",project="foo"}'] == "2.5"
+    assert "# TYPE poetry_bundle_runs_total counter" in metrics_file.read_text(
+        encoding="utf-8"
+    )
+
+
+def test_write_metrics_keeps_the_samples_of_other_projects(tmp_path: Path) -> None:
+    metrics_file = tmp_path / "bundle.prom"
+
+    stats = BundleStats()
+    stats.size_bytes = 1000
+    stats.parallelism = {"download": (4, 2.5)}
+    write_metrics(metrics_file, stats, "foo", success=True)
+
+    stats = BundleStats()
+    stats.size_bytes = 2000
+    write_metrics(metrics_file, stats, "bar", success=True)
+
+    stats = BundleStats()
+    stats.size_bytes = 900
+    write_metrics(metrics_file, stats, "foo", success=True)
+
+    content = metrics_file.read_text(encoding="utf-8")
+
+    assert 'poetry_bundle_size_bytes{project="foo"} 900\n' in content
+    assert 'poetry_bundle_size_bytes{project="bar"} 2000\n' in content
+    assert 'poetry_bundle_runs_total{project="bar",result="success"} 1\n' in content
+    # Gauges describe the last bundle of each project only
+    assert "poetry_bundle_peak_jobs" not in content
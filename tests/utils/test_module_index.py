@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.module_index import install_module_index
+
+
+if TYPE_CHECKING:
+    from poetry.utils.env import VirtualEnv
+
+
+FINDERS = "print(sorted(type(f).__name__ for f in sys.meta_path))"
+
+
+def _create_modules(site_packages: Path) -> None:
+    (site_packages / "alpha.py").write_text("VALUE = 'alpha'")
+    (site_packages / "beta").mkdir()
+    (site_packages / "beta" / "__init__.py").write_text("")
+    (site_packages / "beta" / "sub.py").write_text("VALUE = 'beta.sub'")
+    (site_packages / "gamma").mkdir()
+    (site_packages / "gamma" / "delta.py").write_text("VALUE = 'gamma.delta'")
+    # Shadowed by the standard library
+    (site_packages / "json.py").write_text("")
+
+
+def test_module_index_finds_modules(tmp_venv: VirtualEnv) -> None:
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_modules(site_packages)
+
+    assert install_module_index(tmp_venv) > 3
+
+    output = tmp_venv.run_python_script(
+        "import sys\n"
+        "finder = next(f for f in sys.meta_path if type(f).__name__ == 'IndexFinder')\n"
+        "for name in ('alpha', 'beta', 'gamma', 'json'):\n"
+        "    print(name, finder.find_spec(name) is not None)\n"
+        "import alpha, beta.sub, gamma.delta, json\n"
+        "print(alpha.VALUE, beta.sub.VALUE, gamma.delta.VALUE)\n"
+        "print(json.__file__.startswith(sys.prefix))\n"
+    )
+
+    assert output.splitlines() == [
+        "alpha True",
+        "beta True",
+        "gamma False",
+        "json False",
+        "alpha beta.sub gamma.delta",
+        "False",
+    ]
+
+
+def test_module_index_is_ignored_when_stale(tmp_venv: VirtualEnv) -> None:
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_modules(site_packages)
+    install_module_index(tmp_venv)
+
+    (site_packages / "epsilon.py").write_text("VALUE = 'epsilon'")
+
+    output = tmp_venv.run_python_script(
+        f"import sys\n{FINDERS}\nimport epsilon\nprint(epsilon.VALUE)"
+    )
+
+    assert "IndexFinder" not in output
+    assert output.splitlines()[-1] == "epsilon"
+
+
+def test_module_index_prefers_modules_of_the_script_directory(
+    tmp_venv: VirtualEnv, tmp_path: Path
+) -> None:
+    site_packages = Path(tmp_venv.paths["purelib"])
+    _create_modules(site_packages)
+    install_module_index(tmp_venv)
+
+    (tmp_path / "alpha.py").write_text("VALUE = 'local'")
+    script = tmp_path / "script.py"
+    script.write_text(f"import sys\n{FINDERS}\nimport alpha\nprint(alpha.VALUE)")
+
+    output = tmp_venv.run("python", str(script))
+
+    assert "IndexFinder" in output
+    assert output.splitlines()[-1] == "local"
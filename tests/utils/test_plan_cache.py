@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.plan_cache import InstallPlanCache
+from poetry_plugin_bundle.utils.plan_cache import PlannedPackage
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+MARKER_ENV = {"python_version": "3.12", "sys_platform": "linux"}
+
+
+def test_plan_cache_round_trip(tmp_path: Path) -> None:
+    cache = InstallPlanCache(tmp_path)
+    inputs = cache.inputs(b"lock", {"main"}, MARKER_ENV, "2.0.0")
+    plan = [
+        PlannedPackage("foo", "1.0.0", priority=1),
+        PlannedPackage("bar", "2.0.0", "git", "https://example.com/bar.git", "main"),
+    ]
+
+    assert cache.load(inputs) is None
+
+    cache.save(inputs, plan)
+
+    assert sorted(cache.load(inputs) or []) == sorted(plan)
+
+
+def test_plan_cache_misses_when_inputs_change(tmp_path: Path) -> None:
+    cache = InstallPlanCache(tmp_path)
+    cache.save(
+        cache.inputs(b"lock", {"main"}, MARKER_ENV, "2.0.0"),
+        [PlannedPackage("foo", "1.0.0")],
+    )
+
+    assert cache.load(cache.inputs(b"lock2", {"main"}, MARKER_ENV, "2.0.0")) is None
+    assert cache.load(cache.inputs(b"lock", {"dev"}, MARKER_ENV, "2.0.0")) is None
+    assert cache.load(cache.inputs(b"lock", None, MARKER_ENV, "2.0.0")) is None
+    assert (
+        cache.load(
+            cache.inputs(
+                b"lock", {"main"}, {**MARKER_ENV, "sys_platform": "win32"}, "2.0.0"
+            )
+        )
+        is None
+    )
+    assert cache.load(cache.inputs(b"lock", {"main"}, MARKER_ENV, "2.1.0")) is None
+
+
+def test_plan_cache_discards_corrupted_entries(tmp_path: Path) -> None:
+    cache = InstallPlanCache(tmp_path)
+    inputs = cache.inputs(b"lock", {"main"}, MARKER_ENV, "2.0.0")
+    cache.save(inputs, [PlannedPackage("foo", "1.0.0")])
+
+    (entry,) = tmp_path.glob("*.json")
+    entry.write_text("{", encoding="utf-8")
+
+    assert cache.load(inputs) is None
+    assert not entry.exists()
+
+
+def test_plan_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = InstallPlanCache(tmp_path, max_entries=2)
+    inputs = [
+        cache.inputs(f"lock{i}".encode(), {"main"}, MARKER_ENV, "2.0.0")
+        for i in range(3)
+    ]
+
+    cache.save(inputs[0], [PlannedPackage("foo", "1.0.0")])
+    cache.save(inputs[1], [PlannedPackage("foo", "1.0.0")])
+    # Make the first entry the oldest one, then use it so that it becomes the newest
+    for i, entry in enumerate(sorted(tmp_path.glob("*.json"))):
+        os.utime(entry, (i, i))
+    assert cache.load(inputs[0]) is not None
+
+    cache.save(inputs[2], [PlannedPackage("foo", "1.0.0")])
+
+    assert cache.load(inputs[0]) is not None
+    assert cache.load(inputs[1]) is None
+    assert cache.load(inputs[2]) is not None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import marshal
+import threading
+import time
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.profiling import DeterministicProfiler
+from poetry_plugin_bundle.utils.profiling import SamplingProfiler
+from poetry_plugin_bundle.utils.profiling import collapse_stats
+from poetry_plugin_bundle.utils.profiling import write_profile
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _outer() -> None:
+    _spin(0.05)
+
+
+def test_collapse_stats_apportions_time_between_callers() -> None:
+    root = ("a.py", 1, "root")
+    left = ("a.py", 10, "left")
+    right = ("a.py", 20, "right")
+    shared = ("a.py", 30, "shared")
+    stats = {
+        root: (1, 1, 0.1, 1.0, {}),
+        left: (1, 1, 0.1, 0.4, {root: (1, 1, 0.1, 0.4)}),
+        right: (1, 1, 0.1, 0.5, {root: (1, 1, 0.1, 0.5)}),
+        shared: (
+            2,
+            2,
+            0.7,
+            0.7,
+            {left: (1, 1, 0.3, 0.3), right: (1, 1, 0.4, 0.4)},
+        ),
+    }
+
+    stacks = collapse_stats(stats)
+
+    assert stacks == {
+        "root (a.py:1)": 100000,
+        "root (a.py:1);left (a.py:10)": 100000,
+        "root (a.py:1);left (a.py:10);shared (a.py:30)": 300000,
+        "root (a.py:1);right (a.py:20)": 100000,
+        "root (a.py:1);right (a.py:20);shared (a.py:30)": 400000,
+    }
+
+
+def test_deterministic_profiler_writes_profiles(tmp_path: Path) -> None:
+    profiler = DeterministicProfiler()
+    profiler.start()
+    _outer()
+    profiler.stop()
+
+    output = tmp_path / "profile" / "bundle.prof"
+    collapsed = write_profile(profiler, output)
+
+    assert collapsed == tmp_path / "profile" / "bundle.collapsed"
+    stats = marshal.loads(output.read_bytes())
+    assert any(function[2] == "_spin" for function in stats)
+
+    lines = collapsed.read_text(encoding="utf-8").splitlines()
+    assert any(
+        "_outer (" in line and ";_spin (" in line and int(line.rsplit(" ", 1)[1]) > 0
+        for line in lines
+    )
+
+
+def test_sampling_profiler_samples_every_thread(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    thread = threading.Thread(target=_outer, name="worker")
+    thread.start()
+    thread.join()
+    profiler.stop()
+
+    stacks = profiler.collapsed_stacks()
+    assert any(
+        stack.startswith("worker;") and stack.endswith(")") and "_spin (" in stack
+        for stack in stacks
+    )
+
+    stats = profiler.stats()
+    spin = next(function for function in stats.stats if function[2] == "_spin")  # type: ignore[attr-defined]
+    _, samples, own, cumulative, callers = stats.stats[spin]  # type: ignore[attr-defined]
+    assert samples > 0
+    assert 0 < own <= cumulative
+    assert any(caller[2] == "_outer" for caller in callers)
+
+    write_profile(profiler, tmp_path / "bundle.prof")
+    assert (tmp_path / "bundle.collapsed").read_text(encoding="utf-8")
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.pth import MERGED_PTH
+from poetry_plugin_bundle.utils.pth import audit
+from poetry_plugin_bundle.utils.pth import consolidate
+from poetry_plugin_bundle.utils.pth import startup_costs
+
+
+if TYPE_CHECKING:
+    from poetry.utils.env import VirtualEnv
+
+
+NAMESPACE_LINE = (
+    "import sys, types, os;has_mfs = sys.version_info > (3, 5);"
+    "p = os.path.join(sys._getframe(1).f_locals['sitedir'], *('ns',));"
+    "importlib = has_mfs and __import__('importlib.util')"
+)
+
+
+def _create_site_packages(site_packages: Path) -> None:
+    (site_packages / "foo").mkdir(parents=True)
+    (site_packages / "ns").mkdir()
+    (site_packages / "_virtualenv.py").write_text("")
+    (site_packages / "a.pth").write_text("foo\n# comment\nmissing\n")
+    (site_packages / "b.pth").write_text("import _virtualenv\n")
+    (site_packages / "c-nspkg.pth").write_text(NAMESPACE_LINE + "\n")
+    (site_packages / "d.pth").write_text(
+        "import coverage; coverage.process_startup()\n"
+    )
+    (site_packages / "_poetry_bundle_base.pth").write_text("import site\n")
+
+
+def test_consolidate_merges_and_defers_lines(tmp_path: Path) -> None:
+    _create_site_packages(tmp_path)
+
+    files = {file.name: file for file in audit(tmp_path)}
+    assert sorted(files) == ["a.pth", "b.pth", "c-nspkg.pth", "d.pth"]
+    assert files["a.pth"].paths == ["foo", "missing"]
+    assert files["b.pth"].hooks == [(("distutils", "setuptools"), "import _virtualenv")]
+    assert files["c-nspkg.pth"].namespaces == [NAMESPACE_LINE]
+    assert files["d.pth"].eager == ["import coverage; coverage.process_startup()"]
+
+    consolidate(tmp_path, files.values())
+
+    assert sorted(path.name for path in tmp_path.glob("*.pth")) == [
+        MERGED_PTH,
+        "_poetry_bundle_base.pth",
+        "d.pth",
+    ]
+    merged = (tmp_path / MERGED_PTH).read_text()
+    assert merged.splitlines() == [
+        "# Merged by poetry-plugin-bundle, do not edit.",
+        "# file: a.pth",
+        "foo",
+        "# file: b.pth",
+        "# hook: import _virtualenv",
+        (
+            "import _poetry_bundle_hooks; _poetry_bundle_hooks.install("
+            "[(('distutils', 'setuptools'), 'import _virtualenv')])"
+        ),
+    ]
+    assert (tmp_path / "_poetry_bundle_hooks.py").exists()
+
+    # Consolidating again keeps what was merged before
+    consolidate(tmp_path, audit(tmp_path))
+
+    assert (tmp_path / MERGED_PTH).read_text() == merged
+
+
+def test_consolidated_hooks_run_on_first_import(tmp_venv: VirtualEnv) -> None:
+    site_packages = Path(tmp_venv.paths["purelib"])
+    assert (site_packages / "_virtualenv.pth").exists()
+
+    consolidate(site_packages, audit(site_packages))
+
+    output = tmp_venv.run_python_script(
+        "import sys\n"
+        "print('_virtualenv' in sys.modules)\n"
+        "try:\n"
+        "    import distutils\n"
+        "except ImportError:\n"
+        "    pass\n"
+        "print('_virtualenv' in sys.modules)\n"
+    )
+
+    assert output.splitlines() == ["False", "True"]
+    assert MERGED_PTH in startup_costs(tmp_venv, site_packages)
+
+
+def test_consolidate_drops_the_entries_of_removed_files(tmp_path: Path) -> None:
+    (tmp_path / "foo").mkdir()
+    (tmp_path / "bar").mkdir()
+    dist_info = tmp_path / "foo-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "RECORD").write_text("foo.pth,,\nfoo-1.0.dist-info/RECORD,,\n")
+    (tmp_path / "foo.pth").write_text("foo\n")
+    (tmp_path / "bar.pth").write_text("bar\nimport bar\n")
+
+    consolidate(tmp_path, audit(tmp_path))
+
+    assert (tmp_path / MERGED_PTH).read_text().splitlines()[1:] == [
+        "# file: bar.pth",
+        "# source: bar.pth",
+        "bar",
+        "# file: foo.pth",
+        "# source: foo-1.0.dist-info",
+        "foo",
+    ]
+
+    # Both distributions are uninstalled, their directories being left behind
+    (dist_info / "RECORD").unlink()
+    dist_info.rmdir()
+    (tmp_path / "bar.pth").unlink()
+
+    consolidate(tmp_path, audit(tmp_path))
+
+    assert (tmp_path / MERGED_PTH).read_text().splitlines()[1:] == []
+
+
+def test_audit_only_defers_hooks_whose_module_is_importable(tmp_path: Path) -> None:
+    (tmp_path / "_virtualenv.pyc").write_bytes(b"")
+    (tmp_path / "a.pth").write_text("import _virtualenv\n")
+    (tmp_path / "b.pth").write_text("import _distutils_hack\n")
+
+    files = {file.name: file for file in audit(tmp_path)}
+    assert files["a.pth"].hooks == [(("distutils", "setuptools"), "import _virtualenv")]
+    assert files["b.pth"].hooks == []
+    assert files["b.pth"].eager == ["import _distutils_hack"]
+
+    consolidate(tmp_path, files.values())
+
+    assert not (tmp_path / "a.pth").exists()
+    assert (tmp_path / "b.pth").read_text() == "import _distutils_hack\n"
+    assert "# hook: import _virtualenv" in (tmp_path / MERGED_PTH).read_text()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.prefetch import main
+from poetry_plugin_bundle.utils.prefetch import prefetch
+from poetry_plugin_bundle.utils.readahead import console_scripts
+from poetry_plugin_bundle.utils.readahead import read_readahead
+from poetry_plugin_bundle.utils.readahead import remove_readahead
+from poetry_plugin_bundle.utils.readahead import startup_files
+from poetry_plugin_bundle.utils.readahead import write_readahead
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_console_scripts(tmp_path: Path) -> None:
+    (tmp_path / "entry_points.txt").write_text(
+        "[console_scripts]\n"
+        "foo = foo.cli:main\n"
+        "Foo-Bar = foo.cli:App.run [extra]\n"
+        "\n"
+        "[gui_scripts]\n"
+        "foo-gui = foo.gui:main\n"
+    )
+
+    assert console_scripts(tmp_path) == [
+        ("foo", "foo.cli:main"),
+        ("Foo-Bar", "foo.cli:App.run [extra]"),
+    ]
+    assert console_scripts(tmp_path / "missing") == []
+
+
+def test_startup_files_are_relative_to_the_bundle(tmp_path: Path) -> None:
+    bundle = tmp_path / "bundle"
+    (bundle / "lib").mkdir(parents=True)
+    (bundle / "lib" / "foo.py").write_text("")
+    (bundle / "pyvenv.cfg").write_text("")
+    (tmp_path / "python").write_text("")
+    os.symlink(tmp_path / "python", bundle / "python")
+
+    paths = [
+        str(tmp_path / "python"),
+        str(bundle / "pyvenv.cfg"),
+        str(bundle / "lib" / "missing.pyc"),
+        str(bundle / "lib" / "foo.py"),
+        str(bundle / "lib"),
+        str(bundle / "pyvenv.cfg"),
+        "/proc/self/status",
+    ]
+
+    assert startup_files(bundle, paths) == [
+        str(tmp_path / "python"),
+        "pyvenv.cfg",
+        "lib/foo.py",
+    ]
+
+
+def test_prefetch_reads_the_readahead_manifest(tmp_path: Path) -> None:
+    bundle = tmp_path / "bundle"
+    site_packages = bundle / "lib"
+    site_packages.mkdir(parents=True)
+    (site_packages / "foo.py").write_text("")
+    (tmp_path / "python").write_text("")
+
+    files = ["lib/foo.py", str(tmp_path / "python"), "lib/missing.py"]
+    write_readahead(bundle, site_packages, files)
+
+    assert read_readahead(bundle) == files
+    assert (site_packages / "_poetry_bundle_prefetch.py").exists()
+    assert prefetch(str(bundle)) == 2
+    assert main([str(bundle)]) == 0
+
+    remove_readahead(bundle, site_packages)
+
+    assert read_readahead(bundle) == []
+    assert not (site_packages / "_poetry_bundle_prefetch.py").exists()
+    assert main([str(bundle)]) == 1
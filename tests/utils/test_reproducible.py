@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from poetry_plugin_bundle.utils.reproducible import DEFAULT_SOURCE_DATE_EPOCH
+from poetry_plugin_bundle.utils.reproducible import get_source_date_epoch
+from poetry_plugin_bundle.utils.reproducible import hash_bytecode
+from poetry_plugin_bundle.utils.reproducible import normalize_mtimes
+from poetry_plugin_bundle.utils.reproducible import remove_direct_url
+from poetry_plugin_bundle.utils.reproducible import sort_record
+from poetry_plugin_bundle.utils.reproducible import source_date_epoch
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_get_source_date_epoch(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    assert get_source_date_epoch() == DEFAULT_SOURCE_DATE_EPOCH
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    assert get_source_date_epoch() == 1700000000
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "now")
+    with pytest.raises(ValueError, match='not "now"'):
+        get_source_date_epoch()
+
+
+def test_source_date_epoch_is_exported_unless_set(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+
+    with source_date_epoch(42):
+        assert os.environ["SOURCE_DATE_EPOCH"] == "42"
+        with source_date_epoch(42):
+            pass
+        assert os.environ["SOURCE_DATE_EPOCH"] == "42"
+
+    assert "SOURCE_DATE_EPOCH" not in os.environ
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    with source_date_epoch(42):
+        assert os.environ["SOURCE_DATE_EPOCH"] == "1700000000"
+
+    assert os.environ["SOURCE_DATE_EPOCH"] == "1700000000"
+
+
+def test_normalize_mtimes(tmp_path: Path) -> None:
+    (tmp_path / "foo").mkdir()
+    (tmp_path / "foo" / "bar.py").write_text("")
+    (tmp_path / "link").symlink_to("missing")
+
+    normalize_mtimes(tmp_path, 315532800)
+
+    for path in [tmp_path, tmp_path / "foo", tmp_path / "foo" / "bar.py"]:
+        assert path.stat().st_mtime == 315532800
+    if os.utime in os.supports_follow_symlinks:
+        assert (tmp_path / "link").lstat().st_mtime == 315532800
+
+
+def test_sort_record_and_remove_direct_url(tmp_path: Path) -> None:
+    dist_info = tmp_path / "foo-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "direct_url.json").write_text("{}")
+    (dist_info / "RECORD").write_text(
+        "foo/b.py,sha256=b,1\n"
+        "foo-1.0.dist-info/direct_url.json,,\n"
+        '"foo/a,b.py",sha256=a,1\n'
+        "foo-1.0.dist-info/RECORD,,\n"
+    )
+
+    assert remove_direct_url(dist_info)
+    assert not remove_direct_url(dist_info)
+    sort_record(dist_info)
+
+    assert not (dist_info / "direct_url.json").exists()
+    assert (dist_info / "RECORD").read_text() == (
+        'foo-1.0.dist-info/RECORD,,\n"foo/a,b.py",sha256=a,1\nfoo/b.py,sha256=b,1\n'
+    )
+
+
+def test_hash_bytecode(tmp_path: Path) -> None:
+    import importlib.util
+    import py_compile
+
+    source = tmp_path / "foo.py"
+    source.write_text("VALUE = 42\n")
+    pyc = py_compile.compile(
+        str(source), invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP
+    )
+
+    assert hash_bytecode(str(tmp_path)) == 1
+    assert hash_bytecode(str(tmp_path)) == 0
+
+    assert pyc is not None
+    with open(pyc, "rb") as f:
+        header = f.read(16)
+    assert header[:4] == importlib.util.MAGIC_NUMBER
+    # Checked hash-based bytecode
+    assert int.from_bytes(header[4:8], "little") == 0b11
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.site_packages import remove_distribution
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_remove_distribution_removes_its_files(tmp_path: Path) -> None:
+    site_packages = tmp_path / "lib" / "site-packages"
+    dist_info = site_packages / "foo-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    for file in ("foo/__init__.py", "foo/sub/bar.py", "shared/foo.py"):
+        (site_packages / file).parent.mkdir(parents=True, exist_ok=True)
+        (site_packages / file).write_text("")
+    (site_packages / "foo" / "__pycache__").mkdir()
+    (site_packages / "foo" / "__pycache__" / "__init__.cpython-311.pyc").write_text("")
+    (site_packages / "shared" / "other.py").write_text("")
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "foo").write_text("")
+    (tmp_path.parent / "outside").write_text("")
+    (dist_info / "RECORD").write_text(
+        "foo/__init__.py,,\n"
+        "foo/sub/bar.py,,\n"
+        "shared/foo.py,,\n"
+        "../../bin/foo,,\n"
+        "../../../outside,,\n"
+        "foo-1.0.dist-info/RECORD,,\n"
+    )
+
+    assert remove_distribution(dist_info, tmp_path) == 5
+
+    assert sorted(
+        path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*")
+    ) == [
+        "bin",
+        "lib",
+        "lib/site-packages",
+        "lib/site-packages/shared",
+        "lib/site-packages/shared/other.py",
+    ]
+    assert (tmp_path.parent / "outside").exists()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING
+
+from poetry_plugin_bundle.utils.watcher import ProjectWatcher
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_watcher_reports_added_modified_and_removed_files(tmp_path: Path) -> None:
+    modified = tmp_path / "modified.py"
+    modified.write_text("", encoding="utf-8")
+    removed = tmp_path / "removed.py"
+    removed.write_text("", encoding="utf-8")
+
+    watcher = ProjectWatcher(tmp_path)
+    assert watcher.changes() == set()
+
+    added = tmp_path / "package" / "added.py"
+    added.parent.mkdir()
+    added.write_text("", encoding="utf-8")
+    modified.write_text("VALUE = 1", encoding="utf-8")
+    removed.unlink()
+
+    assert watcher.changes() == {added, modified, removed}
+    assert watcher.changes() == set()
+
+
+def test_watcher_ignores_hidden_cache_and_excluded_directories(
+    tmp_path: Path,
+) -> None:
+    bundle = tmp_path / "bundle"
+    for directory in (".git", "__pycache__", "bundle"):
+        (tmp_path / directory).mkdir()
+
+    watcher = ProjectWatcher(tmp_path, exclude=[bundle])
+
+    (tmp_path / ".git" / "index").write_text("", encoding="utf-8")
+    (tmp_path / "__pycache__" / "module.cpython-312.pyc").write_text("")
+    (bundle / "pyvenv.cfg").write_text("", encoding="utf-8")
+
+    assert watcher.changes() == set()
+
+
+def test_watcher_waits_for_changes(tmp_path: Path) -> None:
+    module = tmp_path / "module.py"
+    module.write_text("", encoding="utf-8")
+
+    watcher = ProjectWatcher(tmp_path, interval=0)
+    module.write_text("VALUE = 1", encoding="utf-8")
+    os.utime(module, ns=(0, 0))
+
+    assert watcher.wait() == {module}